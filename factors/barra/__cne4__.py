@@ -297,12 +297,11 @@ class main(meta):
             #mkt = (returns * mv).sum(axis=1) / mv.sum(axis=1)
             mkt = flow.index('s_dq_pctchange')['000905.XSHG']
             mkt = mkt.reindex(returns.index)
-            mkt = pd.DataFrame(mkt.values.repeat(df.shape[-1]).reshape(returns.shape[0], -1), index=df.index, columns=df.columns)
             # standard versiond
-            parameters = df.stats.neutral(market=mkt, neu_axis=0, periods=periods, weight=(self.__half_life__(periods, periods // 4)))
-            beta = parameters.params['market'].unstack().reindex_like(returns)
-            alpha =  parameters.params['const'].unstack().reindex_like(returns)
-            resid = parameters.resid.std(axis=1).unstack().reindex_like(returns)
+            parameters = df.stats.rolling_ols(periods=periods, half_life=periods // 4, market=mkt)
+            beta = parameters.params['market'].reindex_like(returns)
+            alpha =  parameters.params['const'].reindex_like(returns)
+            resid = parameters.resid.reindex_like(returns)
             self._L1_Beta_beta = beta
             self._L1_Beta_alpha = alpha
             self._L1_Beta_resid = resid
@@ -348,12 +347,11 @@ class main(meta):
             w = w / w.sum() 
             returns = flow.stock('s_dq_pctchange')
             mkt = flow.index('s_dq_pctchange')['000905.XSHG']
-            mkt = mkt.reindex(returns.index)
-            mkt = np.log(pd.DataFrame(mkt.values.repeat(returns.shape[-1]).reshape(returns.shape[0], -1), index=returns.index, columns=returns.columns) + 1)
+            mkt = np.log(mkt.reindex(returns.index) + 1)
             obj = returns.stats.neutral(neu_axis=1, me=self.L1_Size(), bm=self.L1_Bm()).resid
             obj = np.log(obj+1)
             
-            fac = obj - mkt.shift(21)
+            fac = obj.sub(mkt.shift(21), axis=0)
             array = self.__array_roll__(fac.values, periods)
             array = [np.nansum(i * w[:, np.newaxis], axis=0) for i in array]
             array = pd.DataFrame(np.array(array), index=obj.index[periods-1:], columns=obj.columns)
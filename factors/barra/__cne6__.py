@@ -425,10 +425,9 @@ class main(meta):
             returns = flow.stock('S_DQ_PCTCHANGE')
             w = self.L3_LNCAP()
             market = (returns * w).sum(axis=1) / w.sum(axis=1)
-            market = pd.DataFrame(market.values.repeat(returns.shape[1]).reshape(returns.shape[0], -1), index=returns.index, columns=returns.columns)            
-            parameters = returns.stats.neutral(market=market, neu_axis=0, periods=periods, weight=(self.__half_life__(periods, periods // 4)), resid=False)
-            beta = parameters.params['market'].unstack().reindex_like(returns)
-            alpha =  parameters.params['const'].unstack().reindex_like(returns)
+            parameters = returns.stats.rolling_ols(periods=periods, half_life=periods // 4, market=market)
+            beta = parameters.params['market'].reindex_like(returns)
+            alpha =  parameters.params['const'].reindex_like(returns)
             self._L3_BETA_beta = beta
             self._L3_BETA_alpha = alpha
             
@@ -472,11 +471,10 @@ class main(meta):
         returns = flow.stock('S_DQ_PCTCHANGE')
         w = self.L3_LNCAP()
         market = (returns * w).sum(axis=1) / w.sum(axis=1)
-        market = pd.DataFrame(market.values.repeat(returns.shape[1]).reshape(returns.shape[0], -1), index=returns.index, columns=returns.columns)    
         beta = self.L3_BETA()
         alpha = self._L3_BETA_alpha
         
-        resid = (returns - market * beta - alpha).rolling(periods, min_periods=periods // 4).std()
+        resid = (returns - beta.mul(market, axis=0) - alpha).rolling(periods, min_periods=periods // 4).std()
         return resid
     
     def L3_DAILY_STD(
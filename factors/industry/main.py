@@ -295,9 +295,10 @@ class main(meta, config):
         
         dic: Dict[str, pd.DataFrame] = {}
         for i in ind_keys:
-            prefer_obj = pd.concat({i:flow.stock(i), 're':re, 'lag':lag_factor, 'factor':factor}, axis=1).stack()
-            prefer_obj['rank'] = prefer_obj.groupby([COLUMNS_INFO.trade_dt, i])['lag'].rank(pct=True) - 0.5
-            prefer_obj['fac_rank'] = prefer_obj.groupby([COLUMNS_INFO.trade_dt, i])['factor'].rank(pct=True) - 0.5
+            codes = flow.stock(i)
+            rank = lag_factor.stats.rank(pct=True, group=codes) - 0.5
+            fac_rank = factor.stats.rank(pct=True, group=codes) - 0.5
+            prefer_obj = pd.concat({i:codes, 're':re, 'rank':rank, 'fac_rank':fac_rank}, axis=1).stack()
             high, low = prefer_obj[prefer_obj['rank'] > 0], prefer_obj[prefer_obj['rank'] <= 0]
             prefer = high.groupby([COLUMNS_INFO.trade_dt, i])['re'].mean() -low.groupby([COLUMNS_INFO.trade_dt, i])['re'].mean()
             prefer_obj = pd.merge(prefer_obj, prefer.rename('prefer_prem'), left_on=[COLUMNS_INFO.trade_dt, i], right_index=True, how='left')
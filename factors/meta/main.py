@@ -8,7 +8,7 @@ Created on Mon Feb 17 23:25:51 2025
 import numpy as np
 import pandas as pd
 import flow
-from flow import COLUMNS_INFO
+from flow import COLUMNS_INFO, DATE_KEY, DTYPE
 from factors.config import PROPERTY_ATTRS_DIC, LIMIT
 from typing import Any, Dict, List, Optional, Union
 
@@ -45,6 +45,38 @@ class main(LIMIT):
         """
         pass
     
+    def __mask__(
+        self, 
+        key: Any, 
+        func: Any
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Returns a universe mask memoized for the session.
+
+        The masks are shared by every factor class, keyed by name, the limits
+        they depend on and the date key and dtype modes, so the screen is
+        built once per session. They are held by flow.stock next to its ST
+        and listing panels and dropped with them when the date key or dtype
+        mode changes or the data is initialized again.
+
+        ---------------------------------------------------------------------------
+
+        返回会话内缓存的股票池掩码。
+
+        掩码由所有因子类共享，以名称、其依赖的限制参数以及日期键与数据类型模式为键，
+        每个会话只构建一次。掩码由 flow.stock 与其 ST、上市面板一同持有，并在日期键
+        或数据类型模式改变、或数据重新初始化时一同释放。
+
+        ---------------------------------------------------------------------------
+        """
+        masks = flow.stock.__dict__.setdefault('_masks', {})
+        key = (key, DATE_KEY.mode, DTYPE.mode)
+        if key not in masks:
+            masks[key] = func()
+        return masks[key]
+    
     def is_tradeable(self) -> pd.DataFrame:
         """
         ===========================================================================
@@ -67,7 +99,7 @@ class main(LIMIT):
 
         ---------------------------------------------------------------------------
         """
-        return (flow.stock('S_DQ_TRADESTATUS') == 0)
+        return self.__mask__('is_tradeable', lambda: flow.stock('S_DQ_TRADESTATUS') == 0)
     
                            
     def is_on_list(self) -> pd.DataFrame:
@@ -92,7 +124,7 @@ class main(LIMIT):
 
         ---------------------------------------------------------------------------
         """
-        return flow.stock.be_list(self.ON_LIST_LIMIT)
+        return self.__mask__(('is_on_list', self.ON_LIST_LIMIT), lambda: flow.stock.be_list(self.ON_LIST_LIMIT))
     
     def is_not_st(self) -> pd.DataFrame:
         """
@@ -116,7 +148,7 @@ class main(LIMIT):
 
         ---------------------------------------------------------------------------
         """
-        return (flow.is_st() <= self.IS_ST_FILTER)
+        return self.__mask__(('is_not_st', self.IS_ST_FILTER), lambda: flow.is_st() <= self.IS_ST_FILTER)
         
     def mask(self) -> pd.DataFrame:
         """
@@ -140,7 +172,10 @@ class main(LIMIT):
 
         ---------------------------------------------------------------------------
         """
-        return (self.is_on_list() & self.is_not_st()).dropna(how='all', axis=1)
+        return self.__mask__(
+            ('mask', self.ON_LIST_LIMIT, self.IS_ST_FILTER), 
+            lambda: (self.is_on_list() & self.is_not_st()).dropna(how='all', axis=1)
+        )
         
     def settle(
         self, 
@@ -9,6 +9,13 @@ from libs.__flow__ import (
     is_st,
     be_list,
     trade_days,
+    prefetch,
+    memory,
+    dtype,
+    date_key,
+    calendar,
+    security,
+    Panel,
     code_standard,)
 
 from libs.__flow__.config import *
@@ -6,22 +6,27 @@ Created on Sat Feb  8 23:33:58 2025
 """
 import pandas as pd
 from libs.__flow__ import config
-import re
-import jqdatasdk as jq
 from typing import Optional, Union
 
 from libs import __pandas__
-from libs.__flow__.main.main import stock as __STOCK__, index as __INDEX__, trade_days as __TRADE_DAYS__
+from libs.__pandas__.config import DTYPE as __PANDAS_DTYPE__
+from libs.__flow__.main.main import stock as __STOCK__, index as __INDEX__, trade_days as __TRADE_DAYS__, calendar
+from libs.__flow__.meta.main import data_source as __DATA_SOURCE__
+from libs.__flow__.security.main import main as __SECURITY__
+from libs.utils.panel.main import main as Panel
 
 __DATA_INIT__ = 'min'
 stock = __STOCK__(__DATA_INIT__)
 index = __INDEX__()
 help = stock.help
 data_init = stock.data_init
+prefetch = stock.prefetch
+memory = __DATA_SOURCE__.__memory__
 stock_finance = stock.stock_finance
 letter_finance = stock.letter_finance
 is_st = stock.is_st
 be_list = stock.be_list
+security = stock.security
 
 def trade_days() -> list:
     """
@@ -33,7 +38,8 @@ def trade_days() -> list:
     -------
 
     list
-        A list of trade days.
+        A list of trade days, as integer keys in the 'ordinal' and
+        'yyyymmdd' date key modes (see date_key).
 
     ---------------------------------------------------------------------------
 
@@ -44,12 +50,145 @@ def trade_days() -> list:
     -------
 
     list
-        交易日列表。
+        交易日列表，在 'ordinal' 与 'yyyymmdd' 日期键模式下为整数键（见 date_key）。
 
     ---------------------------------------------------------------------------
 
     """
-    return __TRADE_DAYS__
+    if config.DATE_KEY.mode == 'datetime':
+        return __TRADE_DAYS__
+    return pd.Index(calendar.key(__TRADE_DAYS__, config.DATE_KEY.mode), name=__TRADE_DAYS__.name)
+
+def date_key(
+    mode: Optional[str] = None
+) -> str:
+    """
+    ===========================================================================
+
+    Get or set the session date key mode of flow outputs.
+
+    Dates are stored with an intraday bias (config.COLUMNS_INFO.time_bias).
+    In the 'ordinal' mode, outputs are indexed by the int32 position of the
+    trade day, and in the 'yyyymmdd' mode by the int32 calendar date; the
+    bias is kept in the calendar and in the `attrs` of the outputs. Integer
+    'start' and 'end' arguments are read in the same mode. Changing the mode
+    drops the universe masks memoized by the factor classes.
+
+    Parameters
+    ----------
+    mode : Optional[str], optional
+        'datetime', 'ordinal' or 'yyyymmdd'. Defaults to None (unchanged).
+
+    Returns
+    -------
+
+    str
+        The current mode.
+
+    ---------------------------------------------------------------------------
+
+
+    获取或设置 flow 输出的会话日期键模式。
+
+    日期以日内偏移（config.COLUMNS_INFO.time_bias）存储。'ordinal' 模式下，输出以
+    交易日的 int32 位置为索引；'yyyymmdd' 模式下以 int32 日历日期为索引；偏移保存在
+    日历及输出的 `attrs` 中。整数 'start' 与 'end' 参数按同一模式解读。改变模式会
+    释放因子类缓存的股票池掩码。
+
+    参数
+    ----------
+    mode : Optional[str], optional
+        'datetime'、'ordinal' 或 'yyyymmdd'。默认为 None（不变）。
+
+    返回
+    -------
+
+    str
+        当前模式。
+
+    ---------------------------------------------------------------------------
+
+    """
+    if mode is not None:
+        if mode not in calendar.modes:
+            raise ValueError(
+                f"Invalid value '{mode}' for parameter 'mode'. Valid values are: {', '.join(calendar.modes)}"
+            )
+        if mode != config.DATE_KEY.mode:
+            config.DATE_KEY.mode = mode
+            for i in [stock, index]:
+                i.__dict__.pop('_masks', None)
+    return config.DATE_KEY.mode
+
+def dtype(
+    mode: Optional[str] = None,
+    check: Optional[bool] = None
+) -> dict:
+    """
+    ===========================================================================
+
+    Get or set the session dtype policy of flow panels.
+
+    In 'compact' mode, prices and ratios are stored as float32, status flags
+    as int8 and industry / concept labels as int32 codes (see config.DTYPE).
+    The stats, rollings and build accessors compute in float64 and return the
+    dtype of their input (see libs.__pandas__.config.DTYPE). Changing the mode
+    drops the loaded panels, so they are loaded again in the new dtypes.
+
+    Parameters
+    ----------
+    mode : Optional[str], optional
+        'float64' or 'compact'. Defaults to None (unchanged).
+    check : Optional[bool], optional
+        Whether compact casts and accessor results are compared against
+        float64. Defaults to None (unchanged).
+
+    Returns
+    -------
+
+    dict
+        The current mode and check settings.
+
+    ---------------------------------------------------------------------------
+
+
+    获取或设置 flow 面板的会话数据类型策略。
+
+    'compact' 模式下，价格与比率存储为 float32，状态标志存储为 int8，
+    行业/概念标签存储为 int32 编码（见 config.DTYPE）。stats、rollings 和 build
+    访问器以 float64 计算并返回输入的类型（见 libs.__pandas__.config.DTYPE）。
+    改变模式会释放已加载的面板，之后以新类型重新加载。
+
+    参数
+    ----------
+    mode : Optional[str], optional
+        'float64' 或 'compact'。默认为 None（不变）。
+    check : Optional[bool], optional
+        是否将紧凑类型转换与访问器结果同 float64 比较。默认为 None（不变）。
+
+    返回
+    -------
+
+    dict
+        当前的模式与检查设置。
+
+    ---------------------------------------------------------------------------
+
+    """
+    if mode is not None:
+        if mode not in ['float64', 'compact']:
+            raise ValueError(
+                f"Invalid value '{mode}' for parameter 'mode'. Valid values are: {', '.join(['float64', 'compact'])}"
+            )
+        if mode != config.DTYPE.mode:
+            config.DTYPE.mode = mode
+            memory.clear()
+            for i in [stock, index]:
+                [delattr(i, j) for j in ['_is_st', '_be_list', '_index_member', '_masks'] if j in i.__dict__]
+    if check is not None:
+        config.DTYPE.check = check
+        __PANDAS_DTYPE__.check = check
+    return {'mode': config.DTYPE.mode, 'check': config.DTYPE.check}
 
 def code_standard(
     obj: Union[pd.DataFrame, pd.Series, list],
@@ -60,6 +199,11 @@ def code_standard(
 
     Standardize the code format.
 
+    Codes are converted by rule only (see `security_master.rule`): the
+    digits are extracted with a regular expression once per distinct code
+    and the exchange taken from the suffix or the leading digits. The
+    security master and the database are not involved.
+
     Parameters
     ----------
     obj : Union[pd.DataFrame, pd.Series, list]
@@ -78,6 +222,9 @@ def code_standard(
 
     标准化代码格式。
 
+    代码仅按规则转换（见 `security_master.rule`）：每个不同代码以正则表达式提取
+    一次数字，交易所取自后缀或首位数字，不涉及证券主表与数据库。
+
     参数
     ----------
     obj : Union[pd.DataFrame, pd.Series, list]
@@ -94,21 +241,4 @@ def code_standard(
     ---------------------------------------------------------------------------
 
     """
-    if isinstance(obj, (pd.DataFrame, pd.Series)):
-        if config.COLUMNS_INFO.code == obj.index.name:
-            x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj.index]
-            if how =='jq':
-                x = jq.normalize_code(x)
-            obj.index = pd.Index(x, name=obj.index.name)
-        elif config.DATABASE.code == obj.columns.name:
-            x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj.columns]
-            if how =='jq':
-                x = jq.normalize_code(x)
-            obj.columns = pd.Index(x, name=obj.columns.name)
-        return obj
-    else:
-        x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj]
-        if how =='jq':
-            x = jq.normalize_code(x)
-        return x
-
+    return __SECURITY__.standard(obj, how, config.COLUMNS_INFO.code)
@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:41 2026
+
+@author: Porco Rosso
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class main():
+    """
+    ===========================================================================
+
+    On-disk panel cache backed by memory-mapped arrays.
+
+    Each (table, column) wide panel is stored as a row-major binary file of
+    values plus axis files for dates and codes. Warm loads open the value file
+    as a copy-on-write memory map, so the pages are shared between processes
+    through the OS page cache. New trade days are appended to the end of the
+    value file after ingestion.
+
+    Directory layout:
+        {path}/{schema}/{table}/{column}/values.bin
+        {path}/{schema}/{table}/{column}/dates.npy
+        {path}/{schema}/{table}/{column}/codes.npy
+        {path}/{schema}/{table}/{column}/meta.json
+
+    ---------------------------------------------------------------------------
+
+    基于内存映射数组的磁盘面板缓存。
+
+    每个 (表, 列) 的宽面板以按行存储的二进制数值文件及日期、代码轴文件保存。
+    热启动时以写时复制方式内存映射数值文件，使各进程通过操作系统页缓存共享内存。
+    数据入库后，新交易日追加写入数值文件末尾。
+
+    ---------------------------------------------------------------------------
+    """
+    values_file: str = 'values.bin'
+    dates_file: str = 'dates.npy'
+    codes_file: str = 'codes.npy'
+    meta_file: str = 'meta.json'
+
+    def __init__(
+        self,
+        path: str
+    ):
+        """
+        ===========================================================================
+
+        Initializes the panel cache with its root directory.
+
+        Parameters
+        ----------
+        path : str
+            Root directory of the panel cache.
+
+        ---------------------------------------------------------------------------
+
+        使用根目录初始化面板缓存。
+
+        参数
+        ----------
+        path : str
+            面板缓存的根目录。
+
+        ---------------------------------------------------------------------------
+        """
+        self.path = Path(path)
+
+    def __folder__(
+        self,
+        schema: str,
+        table: str,
+        column: str
+    ) -> Path:
+        """
+        ===========================================================================
+
+        Returns the cache directory of a (table, column) panel.
+
+        ---------------------------------------------------------------------------
+
+        返回 (表, 列) 面板的缓存目录。
+
+        ---------------------------------------------------------------------------
+        """
+        return self.path / str(schema) / str(table) / str(column)
+
+    def __write_meta__(
+        self,
+        folder: Path,
+        meta: Dict[str, Any]
+    ):
+        """
+        ===========================================================================
+
+        Writes the meta file atomically, so readers never see a partial file.
+
+        ---------------------------------------------------------------------------
+
+        原子化写入元信息文件，读取方不会读到不完整的文件。
+
+        ---------------------------------------------------------------------------
+        """
+        tmp = folder / (self.meta_file + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, folder / self.meta_file)
+
+    def info(
+        self,
+        schema: str,
+        table: str,
+        column: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ===========================================================================
+
+        Returns the meta information of a cached panel.
+
+        Parameters
+        ----------
+        schema : str
+            Schema of the source table.
+        table : str
+            Name of the source table.
+        column : str
+            Name of the cached column.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The meta information (shape, dtype, end, count), or None if the
+            panel is not cached.
+
+        ---------------------------------------------------------------------------
+
+        返回缓存面板的元信息。
+
+        参数
+        ----------
+        schema : str
+            源表所在的 schema。
+        table : str
+            源表名称。
+        column : str
+            缓存的列名。
+
+        返回
+        -------
+        Optional[Dict[str, Any]]
+            元信息（形状、数据类型、截止日期、行数），未缓存时返回 None。
+
+        ---------------------------------------------------------------------------
+        """
+        file = self.__folder__(schema, table, column) / self.meta_file
+        if not file.exists():
+            return None
+        try:
+            with open(file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(
+        self,
+        schema: str,
+        table: str,
+        column: str,
+        index_name: Optional[str] = None,
+        columns_name: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        ===========================================================================
+
+        Opens a cached panel as a DataFrame backed by a memory map.
+
+        The map is opened in copy-on-write mode: writes to the returned frame
+        stay private to the process and never reach the file on disk.
+
+        Parameters
+        ----------
+        schema : str
+            Schema of the source table.
+        table : str
+            Name of the source table.
+        column : str
+            Name of the cached column.
+        index_name : Optional[str], optional
+            Name of the date axis. Defaults to None.
+        columns_name : Optional[str], optional
+            Name of the code axis. Defaults to None.
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            The cached panel, or None if it is not cached.
+
+        ---------------------------------------------------------------------------
+
+        以内存映射的 DataFrame 打开缓存面板。
+
+        映射以写时复制模式打开：对返回对象的写入仅在本进程内可见，不会写回磁盘文件。
+
+        参数
+        ----------
+        schema : str
+            源表所在的 schema。
+        table : str
+            源表名称。
+        column : str
+            缓存的列名。
+        index_name : Optional[str], optional
+            日期轴名称。默认为 None。
+        columns_name : Optional[str], optional
+            代码轴名称。默认为 None。
+
+        返回
+        -------
+        Optional[pd.DataFrame]
+            缓存面板，未缓存时返回 None。
+
+        ---------------------------------------------------------------------------
+        """
+        meta = self.info(schema, table, column)
+        if meta is None:
+            return None
+        folder = self.__folder__(schema, table, column)
+        shape = tuple(meta['shape'])
+        dates = np.load(folder / self.dates_file)[:shape[0]]
+        codes = np.load(folder / self.codes_file)
+        if shape[0] == 0:
+            values = np.empty(shape, dtype=meta['dtype'])
+        else:
+            values = np.memmap(folder / self.values_file, dtype=meta['dtype'], mode='c', shape=shape)
+        df = pd.DataFrame(
+            values,
+            index=pd.DatetimeIndex(dates, name=index_name),
+            columns=pd.Index(codes, name=columns_name),
+            copy=False
+        )
+        return df
+
+    def write(
+        self,
+        schema: str,
+        table: str,
+        column: str,
+        df: pd.DataFrame,
+        **meta: Any
+    ) -> bool:
+        """
+        ===========================================================================
+
+        Writes a full panel to the cache, replacing any previous content.
+
+        Parameters
+        ----------
+        schema : str
+            Schema of the source table.
+        table : str
+            Name of the source table.
+        column : str
+            Name of the cached column.
+        df : pd.DataFrame
+            The (date x code) panel to be cached. Only numeric or boolean
+            panels are cached. Integer code axes (security IDs) are kept as
+            integers, others are stored as strings.
+        **meta : Any
+            Extra meta information (e.g. the ingest version) stored with the panel.
+
+        Returns
+        -------
+        bool
+            True if the panel is written, False otherwise.
+
+        ---------------------------------------------------------------------------
+
+        将完整面板写入缓存，替换原有内容。
+
+        参数
+        ----------
+        schema : str
+            源表所在的 schema。
+        table : str
+            源表名称。
+        column : str
+            缓存的列名。
+        df : pd.DataFrame
+            待缓存的 (日期 x 代码) 面板，仅缓存数值型或布尔型面板。整数代码轴
+            （证券 ID）保持为整数，其余以字符串保存。
+        **meta : Any
+            与面板一起保存的额外元信息（例如入库版本）。
+
+        返回
+        -------
+        bool
+            写入成功返回 True，否则返回 False。
+
+        ---------------------------------------------------------------------------
+        """
+        values = df.values
+        if not (np.issubdtype(values.dtype, np.number) or values.dtype == bool):
+            return False
+        folder = self.__folder__(schema, table, column)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        values = np.ascontiguousarray(values)
+        tmp = folder / (self.values_file + '.tmp')
+        values.tofile(tmp)
+        os.replace(tmp, folder / self.values_file)
+        np.save(folder / self.dates_file, df.index.values.astype('datetime64[ns]'))
+        codes = np.asarray(df.columns.values)
+        np.save(folder / self.codes_file, codes if codes.dtype.kind in 'iu' else codes.astype(str))
+        meta = meta | {'shape': list(values.shape), 'dtype': values.dtype.str}
+        self.__write_meta__(folder, meta)
+        return True
+
+    def append(
+        self,
+        schema: str,
+        table: str,
+        column: str,
+        df: pd.DataFrame,
+        **meta: Any
+    ) -> bool:
+        """
+        ===========================================================================
+
+        Appends new trade days to the end of a cached panel.
+
+        Rows are appended in place when every code of the new rows already
+        exists in the cached code axis. Otherwise (e.g. a new listing) the
+        panel must be rewritten with ``write`` and False is returned.
+
+        Parameters
+        ----------
+        schema : str
+            Schema of the source table.
+        table : str
+            Name of the source table.
+        column : str
+            Name of the cached column.
+        df : pd.DataFrame
+            The new (date x code) rows, all later than the cached end date.
+        **meta : Any
+            Meta information updated together with the append.
+
+        Returns
+        -------
+        bool
+            True if the rows are appended, False if a full rewrite is required.
+
+        ---------------------------------------------------------------------------
+
+        将新的交易日追加到缓存面板末尾。
+
+        当新行的所有代码均已存在于缓存代码轴中时，就地追加；否则（例如新股上市）
+        需要使用 ``write`` 重写面板，并返回 False。
+
+        参数
+        ----------
+        schema : str
+            源表所在的 schema。
+        table : str
+            源表名称。
+        column : str
+            缓存的列名。
+        df : pd.DataFrame
+            新的 (日期 x 代码) 行，日期均晚于缓存截止日期。
+        **meta : Any
+            随追加一起更新的元信息。
+
+        返回
+        -------
+        bool
+            追加成功返回 True，需要完整重写时返回 False。
+
+        ---------------------------------------------------------------------------
+        """
+        info = self.info(schema, table, column)
+        if info is None:
+            return False
+        folder = self.__folder__(schema, table, column)
+        codes = np.load(folder / self.codes_file)
+        if not df.columns.isin(codes).all():
+            return False
+        dates = np.load(folder / self.dates_file)[:info['shape'][0]]
+        new_dates = df.index.values.astype('datetime64[ns]')
+        if len(dates) and len(new_dates) and new_dates.min() <= dates[-1]:
+            return False
+
+        values = np.ascontiguousarray(df.reindex(columns=codes).values.astype(info['dtype']))
+        with open(folder / self.values_file, 'ab') as f:
+            values.tofile(f)
+        np.save(folder / self.dates_file, np.concatenate([dates, new_dates]))
+        shape = [info['shape'][0] + values.shape[0], info['shape'][1]]
+        self.__write_meta__(folder, info | meta | {'shape': shape})
+        return True
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:21:08 2026
+
+@author: Porco Rosso
+"""
+
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class main():
+    """
+    ===========================================================================
+
+    Trade calendar converting biased trade dates to compact integer keys.
+
+    Dates are stored with an intraday bias (e.g. 15:00). The keys drop it:
+    'ordinal' is the int32 position of the trade day in the calendar, and
+    'yyyymmdd' is the int32 calendar date. The bias is kept on the calendar
+    and in the `attrs` of encoded objects, so keys convert back to the
+    stored dates exactly.
+
+    ---------------------------------------------------------------------------
+
+    将带偏移的交易日期转换为紧凑整数键的交易日历。
+
+    日期以日内偏移（例如 15:00）存储，整数键去除偏移：'ordinal' 为交易日在日历中的
+    int32 位置，'yyyymmdd' 为 int32 日历日期。偏移保存在日历及已编码对象的 `attrs`
+    中，整数键可精确还原为存储的日期。
+
+    ---------------------------------------------------------------------------
+    """
+    modes = ['datetime', 'ordinal', 'yyyymmdd']
+
+    def __init__(
+        self,
+        days: pd.DatetimeIndex,
+        bias: pd.Timedelta,
+        name: Optional[str] = None
+    ):
+        """
+        ===========================================================================
+
+        Initializes the calendar.
+
+        Parameters
+        ----------
+        days : pd.DatetimeIndex
+            The biased trade days.
+        bias : pd.Timedelta
+            The intraday bias of the stored dates.
+        name : Optional[str], optional
+            Name of the date axis. Defaults to None.
+
+        ---------------------------------------------------------------------------
+
+        初始化交易日历。
+
+        参数
+        ----------
+        days : pd.DatetimeIndex
+            带偏移的交易日。
+        bias : pd.Timedelta
+            存储日期的日内偏移。
+        name : Optional[str], optional
+            日期轴名称。默认为 None。
+
+        ---------------------------------------------------------------------------
+        """
+        self.days = pd.DatetimeIndex(days).sort_values()
+        self.bias = pd.Timedelta(bias)
+        self.name = name
+        self._days = self.days.values.astype('datetime64[ns]')
+
+    def key(
+        self,
+        dates: Any,
+        how: str = 'ordinal'
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the integer keys of biased dates.
+
+        Parameters
+        ----------
+        dates : Any
+            Biased dates.
+        how : str, optional
+            'ordinal' or 'yyyymmdd'. Defaults to 'ordinal'.
+
+        Returns
+        -------
+        np.ndarray
+            int32 keys. Ordinals of dates that are not trade days are -1.
+
+        ---------------------------------------------------------------------------
+
+        返回带偏移日期的整数键。
+
+        参数
+        ----------
+        dates : Any
+            带偏移的日期。
+        how : str, optional
+            'ordinal' 或 'yyyymmdd'。默认为 'ordinal'。
+
+        返回
+        -------
+        np.ndarray
+            int32 键。非交易日的序号为 -1。
+
+        ---------------------------------------------------------------------------
+        """
+        dates = pd.DatetimeIndex(dates)
+        if how == 'ordinal':
+            values = dates.values.astype('datetime64[ns]')
+            pos = np.searchsorted(self._days, values)
+            found = (pos < len(self._days)) & (self._days[np.minimum(pos, len(self._days) - 1)] == values)
+            return np.where(found, pos, -1).astype(np.int32)
+        if how == 'yyyymmdd':
+            dates = dates - self.bias
+            return (dates.year * 10000 + dates.month * 100 + dates.day).values.astype(np.int32)
+        raise ValueError(f"Invalid value '{how}' for parameter 'how'. Valid values are: {', '.join(self.modes[1:])}")
+
+    def date(
+        self,
+        keys: Any,
+        how: str = 'ordinal'
+    ) -> pd.DatetimeIndex:
+        """
+        ===========================================================================
+
+        Returns the biased dates of integer keys.
+
+        ---------------------------------------------------------------------------
+
+        返回整数键对应的带偏移日期。
+
+        ---------------------------------------------------------------------------
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if how == 'ordinal':
+            valid = (keys >= 0) & (keys < len(self._days))
+            x = np.where(valid, self._days[np.clip(keys, 0, max(len(self._days) - 1, 0))], np.datetime64('NaT'))
+            return pd.DatetimeIndex(x, name=self.name)
+        if how == 'yyyymmdd':
+            x = pd.to_datetime(keys.astype(str), format='%Y%m%d') + self.bias
+            return pd.DatetimeIndex(x, name=self.name)
+        raise ValueError(f"Invalid value '{how}' for parameter 'how'. Valid values are: {', '.join(self.modes[1:])}")
+
+    def timestamp(
+        self,
+        value: Any,
+        how: str = 'ordinal'
+    ) -> Any:
+        """
+        ===========================================================================
+
+        Converts a single integer key (e.g. a 'start' or 'end' argument) to
+        its biased date. Other values are returned unchanged.
+
+        ---------------------------------------------------------------------------
+
+        将单个整数键（例如 'start' 或 'end' 参数）转换为带偏移日期，其他值原样返回。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(value, (int, np.integer)) and not isinstance(value, bool) and how in self.modes[1:]:
+            return self.date([value], how)[0]
+        return value
+
+    def encode(
+        self,
+        obj: Union[pd.DataFrame, pd.Series],
+        how: str = 'ordinal'
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        ===========================================================================
+
+        Replaces the trade date index (or index level), named `name`, of a
+        pandas object with integer keys. Other date indexes (e.g. report
+        periods) are left unchanged. The mode and the bias are stored in
+        `attrs`.
+
+        ---------------------------------------------------------------------------
+
+        将 pandas 对象名为 `name` 的交易日索引（或索引层级）替换为整数键，其他日期
+        索引（例如报告期）保持不变。模式与偏移保存在 `attrs` 中。
+
+        ---------------------------------------------------------------------------
+
+        Raises
+        ------
+        ValueError
+            If a date has no key of its own ('ordinal' keys of non-trade
+            days, or dates of a MultiIndex level sharing a 'yyyymmdd' key),
+            as the dates could not be decoded again.
+
+        ---------------------------------------------------------------------------
+
+        引发
+        ------
+        ValueError
+            如果某个日期没有唯一的键（非交易日的 'ordinal' 键，或 MultiIndex 层级中
+            共用同一 'yyyymmdd' 键的日期），因为这些日期无法被还原。
+
+        ---------------------------------------------------------------------------
+        """
+        if how == 'datetime' or not isinstance(obj, (pd.DataFrame, pd.Series)):
+            return obj
+        index = obj.index
+        if isinstance(index, pd.MultiIndex):
+            if self.name not in index.names:
+                return obj
+            level = index.names.index(self.name)
+            if not isinstance(index.levels[level], pd.DatetimeIndex):
+                return obj
+            index = index.remove_unused_levels()
+            dates = index.levels[level]
+            keys = self.key(dates, how)
+            invalid = (keys < 0) | pd.Index(keys).duplicated(keep=False)
+            if invalid.any():
+                raise ValueError(f"Invalid value '{list(dates[invalid][:5].astype(str))}' for index '{self.name}'. Valid values are: trade days")
+            index = index.set_levels(keys, level=level)
+        elif isinstance(index, pd.DatetimeIndex) and index.name == self.name:
+            keys = self.key(index, how)
+            invalid = keys < 0
+            if invalid.any():
+                raise ValueError(f"Invalid value '{list(index[invalid][:5].astype(str))}' for index '{self.name}'. Valid values are: trade days")
+            index = pd.Index(keys, name=index.name)
+        else:
+            return obj
+        obj = obj.copy(deep=False)
+        obj.index = index
+        obj.attrs = obj.attrs | {'date_key': how, 'time_bias': str(self.bias)}
+        return obj
+
+    def decode(
+        self,
+        obj: Union[pd.DataFrame, pd.Series]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        ===========================================================================
+
+        Restores the biased date index of an object encoded by `encode`.
+
+        ---------------------------------------------------------------------------
+
+        还原由 `encode` 编码的对象的带偏移日期索引。
+
+        ---------------------------------------------------------------------------
+        """
+        how = obj.attrs.get('date_key', 'datetime') if isinstance(obj, (pd.DataFrame, pd.Series)) else 'datetime'
+        if how == 'datetime':
+            return obj
+        index = obj.index
+        if isinstance(index, pd.MultiIndex):
+            if self.name not in index.names:
+                return obj
+            level = index.names.index(self.name)
+            index = index.set_levels(self.date(index.levels[level], how), level=level)
+        elif index.name == self.name:
+            index = self.date(index, how)
+        else:
+            return obj
+        obj = obj.copy(deep=False)
+        obj.index = index
+        obj.attrs = {i: j for i, j in obj.attrs.items() if i not in ['date_key', 'time_bias']}
+        return obj
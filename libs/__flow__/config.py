@@ -9,6 +9,30 @@ class FILTER:
     ann_start = '2011-12-31 15:00'
     trade_start = '2014-01-01 15:00'
     
+class CACHE:
+    panel_cache = False
+    panel_path = 'e:/programdata/panel_cache'
+
+class MEMORY:
+    budget = 16 * 1024 ** 3
+    pinned = ['S_DQ_PCTCHANGE']
+
+class PARALLEL:
+    workers = 4
+
+class DATE_KEY:
+    mode = 'datetime'
+
+class DTYPE:
+    mode = 'float64'
+    floats = 'float32'
+    flags = ['S_DQ_TRADESTATUS']
+    labels = ['S_SWL1_CODE', 'S_SWL2_CODE', 'S_SWL3_CODE', 'S_ZJW_CODE', 'S_JQL1_CODE', 'S_JQL2_CODE']
+    missing = -1
+    decode = True
+    check = False
+    tolerance = 1e-4
+    
 class DB_INFO:
     schema_info = 'TABLE_SCHEMA'
     table_info = 'TABLE_NAME'
@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 15:40:06 2026
+
+@author: Porco Rosso
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def quarter_index(dt: pd.DatetimeIndex) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Maps timestamps to absolute quarter numbers (year * 4 + quarter - 1).
+
+    ---------------------------------------------------------------------------
+
+    将时间戳映射为绝对季度编号（年 * 4 + 季度 - 1）。
+
+    ---------------------------------------------------------------------------
+    """
+    dt = pd.DatetimeIndex(dt)
+    return (dt.year.values.astype(np.int64) * 4 + (dt.month.values.astype(np.int64) - 1) // 3)
+
+
+def quarter_end(q: np.ndarray) -> pd.DatetimeIndex:
+    """
+    ===========================================================================
+
+    Maps absolute quarter numbers back to quarter end dates.
+
+    ---------------------------------------------------------------------------
+
+    将绝对季度编号映射回季度末日期。
+
+    ---------------------------------------------------------------------------
+    """
+    q = np.asarray(q, dtype=np.int64).ravel()
+    month = (q // 4 - 1970) * 12 + (q % 4) * 3 + 3
+    x = (month.astype('datetime64[M]').astype('datetime64[D]') - np.timedelta64(1, 'D'))
+    return pd.DatetimeIndex(x.astype('datetime64[ns]'))
+
+
+def latest_quarter(dates: pd.DatetimeIndex) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Returns the quarter number of the latest quarter end on or before each date.
+
+    ---------------------------------------------------------------------------
+
+    返回每个日期当日或之前最近一个季度末的季度编号。
+
+    ---------------------------------------------------------------------------
+    """
+    dates = pd.DatetimeIndex(dates).normalize() + pd.Timedelta(days=1)
+    return quarter_index(dates) - 1
+
+
+def events(
+    df: pd.Series,
+    ann_dt: str,
+    report_period: str,
+    code: str,
+    how: str = 'first'
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Converts an (ANN_DT, REPORT_PERIOD, CODE) series into sorted announcement events.
+
+    Null values and report periods that are not quarter ends are dropped. The
+    events are sorted by (code, report period, announcement date).
+
+    ---------------------------------------------------------------------------
+
+    将 (ANN_DT, REPORT_PERIOD, CODE) 序列转换为排序后的公告事件。
+
+    删除空值及非季度末的报告期，事件按 (代码, 报告期, 公告日) 排序。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df : pd.Series
+        Statement values indexed by announcement date, report period and code.
+    ann_dt : str
+        Name of the announcement date level.
+    report_period : str
+        Name of the report period level.
+    code : str
+        Name of the code level.
+    how : str, optional
+        'first' keeps the first announced value of each (code, report period),
+        as restatements never overwrite a known value; 'last' keeps every
+        announcement, so later restatements take over. Defaults to 'first'.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df : pd.Series
+        以公告日、报告期和代码为索引的报表数值。
+    ann_dt : str
+        公告日层级名称。
+    report_period : str
+        报告期层级名称。
+    code : str
+        代码层级名称。
+    how : str, optional
+        'first' 保留每个 (代码, 报告期) 首次公告的数值，更正公告不会覆盖已知数值；
+        'last' 保留全部公告，后续更正生效。默认为 'first'。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        Events with columns [ann_dt, report_period, code, 'VALUE'].
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        列为 [ann_dt, report_period, code, 'VALUE'] 的事件表。
+
+    ---------------------------------------------------------------------------
+    """
+    x = df.rename('VALUE').reset_index()[[ann_dt, report_period, code, 'VALUE']]
+    x = x[x['VALUE'].notnull() & pd.DatetimeIndex(x[report_period]).is_quarter_end]
+    x = x.sort_values([code, report_period, ann_dt], kind='mergesort')
+    if how == 'first':
+        x = x.drop_duplicates([code, report_period], keep='first')
+    elif how != 'last':
+        raise ValueError(f"Invalid value '{how}' for parameter 'how'. Valid values are: {', '.join(['first', 'last'])}")
+    return x.reset_index(drop=True)
+
+
+def quarter_adjust(
+    x: pd.DataFrame,
+    report_period: str,
+    code: str,
+    month: int,
+    quarter_diff: int = 1
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Converts cumulative statement values of unique events into single quarter values.
+
+    Values are differenced along the full quarter grid of each code, except
+    the report periods in `month`, which keep their reported values.
+
+    ---------------------------------------------------------------------------
+
+    将唯一事件的累计报表数值转换为单季度数值。
+
+    数值沿每个代码的完整季度网格差分，`month` 月份的报告期保留原始报告值。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    x : pd.DataFrame
+        Events produced by ``events(..., how='first')``.
+    report_period : str
+        Name of the report period column.
+    code : str
+        Name of the code column.
+    month : int
+        The month whose report periods are kept as reported (e.g. 3).
+    quarter_diff : int, optional
+        Number of quarters to difference over. Defaults to 1.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    x : pd.DataFrame
+        由 ``events(..., how='first')`` 生成的事件表。
+    report_period : str
+        报告期列名。
+    code : str
+        代码列名。
+    month : int
+        保留原始报告值的报告期月份（例如 3）。
+    quarter_diff : int, optional
+        差分的季度数。默认为 1。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        Events with adjusted values.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        数值调整后的事件表。
+
+    ---------------------------------------------------------------------------
+    """
+    if not len(x):
+        return x
+    q = quarter_index(x[report_period])
+    q_min = q.min()
+    code_idx, codes = pd.factorize(x[code], sort=True)
+    grid = np.full((q.max() - q_min + 1, len(codes)), np.nan)
+    grid[q - q_min, code_idx] = x['VALUE'].values
+    diff = np.full_like(grid, np.nan)
+    diff[quarter_diff:] = grid[quarter_diff:] - grid[:-quarter_diff]
+    values = diff[q - q_min, code_idx]
+    keep = pd.DatetimeIndex(x[report_period]).month.values == month
+    x = x.copy()
+    x['VALUE'] = np.where(keep, x['VALUE'].values, values)
+    return x[x['VALUE'].notnull()].reset_index(drop=True)
+
+
+def as_of_cube(
+    x: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    lags: int,
+    ann_dt: str,
+    report_period: str,
+    code: str,
+    limit: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+    """
+    ===========================================================================
+
+    Builds a point-in-time (date x lag x code) cube of statement values.
+
+    For each date and code, lag k holds the value of the k-th latest quarter
+    end on or before the date, as known from the latest announcement on or
+    before that date. All lookups are done with one searchsorted per lag over
+    the events sorted by (code, report period, announcement date).
+
+    ---------------------------------------------------------------------------
+
+    构建时点一致的 (日期 x 滞后期 x 代码) 报表数值立方体。
+
+    对每个日期和代码，滞后期 k 为该日期当日或之前第 k 个最近季度末的数值，
+    取值来自该日期当日或之前的最新公告。所有查找均在按 (代码, 报告期, 公告日)
+    排序的事件上，按滞后期各执行一次 searchsorted 完成。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    x : pd.DataFrame
+        Events produced by ``events``.
+    dates : pd.DatetimeIndex
+        The dates of the cube.
+    lags : int
+        Number of quarter lags.
+    ann_dt : str
+        Name of the announcement date column.
+    report_period : str
+        Name of the report period column.
+    code : str
+        Name of the code column.
+    limit : Optional[int], optional
+        Maximum staleness in natural days between the announcement and the
+        date. Older values are treated as missing. Defaults to None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    x : pd.DataFrame
+        由 ``events`` 生成的事件表。
+    dates : pd.DatetimeIndex
+        立方体的日期。
+    lags : int
+        季度滞后期数量。
+    ann_dt : str
+        公告日列名。
+    report_period : str
+        报告期列名。
+    code : str
+        代码列名。
+    limit : Optional[int], optional
+        公告日与日期之间允许的最大自然日间隔，超过视为缺失。默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, pd.Index]
+        The cube of shape (dates, lags, codes) ordered from the oldest lag to
+        the latest, the (dates, lags) quarter numbers of each lag, and the codes.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    Tuple[np.ndarray, np.ndarray, pd.Index]
+        形状为 (日期, 滞后期, 代码) 的立方体（滞后期由远及近排列）、
+        各滞后期对应的 (日期, 滞后期) 季度编号，以及代码。
+
+    ---------------------------------------------------------------------------
+    """
+    dates = pd.DatetimeIndex(dates)
+    code_idx, codes = pd.factorize(x[code], sort=True)
+    q = quarter_index(x[report_period])
+    ann_day = x[ann_dt].values.astype('datetime64[D]').astype(np.int64)
+    day = dates.values.astype('datetime64[D]').astype(np.int64)
+    q_dates = latest_quarter(dates)[:, np.newaxis] - np.arange(lags)[::-1][np.newaxis, :]
+    cube = np.full((len(dates), lags, len(codes)), np.nan)
+    if not len(x):
+        return cube, q_dates, pd.Index(codes, name=code)
+
+    q_min, q_span = q.min(), q.max() - q.min() + 1
+    day_min = min(ann_day.min(), day.min())
+    day_span = max(ann_day.max(), day.max()) - day_min + 2
+    pair = code_idx.astype(np.int64) * q_span + (q - q_min)
+    keys = pair * day_span + (ann_day - day_min)
+    values = x['VALUE'].values.astype(np.float64)
+
+    code_grid = np.arange(len(codes), dtype=np.int64)[np.newaxis, :] * q_span
+    for k in range(lags):
+        qk = q_dates[:, k] - q_min
+        in_range = (qk >= 0) & (qk < q_span)
+        query_pair = code_grid + np.clip(qk, 0, q_span - 1)[:, np.newaxis]
+        pos = np.searchsorted(keys, query_pair * day_span + (day - day_min)[:, np.newaxis], side='right') - 1
+        found = (pos >= 0) & in_range[:, np.newaxis]
+        pos = np.maximum(pos, 0)
+        found &= pair[pos] == query_pair
+        if limit is not None:
+            found &= (day[:, np.newaxis] - ann_day[pos]) <= limit
+        cube[:, k, :] = np.where(found, values[pos], np.nan)
+    return cube, q_dates, pd.Index(codes, name=code)
+
+
+def cube_window(
+    cube: np.ndarray,
+    shift: int,
+    periods: int,
+    min_periods: Optional[int] = None
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Applies the shift, periods and min_periods rules on a (date x lag x code) cube.
+
+    Where the latest lags are missing (reports not yet announced), the lags
+    are shifted towards the latest end by up to `shift` quarters. Then the
+    latest `periods` lags are kept, and (date, code) cells with fewer than
+    `min_periods` valid lags are set to missing.
+
+    ---------------------------------------------------------------------------
+
+    对 (日期 x 滞后期 x 代码) 立方体应用 shift、periods 和 min_periods 规则。
+
+    若最近的滞后期缺失（报告尚未公告），滞后期向最近端最多平移 `shift` 个季度。
+    随后保留最近的 `periods` 个滞后期，有效滞后期少于 `min_periods` 的
+    (日期, 代码) 单元设为缺失。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    cube : np.ndarray
+        Cube of shape (dates, lags, codes), ordered from the oldest lag.
+    shift : int
+        Maximum number of quarters to shift.
+    periods : int
+        Number of latest lags to keep.
+    min_periods : Optional[int], optional
+        Minimum number of valid lags required. Defaults to None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    cube : np.ndarray
+        形状为 (日期, 滞后期, 代码) 的立方体，滞后期由远及近排列。
+    shift : int
+        最大平移季度数。
+    periods : int
+        保留的最近滞后期数量。
+    min_periods : Optional[int], optional
+        所需的最少有效滞后期数量。默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        Cube of shape (dates, periods, codes).
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        形状为 (日期, periods, 代码) 的立方体。
+
+    ---------------------------------------------------------------------------
+    """
+    lags = cube.shape[1]
+    if shift:
+        trailing = np.cumprod(np.isnan(cube[:, ::-1, :]), axis=1, dtype=np.int32).sum(axis=1)
+        steps = np.minimum(trailing, shift)
+    else:
+        steps = np.zeros((cube.shape[0], cube.shape[2]), dtype=np.int64)
+    idx = (lags - periods + np.arange(periods))[np.newaxis, :, np.newaxis] - steps[:, np.newaxis, :]
+    x = np.take_along_axis(cube, np.maximum(idx, 0), axis=1)
+    x[np.broadcast_to(idx < 0, x.shape)] = np.nan
+    if min_periods is not None:
+        x[np.broadcast_to((~np.isnan(x)).sum(axis=1, keepdims=True) < min_periods, x.shape)] = np.nan
+    return x
+
+
+def cube_frame(
+    cube: np.ndarray,
+    dates: pd.DatetimeIndex,
+    codes: pd.Index,
+    trade_dt: str,
+    report_period: str,
+    dropna: bool = False
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Converts a (date x lag x code) cube into the flow finance frame layout.
+
+    With one lag the result is a (trade_dt x code) frame, otherwise the index is
+    (trade_dt, report_period) with report periods labelled -periods ... -1.
+
+    ---------------------------------------------------------------------------
+
+    将 (日期 x 滞后期 x 代码) 立方体转换为 flow 财务数据格式。
+
+    单个滞后期时返回 (trade_dt x 代码) 表，否则索引为 (trade_dt, report_period)，
+    报告期标记为 -periods ... -1。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    cube : np.ndarray
+        Cube of shape (dates, periods, codes).
+    dates : pd.DatetimeIndex
+        The dates of the cube.
+    codes : pd.Index
+        The codes of the cube.
+    trade_dt : str
+        Name of the date level.
+    report_period : str
+        Name of the report period level.
+    dropna : bool, optional
+        If True, drops dates and codes without any value. Defaults to False.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    cube : np.ndarray
+        形状为 (日期, periods, 代码) 的立方体。
+    dates : pd.DatetimeIndex
+        立方体的日期。
+    codes : pd.Index
+        立方体的代码。
+    trade_dt : str
+        日期层级名称。
+    report_period : str
+        报告期层级名称。
+    dropna : bool, optional
+        为 True 时删除没有任何数值的日期和代码。默认为 False。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The finance frame.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        财务数据表。
+
+    ---------------------------------------------------------------------------
+    """
+    dates = pd.DatetimeIndex(dates, name=trade_dt)
+    if dropna:
+        valid = ~np.isnan(cube)
+        date_bools, code_bools = valid.any(axis=(1, 2)), valid.any(axis=(0, 1))
+        cube, dates, codes = cube[date_bools][:, :, code_bools], dates[date_bools], codes[code_bools]
+    periods = cube.shape[1]
+    if periods == 1:
+        df = pd.DataFrame(cube[:, 0, :], index=dates, columns=codes)
+    else:
+        index = pd.MultiIndex.from_product([dates, range(-periods, 0)], names=[trade_dt, report_period])
+        df = pd.DataFrame(cube.reshape(-1, cube.shape[-1]), index=index, columns=codes)
+    return df
@@ -5,12 +5,17 @@ Created on Sat Feb  8 23:33:58 2025
 @author: Porco Rosso
 """
 
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Union
+import numpy as np
 import pandas as pd
 
-from libs.__flow__.config import FILTER, COLUMNS_INFO, DB_INFO
+from libs.__flow__.config import FILTER, COLUMNS_INFO, DB_INFO, FACTORIZE, PARALLEL, DATE_KEY
 from libs.__flow__.base.main import __table_info__, __table_attr__
 from libs.__flow__.meta.main import data_source
+from libs.__flow__.security.main import main as security_master
+from libs.__flow__.calendar.main import main as trade_calendar
+from libs.utils.panel.main import main as Panel
 from local.login_info import JQ_LOGIN_INFO
 
 STOCK: Dict[str, Any] = {}
@@ -30,13 +35,440 @@ try:
     import jqdatasdk as jq
     jq.auth(**JQ_LOGIN_INFO)
     days = jq.get_trade_days('2005-01-01')
-    days = pd.Index([pd.to_datetime(i) + pd.Timedelta(15, 'h') for i in days], name=COLUMNS_INFO.trade_dt)
+    days = pd.Index(pd.to_datetime(days) + COLUMNS_INFO.time_bias, name=COLUMNS_INFO.trade_dt)
     days = days[days < pd.Timestamp.today() - pd.Timedelta(4, 'h')]
     
 except:
     print('net work is not avaiable.')
     days = INDEX['aindexeodprices']('s_dq_pctchange').index
 trade_days: pd.DatetimeIndex = days[days > pd.to_datetime(FILTER.ann_start)]
+calendar: trade_calendar = trade_calendar(trade_days, COLUMNS_INFO.time_bias, COLUMNS_INFO.trade_dt)
+
+def __date_key__(
+    obj: Any
+) -> Any:
+    """
+    ===========================================================================
+
+    Encodes the trade date index of an output to the session date key mode
+    (config DATE_KEY.mode): 'datetime' (unchanged), 'ordinal' or 'yyyymmdd'.
+
+    ---------------------------------------------------------------------------
+
+    按会话日期键模式（config DATE_KEY.mode）编码输出的交易日索引：
+    'datetime'（不变）、'ordinal' 或 'yyyymmdd'。
+
+    ---------------------------------------------------------------------------
+    """
+    if isinstance(obj, dict):
+        return {i: calendar.encode(j, DATE_KEY.mode) for i,j in obj.items()}
+    return calendar.encode(obj, DATE_KEY.mode)
+
+def __date_arg__(
+    value: Any
+) -> Any:
+    """
+    ===========================================================================
+
+    Decodes an integer date key argument (e.g. 'start' or 'end') to the
+    stored biased date under the session date key mode.
+
+    ---------------------------------------------------------------------------
+
+    按会话日期键模式将整数日期键参数（例如 'start' 或 'end'）解码为存储的带偏移日期。
+
+    ---------------------------------------------------------------------------
+    """
+    return calendar.timestamp(value, DATE_KEY.mode)
+
+def __parallel__(
+    tasks: Dict[str, Callable[[], Any]]
+) -> Dict[str, Any]:
+    """
+    ===========================================================================
+
+    Runs per-table loads concurrently in a thread pool.
+
+    The database drivers release the GIL while scanning, so the scan of one
+    table overlaps with the pivot of another. Eviction is deferred until all
+    loads are done. A single task runs in the calling thread.
+
+    Parameters
+    ----------
+    tasks : Dict[str, Callable[[], Any]]
+        Loads keyed by table name.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Results keyed by table name, in the order of `tasks`.
+
+    ---------------------------------------------------------------------------
+
+    在线程池中并发执行按表划分的加载任务。
+
+    数据库驱动在扫描时释放 GIL，因此一张表的扫描与另一张表的透视可以重叠执行。
+    淘汰推迟到全部加载完成之后。仅有一个任务时在调用线程中执行。
+
+    参数
+    ----------
+    tasks : Dict[str, Callable[[], Any]]
+        以表名为键的加载任务。
+
+    返回
+    -------
+    Dict[str, Any]
+        以表名为键的结果，顺序与 `tasks` 一致。
+
+    ---------------------------------------------------------------------------
+    """
+    if len(tasks) <= 1 or PARALLEL.workers <= 1:
+        return {i: j() for i,j in tasks.items()}
+    with data_source.__memory__.hold():
+        with ThreadPoolExecutor(max_workers=min(PARALLEL.workers, len(tasks))) as pool:
+            futures = {i: pool.submit(j) for i,j in tasks.items()}
+            return {i: j.result() for i,j in futures.items()}
+
+def __as_of__(
+    dates: pd.DatetimeIndex, 
+    codes: pd.Index, 
+    values: np.ndarray, 
+    on: pd.DatetimeIndex, 
+    columns: pd.Index
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    As-of lookup of (date, code) events on a (date x code) grid.
+
+    Each cell holds the value of the latest event of the code dated on or
+    before the grid date. Events are sorted once on a composite
+    (code, seconds) key and all cells are located with one searchsorted.
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        Dates of the events.
+    codes : pd.Index
+        Codes of the events.
+    values : np.ndarray
+        Values of the events.
+    on : pd.DatetimeIndex
+        Dates of the grid.
+    columns : pd.Index
+        Codes of the grid. Events of other codes are ignored.
+
+    Returns
+    -------
+    np.ndarray
+        A float array of shape (len(on), len(columns)), NaN before the first
+        event of each code.
+
+    ---------------------------------------------------------------------------
+
+    在 (日期 x 代码) 网格上对 (日期, 代码) 事件进行时点查找。
+
+    每个单元取该代码在网格日期当日或之前最新事件的数值。事件按 (代码, 秒) 组合键
+    排序一次，所有单元通过一次 searchsorted 定位。
+
+    参数
+    ----------
+    dates : pd.DatetimeIndex
+        事件日期。
+    codes : pd.Index
+        事件代码。
+    values : np.ndarray
+        事件数值。
+    on : pd.DatetimeIndex
+        网格日期。
+    columns : pd.Index
+        网格代码，其他代码的事件被忽略。
+
+    返回
+    -------
+    np.ndarray
+        形状为 (len(on), len(columns)) 的浮点数组，各代码首个事件之前为 NaN。
+
+    ---------------------------------------------------------------------------
+    """
+    code_idx = pd.Index(columns).get_indexer(codes)
+    keep = (code_idx >= 0) & pd.notnull(dates)
+    if not keep.any() or not len(on):
+        return np.full((len(on), len(columns)), np.nan)
+    code_idx = code_idx[keep].astype(np.int64)
+    seconds = pd.DatetimeIndex(dates)[keep].values.astype('datetime64[s]').astype(np.int64)
+    on_seconds = pd.DatetimeIndex(on).values.astype('datetime64[s]').astype(np.int64)
+    start = min(seconds.min(), on_seconds.min())
+    span = max(seconds.max(), on_seconds.max()) - start + 1
+    key = code_idx * span + (seconds - start)
+    order = np.argsort(key, kind='stable')
+    key, code_idx, values = key[order], code_idx[order], np.asarray(values, dtype=np.float64)[keep][order]
+    query = np.arange(len(columns), dtype=np.int64)[np.newaxis, :] * span + (on_seconds - start)[:, np.newaxis]
+    pos = np.searchsorted(key, query, side='right') - 1
+    found = (pos >= 0) & (code_idx[np.maximum(pos, 0)] == np.arange(len(columns))[np.newaxis, :])
+    return np.where(found, values[np.maximum(pos, 0)], np.nan)
+
+def __snapshots__(
+    dates: pd.DatetimeIndex, 
+    groups: pd.Index, 
+    codes: pd.Index, 
+    values: np.ndarray, 
+    on: pd.DatetimeIndex
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    As-of lookup of (date, group) snapshots on a (date x (group, code)) grid.
+
+    A snapshot is the set of (code, value) rows of a group (e.g. an index)
+    published on one date; it holds until the next snapshot of the group, and
+    codes missing from it are NaN. The latest snapshot of every (date, group)
+    is located with one searchsorted over a composite (group, seconds) key,
+    and the values with a second one over a (snapshot, code) key.
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        Dates of the snapshot rows.
+    groups : pd.Index
+        Groups of the snapshot rows.
+    codes : pd.Index
+        Codes of the snapshot rows.
+    values : np.ndarray
+        Values of the snapshot rows.
+    on : pd.DatetimeIndex
+        Dates of the grid.
+
+    Returns
+    -------
+    pd.DataFrame
+        The grid indexed by `on`, with (group, code) columns for every code
+        ever in a snapshot of the group.
+
+    ---------------------------------------------------------------------------
+
+    在 (日期 x (分组, 代码)) 网格上对 (日期, 分组) 快照进行时点查找。
+
+    快照是某分组（例如指数）在某日发布的 (代码, 数值) 行集合，持续有效至该分组的
+    下一个快照，快照中缺失的代码为 NaN。每个 (日期, 分组) 的最新快照通过 (分组, 秒)
+    组合键的一次 searchsorted 定位，数值通过 (快照, 代码) 组合键的第二次 searchsorted 获取。
+
+    参数
+    ----------
+    dates : pd.DatetimeIndex
+        快照行的日期。
+    groups : pd.Index
+        快照行的分组。
+    codes : pd.Index
+        快照行的代码。
+    values : np.ndarray
+        快照行的数值。
+    on : pd.DatetimeIndex
+        网格日期。
+
+    返回
+    -------
+    pd.DataFrame
+        以 `on` 为索引的网格，列为各分组曾出现于快照中的全部 (分组, 代码)。
+
+    ---------------------------------------------------------------------------
+    """
+    keep = pd.notnull(dates) & pd.notnull(groups) & pd.notnull(codes)
+    group_idx, group_uni = pd.factorize(pd.Index(groups)[keep], sort=True)
+    code_idx, code_uni = pd.factorize(pd.Index(codes)[keep], sort=True)
+    group_idx, code_idx = group_idx.astype(np.int64), code_idx.astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)[keep]
+    seconds = pd.DatetimeIndex(dates)[keep].values.astype('datetime64[s]').astype(np.int64)
+    on_seconds = pd.DatetimeIndex(on).values.astype('datetime64[s]').astype(np.int64)
+    if not len(seconds) or not len(on):
+        return pd.DataFrame(index=on, columns=pd.MultiIndex.from_arrays([[], []]), dtype=np.float64)
+    start = min(seconds.min(), on_seconds.min())
+    span = max(seconds.max(), on_seconds.max()) - start + 1
+    
+    snapshot_key = group_idx * span + (seconds - start)
+    snapshots, snapshot_idx = np.unique(snapshot_key, return_inverse=True)
+    query = np.arange(len(group_uni), dtype=np.int64)[np.newaxis, :] * span + (on_seconds - start)[:, np.newaxis]
+    pos = np.searchsorted(snapshots, query, side='right') - 1
+    pos = np.where((pos >= 0) & (snapshots[np.maximum(pos, 0)] // span == np.arange(len(group_uni))[np.newaxis, :]), pos, -1)
+    
+    pair = np.unique(group_idx * len(code_uni) + code_idx)
+    col_group, col_code = pair // len(code_uni), pair % len(code_uni)
+    row_key = snapshot_idx.astype(np.int64) * len(code_uni) + code_idx
+    order = np.argsort(row_key, kind='stable')
+    row_key, values = row_key[order], values[order]
+    row = pos[:, col_group]
+    query = np.maximum(row, 0) * len(code_uni) + col_code[np.newaxis, :]
+    found = np.minimum(np.searchsorted(row_key, query, side='left'), len(row_key) - 1)
+    found_ok = (row >= 0) & (row_key[found] == query)
+    x = np.where(found_ok, values[found], np.nan)
+    columns = pd.MultiIndex.from_arrays([group_uni[col_group], code_uni[col_code]])
+    return pd.DataFrame(x, index=on, columns=columns)
+
+def __persisted__(
+    name: str, 
+    compute: Callable[[pd.DatetimeIndex], pd.DataFrame], 
+    digest: Callable[[Any], Optional[Dict[str, Any]]]
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Returns a derived (trade_dt x code) panel through the panel cache.
+
+    The cached panel is reused while the count and the content checksum of
+    its source events (see `data_source.__digest__`) are unchanged, the same
+    key as the panels of the data sources. When only new trade days are
+    missing, and the events up to the cached end are unchanged, they are
+    computed and appended; otherwise the panel is computed in full and
+    rewritten. As the data source panels, it is cached with int32 security
+    ID columns and decoded back to codes when loaded.
+
+    Parameters
+    ----------
+    name : str
+        Name of the derived panel.
+    compute : Callable[[pd.DatetimeIndex], pd.DataFrame]
+        Computes the panel rows of the given trade days.
+    digest : Callable[[Any], Optional[Dict[str, Any]]]
+        Returns the count and the checksum of the source events dated on or
+        before a given date (None if they cannot be read).
+
+    Returns
+    -------
+    pd.DataFrame
+        The panel over all trade days.
+
+    ---------------------------------------------------------------------------
+
+    通过面板缓存返回衍生的 (trade_dt x 代码) 面板。
+
+    源事件的数量与内容校验和（见 `data_source.__digest__`）不变时复用缓存面板，
+    与数据源面板使用相同的键；仅缺少新交易日且缓存截止日之前的事件不变时，计算
+    并追加新日期；否则完整计算并重写面板。与数据源面板相同，缓存时以 int32 证券 ID
+    作为列，加载时解码回代码。
+
+    参数
+    ----------
+    name : str
+        衍生面板名称。
+    compute : Callable[[pd.DatetimeIndex], pd.DataFrame]
+        计算给定交易日的面板行。
+    digest : Callable[[Any], Optional[Dict[str, Any]]]
+        返回给定日期当日或之前源事件的数量与校验和（无法读取时为 None）。
+
+    返回
+    -------
+    pd.DataFrame
+        覆盖全部交易日的面板。
+
+    ---------------------------------------------------------------------------
+    """
+    cache = data_source.__panel_cache__
+    if cache is None:
+        return compute(trade_days)
+    current = digest(trade_days.max())
+    if current is None:
+        return compute(trade_days)
+    schema, table = 'flow', 'masks'
+    security = data_source.__security__
+    encode = lambda df: security.encode(df, COLUMNS_INFO.code, register=True)
+
+    def load() -> pd.DataFrame:
+        df = cache.load(schema, table, name, COLUMNS_INFO.trade_dt, COLUMNS_INFO.code)
+        return security.decode(df, COLUMNS_INFO.code) if df.columns.dtype.kind in 'iu' else df
+
+    version = {'end': str(trade_days.max())} | current
+    info = cache.info(schema, table, name)
+    before = None
+    if info is not None:
+        before = current if info['end'] == version['end'] else digest(pd.Timestamp(info['end']))
+    if before is not None and info['count'] == before['count'] and info.get('checksum') == before['checksum']:
+        if info['end'] == version['end']:
+            return load()
+        if info['end'] < version['end']:
+            df = compute(trade_days[trade_days > pd.Timestamp(info['end'])])
+            if cache.append(schema, table, name, encode(df), **version):
+                return load()
+    df = compute(trade_days)
+    try:
+        cache.write(schema, table, name, encode(df), **version)
+    except OSError:
+        print(f"WARNING: PANEL CACHE NOT WRITTEN ON <{name}>")
+    return df
+
+def __universe__(
+    universe: Optional[str] = None, 
+    codes: Optional[List[str]] = None, 
+    start: Optional[Any] = None, 
+    end: Optional[Any] = None
+) -> Optional[List[str]]:
+    """
+    ===========================================================================
+
+    Resolves an index universe and/or a code list into the codes to load.
+
+    The members of the index are read from the index weight table, from one
+    year before `start` (member snapshots are carried forward) up to `end`.
+
+    Parameters
+    ----------
+    universe : Optional[str], optional
+        The index, e.g. '000905' or '500' (see FACTORIZE.index_mapping).
+        Defaults to None.
+    codes : Optional[List[str]], optional
+        Explicit codes, intersected with the universe when both are given.
+        Defaults to None.
+    start : Optional[Any], optional
+        The start date of the request. Defaults to None.
+    end : Optional[Any], optional
+        The end date of the request. Defaults to None.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The codes, or None for all codes.
+
+    ---------------------------------------------------------------------------
+
+    将指数范围和/或代码列表解析为需要加载的代码。
+
+    指数成分从指数权重表读取，范围为 `start` 前一年（成分快照向后沿用）至 `end`。
+
+    参数
+    ----------
+    universe : Optional[str], optional
+        指数，例如 '000905' 或 '500'（参见 FACTORIZE.index_mapping）。默认为 None。
+    codes : Optional[List[str]], optional
+        指定的代码，与指数范围同时给出时取交集。默认为 None。
+    start : Optional[Any], optional
+        请求的起始日期。默认为 None。
+    end : Optional[Any], optional
+        请求的结束日期。默认为 None。
+
+    返回
+    -------
+    Optional[List[str]]
+        代码列表，None 表示全部代码。
+
+    ---------------------------------------------------------------------------
+    """
+    codes = [codes] if isinstance(codes, str) else codes
+    if universe is None:
+        return codes
+    idx_code = FACTORIZE.index_mapping.get(str(universe), str(universe))
+    tables = _HELP[_HELP[DB_INFO.table_info].str.contains('aindex') & (_HELP[DB_INFO.columns_info] == 'S_INFO_IDXCODE')]
+    if not len(tables):
+        raise ValueError(f"Invalid value '{universe}' for parameter 'universe'. No index member table is available")
+    source = INDEX[tables[DB_INFO.table_info].iloc[0]]
+    where = [f"S_INFO_IDXCODE = '{idx_code}'"]
+    if start is not None:
+        where.append(f"{COLUMNS_INFO.trade_dt} >= '{pd.to_datetime(start) - pd.DateOffset(years=1)}'")
+    if end is not None:
+        where.append(f"{COLUMNS_INFO.trade_dt} <= '{pd.to_datetime(end)}'")
+    members = source.__read__(columns=f"DISTINCT {COLUMNS_INFO.code}", where=' AND '.join(where)).iloc[:, 0]
+    members = sorted(members.astype(str).unique())
+    if codes is not None:
+        members = [i for i in members if i in set(codes)]
+    return members
 
 class stock():
     """
@@ -103,6 +535,7 @@ class stock():
 
         ---------------------------------------------------------------------------
         """
+        self.__dict__.pop('_masks', None)
         for i,j in STOCK.items():
             if j.table not in self.not_init_tables:
                 try:
@@ -181,13 +614,20 @@ class stock():
         quarter_adj: bool = False, 
         quarter_diff: int = 1, 
         shift: int = 0, 
+        start: Optional[Any] = None, 
+        universe: Optional[str] = None, 
+        codes: Optional[List[str]] = None, 
+        as_panel: bool = False, 
         **kwargs: Any
-    ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame], Panel]:
         """
         ===========================================================================
 
         Retrieves data for specified keys from various stock tables.
 
+        `start`, `end` and the codes resolved from `universe` / `codes` are
+        pushed down into the database queries.
+
         Parameters
         ----------
         keys : Union[str, List[str]]
@@ -200,13 +640,23 @@ class stock():
             Quarter difference for adjustment. Defaults to 1.
         shift : int, optional
             Shift for data. Defaults to 0.
+        start : Optional[Any], optional
+            The start date for data retrieval. Defaults to None.
+        universe : Optional[str], optional
+            An index whose members are retrieved, e.g. '000905'. Defaults to None.
+        codes : Optional[List[str]], optional
+            The codes for data retrieval. Defaults to None (all codes).
+        as_panel : bool, optional
+            Whether to return a dense Panel (one field per key for several keys).
+            Defaults to False.
         **kwargs : Any
             Additional keyword arguments passed to the data source.
 
         Returns
         -------
-        Union[pd.DataFrame, Dict[str, pd.DataFrame]]
-            A DataFrame or a dictionary of DataFrames containing the requested data.
+        Union[pd.DataFrame, Dict[str, pd.DataFrame], Panel]
+            A DataFrame or a dictionary of DataFrames containing the requested data,
+            or a Panel if `as_panel` is True.
 
         Raises
         -------
@@ -217,6 +667,8 @@ class stock():
 
         从各种股票表中检索指定键的数据。
 
+        `start`、`end` 以及由 `universe` / `codes` 解析得到的代码下推至数据库查询。
+
         参数
         ----------
         keys : Union[str, List[str]]
@@ -229,13 +681,21 @@ class stock():
             季度调整的季度差异。默认为 1。
         shift : int, optional
             数据偏移。默认为 0。
+        start : Optional[Any], optional
+            数据检索的起始日期。默认为 None。
+        universe : Optional[str], optional
+            检索其成分股的指数，例如 '000905'。默认为 None。
+        codes : Optional[List[str]], optional
+            数据检索的代码。默认为 None（全部代码）。
+        as_panel : bool, optional
+            是否返回稠密面板（多个键时每个键一个字段）。默认为 False。
         **kwargs : Any
             传递给数据源的附加关键字参数。
 
         返回
         -------
-        Union[pd.DataFrame, Dict[str, pd.DataFrame]]
-            包含请求数据的DataFrame或DataFrame字典。
+        Union[pd.DataFrame, Dict[str, pd.DataFrame], Panel]
+            包含请求数据的DataFrame或DataFrame字典；`as_panel` 为 True 时返回面板。
 
         引发
         -------
@@ -245,6 +705,7 @@ class stock():
         ---------------------------------------------------------------------------
         """
         keys = [keys.upper()] if isinstance(keys, str) else [i.upper() for i in keys]
+        start, end = __date_arg__(start), __date_arg__(end)
         tables = self._help
         tables = tables[tables[DB_INFO.columns_info].isin(keys)]        
         
@@ -256,12 +717,78 @@ class stock():
             raise ValueError(f"not exist value '{not_exist_keys}' for parameter 'keys'")
             
         load_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
-        load_info = {i: getattr(self, i)(j, end, quarter_adj, quarter_diff, shift, **kwargs) for i,j in load_info.items()}
+        codes = __universe__(universe, codes, start, end)
+        load_info = __parallel__({i: (lambda i=i, j=j: getattr(self, i)(j, end, quarter_adj, quarter_diff, shift, start=start, codes=codes, **kwargs)) for i,j in load_info.items()})
         if len(load_info) == 1:
-            return list(load_info.values())[0]
+            x = __date_key__(list(load_info.values())[0])
         else:
-            return load_info
+            x = __date_key__(load_info)
+        return Panel.from_frame(x) if as_panel else x
         
+    def prefetch(
+        self, 
+        keys: Union[str, List[str]], 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        universe: Optional[str] = None, 
+        codes: Optional[List[str]] = None, 
+        **kwargs: Any
+    ):
+        """
+        ===========================================================================
+
+        Loads several keys ahead of use, with one query per table. The tables
+        are loaded concurrently (see `__parallel__`), so strategies can warm
+        every column they need at startup.
+
+        Parameters
+        ----------
+        keys : Union[str, List[str]]
+            A single key or a list of keys (column names) to load.
+        start : Optional[Any], optional
+            The start date for data retrieval. Defaults to None.
+        end : Optional[Any], optional
+            The end date for data retrieval. Defaults to None.
+        universe : Optional[str], optional
+            An index whose members are retrieved, e.g. '000905'. Defaults to None.
+        codes : Optional[List[str]], optional
+            The codes for data retrieval. Defaults to None (all codes).
+        **kwargs : Any
+            Additional keyword arguments passed to the data source.
+
+        ---------------------------------------------------------------------------
+
+        预先加载多个键，每张表只执行一次查询。各表并发加载（见 `__parallel__`），
+        策略可在启动时预热所需的全部列。
+
+        参数
+        ----------
+        keys : Union[str, List[str]]
+            需要加载的单个键或键（列名）列表。
+        start : Optional[Any], optional
+            数据检索的起始日期。默认为 None。
+        end : Optional[Any], optional
+            数据检索的结束日期。默认为 None。
+        universe : Optional[str], optional
+            检索其成分股的指数，例如 '000905'。默认为 None。
+        codes : Optional[List[str]], optional
+            数据检索的代码。默认为 None（全部代码）。
+        **kwargs : Any
+            传递给数据源的附加关键字参数。
+
+        ---------------------------------------------------------------------------
+        """
+        keys = [keys.upper()] if isinstance(keys, str) else [i.upper() for i in keys]
+        tables = self._help
+        tables = tables[tables[DB_INFO.columns_info].isin(keys)]
+        not_exist_keys = list(set(keys) - set(tables[DB_INFO.columns_info].values))
+        if len(not_exist_keys):
+            raise ValueError(f"not exist value '{not_exist_keys}' for parameter 'keys'")
+        start, end = __date_arg__(start), __date_arg__(end)
+        codes = __universe__(universe, codes, start, end)
+        load_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
+        __parallel__({i: (lambda i=i, j=j: getattr(self, i).prefetch(j, start=start, end=end, codes=codes, **kwargs)) for i,j in load_info.items()})
+
     def letter_finance(
         self, 
         key: Union[str, List[str]], 
@@ -336,17 +863,18 @@ class stock():
         tables = self._help
         tables = tables[tables[DB_INFO.columns_info].isin(key)]
         load_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
-        df = [getattr(self, i).__finance_history__(j, periods + shift, trade_days) for i,j in load_info.items()][0]
+        lags = periods + shift + (quarter_diff if quarter_adj else 0)
+        df = [getattr(self, i).__finance_history__(j, periods + shift, trade_days, lags) for i,j in load_info.items()][0]
         if letter_info:
             tables = self._help
             tables = tables[tables[DB_INFO.columns_info].isin([key[0] + 'LT'])]
             letter_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
             if len(letter_info):
                 print('letter information is added.')
-                letters = [getattr(self, i).__finance_history__(j, periods + shift, trade_days) for i,j in letter_info.items()][0]
+                letters = [getattr(self, i).__finance_history__(j, periods + shift, trade_days, lags) for i,j in letter_info.items()][0]
                 df = df.fillna(letters.reindex_like(df))
         df = [getattr(self, i).__finance_history_adj__(df, quarter_adj, quarter_diff, shift, periods, min_periods, **kwargs) for i in load_info.keys()][0]
-        return df
+        return __date_key__(df)
     
     def stock_finance(
         self, 
@@ -356,6 +884,10 @@ class stock():
         shift: int = 0, 
         periods: int = 1, 
         min_periods: Optional[int] = None, 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        universe: Optional[str] = None, 
+        codes: Optional[List[str]] = None, 
         **kwargs: Any
     ) -> pd.DataFrame:
         """
@@ -363,6 +895,9 @@ class stock():
 
         Retrieves and processes stock finance data, with optional adjustments.
 
+        `end` and the codes are pushed down into the database query. Only the
+        announcements needed for the trade days from `start` on are loaded.
+
         Parameters
         ----------
         key : Union[str, List[str]]
@@ -377,6 +912,14 @@ class stock():
             Number of periods for historical data. Defaults to 1.
         min_periods : Optional[int], optional
             Minimum number of periods required. Defaults to None.
+        start : Optional[Any], optional
+            The first trade day returned. Defaults to None.
+        end : Optional[Any], optional
+            The last trade day returned. Defaults to None.
+        universe : Optional[str], optional
+            An index whose members are retrieved, e.g. '000905'. Defaults to None.
+        codes : Optional[List[str]], optional
+            The codes for data retrieval. Defaults to None (all codes).
         **kwargs : Any
             Additional keyword arguments.
 
@@ -389,6 +932,8 @@ class stock():
 
         检索和处理股票财务数据，并进行可选调整。
 
+        `end` 和代码下推至数据库查询，仅加载 `start` 之后交易日所需的公告。
+
         参数
         ----------
         key : Union[str, List[str]]
@@ -403,6 +948,14 @@ class stock():
             历史数据的周期数。默认为 1。
         min_periods : Optional[int], optional
             所需的最小周期数。默认为 None。
+        start : Optional[Any], optional
+            返回的第一个交易日。默认为 None。
+        end : Optional[Any], optional
+            返回的最后一个交易日。默认为 None。
+        universe : Optional[str], optional
+            检索其成分股的指数，例如 '000905'。默认为 None。
+        codes : Optional[List[str]], optional
+            数据检索的代码。默认为 None（全部代码）。
         **kwargs : Any
             附加关键字参数。
 
@@ -417,9 +970,19 @@ class stock():
         tables = self._help
         tables = tables[tables[DB_INFO.columns_info].isin(key)]
         load_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
-        df = [getattr(self, i).__get__(j) for i,j in load_info.items()][0].iloc[:, 0]
-        df = [getattr(self, i).__finance__(df, quarter_adj, quarter_diff, shift, periods, min_periods, trade_days) for i in load_info.keys()][0]
-        return df
+        start, end = __date_arg__(start), __date_arg__(end)
+        codes = __universe__(universe, codes, start, end)
+        days = trade_days if start is None else trade_days[trade_days >= start]
+        days = days if end is None else days[days <= end]
+        load_start = None
+        if start is not None:
+            load_start = pd.to_datetime(start) - pd.DateOffset(months=3 * (shift + periods + quarter_diff + 1))
+            load_start = max(load_start, pd.to_datetime(FILTER.ann_start))
+        df = [getattr(self, i).__get__(j, start=load_start, end=end, codes=codes) for i,j in load_info.items()][0].iloc[:, 0]
+        df = [getattr(self, i).__finance__(df, quarter_adj, quarter_diff, shift, periods, min_periods, days) for i in load_info.keys()][0]
+        if codes is not None:
+            df = df.loc[:, df.columns.isin(codes)]
+        return __date_key__(df)
     
     
     def is_st(
@@ -431,6 +994,10 @@ class stock():
 
         Checks if a stock is marked as ST (Special Treatment) or other status.
 
+        The status of each trade day is looked up as of the latest status
+        change with one searchsorted, and kept as an int8 panel (-1 for no
+        status) in the panel cache, new trade days being appended.
+
         Parameters
         ----------
         **kwargs : Any
@@ -445,6 +1012,9 @@ class stock():
 
         检查股票是否被标记为ST（特别处理）或其他状态。
 
+        每个交易日的状态通过一次 searchsorted 按最近一次状态变更查找，
+        并以 int8 面板（-1 表示无状态）保存在面板缓存中，新交易日追加写入。
+
         参数
         ----------
         **kwargs : Any
@@ -465,12 +1035,22 @@ class stock():
             df = self.asharestatus.__get__('PUBLIC_STATUS_ID', where=None)
             status = {301001:0, 301002:1, 301003:2, 301005:3}
             df = df[df.isin(status.keys())].dropna()
-            df = df['PUBLIC_STATUS_ID'].replace(status)[~df.index.duplicated()].unstack(COLUMNS_INFO.code)
-            x = df.reindex(pd.date_range(df.index.min(), trade_days.max(), name=COLUMNS_INFO.trade_dt)).ffill().reindex(trade_days).sort_index(axis=1)
-            self._is_st = x
-        x = self._is_st
-        x = x[x < 3].loc[FILTER.trade_start:]
-        return x
+            df = df['PUBLIC_STATUS_ID'].replace(status)[~df.index.duplicated()]
+            dates = df.index.get_level_values(0)
+            codes = df.index.get_level_values(COLUMNS_INFO.code).unique().sort_values()
+            
+            def compute(days: pd.DatetimeIndex) -> pd.DataFrame:
+                x = __as_of__(dates, df.index.get_level_values(COLUMNS_INFO.code), df.values, days, codes)
+                x = np.where(np.isnan(x), -1, x).astype(np.int8)
+                return pd.DataFrame(x, index=pd.Index(days, name=COLUMNS_INFO.trade_dt), columns=codes)
+            source = self.asharestatus
+            
+            def digest(end: Any) -> Optional[Dict[str, Any]]:
+                return source.__digest__(f"{source.filter_key} <= '{pd.to_datetime(end)}'")
+            self._is_st = __persisted__('IS_ST', compute, digest)
+        x = self._is_st.loc[FILTER.trade_start:]
+        x = x.where((x >= 0) & (x < 3))
+        return __date_key__(x)
     
     def be_list(
         self, 
@@ -482,6 +1062,10 @@ class stock():
 
         Calculates the number of days a stock has been listed.
 
+        The count is the natural days listed at the first trade day plus the
+        trade days listed since, located from the listing dates with one
+        searchsorted and kept as an int32 panel in the panel cache.
+
         Parameters
         ----------
         limit : int, optional
@@ -498,6 +1082,9 @@ class stock():
 
         计算股票上市天数。
 
+        计数为首个交易日时的已上市自然日数加上此后已上市的交易日数，
+        由上市日期通过一次 searchsorted 定位，并以 int32 面板保存在面板缓存中。
+
         参数
         ----------
         limit : int, optional
@@ -513,17 +1100,61 @@ class stock():
         ---------------------------------------------------------------------------
         """
         if not hasattr(self, '_be_list'):
-            df = self(['S_INFO_LISTDATE', 'S_INFO_DELISTDATE'], **kwargs).set_index('S_INFO_DELISTDATE', append=True).iloc[:, 0].unstack().T
-            df = df.bfill().reindex(pd.date_range(df.min().min(), trade_days.max(), name=COLUMNS_INFO.trade_dt)).bfill().ffill()
-            df = ((df.sub(df.index, axis=0).astype('int64') / 8.64e13) * -1).round(0)
-            df.index = df.index + pd.Timedelta(15, 'h')
-            df = df[df > 0]
-            x = (df > 0).loc[trade_days]
-            x = x.cumsum() + df.loc[x.index[0]].fillna(0)
-            self._be_list = x
+            df = self(['S_INFO_LISTDATE'], **kwargs).iloc[:, 0]
+            df = pd.to_datetime(df[~df.index.duplicated()]).sort_index()
+            listed = df.notnull().values
+            list_date = df.values.astype('datetime64[ns]').astype(np.int64)
+            natural_days = (trade_days - calendar.bias).values.astype('datetime64[ns]').astype(np.int64)
+            first = np.searchsorted(natural_days, list_date + 43_200_000_000_000, side='right')
+            before = np.round((natural_days[0] - list_date) / 8.64e13)
+            before = np.where(listed & (before > 0), before, 0)
+            
+            def compute(days: pd.DatetimeIndex) -> pd.DataFrame:
+                pos = trade_days.get_indexer(days)
+                x = before[np.newaxis, :] + np.maximum(pos[:, np.newaxis] - first[np.newaxis, :] + 1, 0)
+                x = np.where(listed[np.newaxis, :], x, 0).astype(np.int32)
+                return pd.DataFrame(x, index=pd.Index(days, name=COLUMNS_INFO.trade_dt), columns=df.index)
+            tables = self._help
+            source = getattr(self, tables[tables[DB_INFO.columns_info] == 'S_INFO_LISTDATE'][DB_INFO.table_info].iloc[0])
+            self._be_list = __persisted__('BE_LIST', compute, lambda end: source.__digest__())
         x = self._be_list
         df = (x >= limit).loc[FILTER.trade_start:]
-        return df
+        return __date_key__(df)
+    
+    def security(self) -> security_master:
+        """
+        ===========================================================================
+
+        Returns the security master, with stable int32 security IDs. It is
+        the master that keys the data source panels (`data_source.__security__`),
+        completed once per session with the listing and status tables.
+
+        Returns
+        -------
+        security_master
+            The security master.
+
+        ---------------------------------------------------------------------------
+
+        返回证券主表，证券 ID 为稳定的 int32。即数据源面板作为键使用的主表
+        （`data_source.__security__`），每个会话由上市表与状态表补全一次。
+
+        返回
+        -------
+        security_master
+            证券主表。
+
+        ---------------------------------------------------------------------------
+        """
+        if not hasattr(self, '_security'):
+            listing = self.asharelisting.__get__(['S_INFO_COMPNAME', 'S_INFO_LISTDATE', 'S_INFO_DELISTDATE'], where=None)
+            listing = listing.reset_index().set_index(COLUMNS_INFO.code)[['S_INFO_COMPNAME', 'S_INFO_LISTDATE', 'S_INFO_DELISTDATE']]
+            try:
+                codes = self.asharestatus.__read__(columns=f"DISTINCT {COLUMNS_INFO.code}").iloc[:, 0].astype(str).tolist()
+            except:
+                codes = None
+            self._security = data_source.__security__.update(listing, codes)
+        return self._security
 
 class index():
     """
@@ -618,6 +1249,8 @@ class index():
         self, 
         keys: Union[str, List[str]], 
         end: Optional[Any] = None, 
+        start: Optional[Any] = None, 
+        codes: Optional[List[str]] = None, 
         **kwargs: Any
     ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
         """
@@ -625,12 +1258,18 @@ class index():
 
         Retrieves data for specified keys from various index tables.
 
+        `start`, `end` and `codes` are pushed down into the database queries.
+
         Parameters
         ----------
         keys : Union[str, List[str]]
             A single key or a list of keys (column names) to retrieve data for.
         end : Optional[Any], optional
             The end date for data retrieval. Defaults to None.
+        start : Optional[Any], optional
+            The start date for data retrieval. Defaults to None.
+        codes : Optional[List[str]], optional
+            The index codes for data retrieval. Defaults to None (all codes).
         **kwargs : Any
             Additional keyword arguments passed to the data source.
 
@@ -648,12 +1287,18 @@ class index():
 
         从各种指数表中检索指定键的数据。
 
+        `start`、`end` 和 `codes` 下推至数据库查询。
+
         参数
         ----------
         keys : Union[str, List[str]]
             要检索数据的单个键或键（列名）列表。
         end : Optional[Any], optional
             数据检索的结束日期。默认为 None。
+        start : Optional[Any], optional
+            数据检索的起始日期。默认为 None。
+        codes : Optional[List[str]], optional
+            数据检索的指数代码。默认为 None（全部代码）。
         **kwargs : Any
             传递给数据源的附加关键字参数。
 
@@ -670,6 +1315,7 @@ class index():
         ---------------------------------------------------------------------------
         """
         keys = [keys.upper()] if isinstance(keys, str) else [i.upper() for i in keys]
+        start, end = __date_arg__(start), __date_arg__(end)
         tables = self._help
         tables = tables[tables[DB_INFO.columns_info].isin(keys)]
         
@@ -681,11 +1327,11 @@ class index():
             raise ValueError(f"not exist value '{not_exist_keys}' for parameter 'keys'")
             
         load_info = tables.groupby(DB_INFO.table_info)[DB_INFO.columns_info].apply(list).to_dict()
-        load_info = {i: getattr(self, i)(j, end, **kwargs) for i,j in load_info.items()}
+        load_info = __parallel__({i: (lambda i=i, j=j: getattr(self, i)(j, end, start=start, codes=codes, **kwargs)) for i,j in load_info.items()})
         if len(load_info) == 1:
-            return list(load_info.values())[0]
+            return __date_key__(list(load_info.values())[0])
         else:
-            return load_info
+            return __date_key__(load_info)
     
     def index_member(
         self, 
@@ -696,43 +1342,64 @@ class index():
 
         Retrieves and processes index member data.
 
+        The weights of every index are looked up as of its latest rebalance
+        with one as-of join over all indices (see `__snapshots__`), and the
+        panel is kept in the panel cache, new trade days being appended.
+
         Parameters
         ----------
         **kwargs : Any
-            Additional keyword arguments.
+            Additional keyword arguments. The panel cache is used only when
+            no keyword argument is given.
 
         Returns
         -------
         pd.DataFrame
-            A DataFrame containing processed index member data.
+            A DataFrame containing processed index member data, with
+            (index, code) columns.
 
         ---------------------------------------------------------------------------
 
         检索和处理指数成分数据。
 
+        各指数的权重通过一次覆盖全部指数的时点连接（见 `__snapshots__`）按其最近一次
+        调仓查找，面板保存在面板缓存中，新交易日追加写入。
+
         参数
         ----------
         **kwargs : Any
-            附加关键字参数。
+            附加关键字参数。仅在未传入关键字参数时使用面板缓存。
 
         返回
         -------
         pd.DataFrame
-            包含处理后的指数成分数据的DataFrame。
+            包含处理后的指数成分数据的DataFrame，列为 (指数, 代码)。
 
         ---------------------------------------------------------------------------
         """
         if not hasattr(self, '_index_member'):
-            df = self.__call__(['S_INFO_IDXCODE', 'S_DQ_IDXWEIGHT'], **kwargs)
-            df['S_DQ_IDXWEIGHT'] = df['S_DQ_IDXWEIGHT']
-            df.index.names = [COLUMNS_INFO.trade_dt, COLUMNS_INFO.code]
-            dic = {}
-            for i,j in df.groupby('S_INFO_IDXCODE'):
-                j = j['S_DQ_IDXWEIGHT'].unstack()
-                j = j.tools.fillna(sorted(set(pd.date_range(FILTER.ann_start, pd.Timestamp.today())) | set(j.index)))
-                dic[i] = j
-            df = pd.concat(dic, axis=1)
-            df = df.reindex(trade_days).loc[FILTER.trade_start:]
+            tables = self._help
+            source = getattr(self, tables[tables[DB_INFO.columns_info] == 'S_DQ_IDXWEIGHT'][DB_INFO.table_info].iloc[0])
+            
+            def compute(days: pd.DatetimeIndex) -> pd.DataFrame:
+                df = calendar.decode(self.__call__(['S_INFO_IDXCODE', 'S_DQ_IDXWEIGHT'], **kwargs))
+                x = __snapshots__(
+                    df.index.get_level_values(0), 
+                    pd.Index(df['S_INFO_IDXCODE']), 
+                    df.index.get_level_values(-1), 
+                    df['S_DQ_IDXWEIGHT'].values, 
+                    days
+                )
+                x.columns = [f'{i}/{j}' for i,j in x.columns]
+                return x
+            
+            def digest(end: Any) -> Optional[Dict[str, Any]]:
+                return source.__digest__(f"{COLUMNS_INFO.trade_dt} <= '{pd.to_datetime(end)}'")
+            
+            df = compute(trade_days) if len(kwargs) else __persisted__('INDEX_MEMBER', compute, digest)
+            df.columns = pd.MultiIndex.from_tuples([tuple(i.split('/', 1)) for i in df.columns], names=[None, COLUMNS_INFO.code])
+            df.index.name = COLUMNS_INFO.trade_dt
+            df = df.loc[FILTER.trade_start:]
             self._index_member = df
         df = self._index_member
-        return df
+        return __date_key__(df)
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:26:52 2026
+
+@author: Porco Rosso
+"""
+
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class main():
+    """
+    ===========================================================================
+
+    Memory manager of the tables and panels loaded by data sources.
+
+    Every loaded object is registered under (table, name) with its size in
+    bytes. When the total exceeds the budget, the least recently used objects
+    are evicted from their data source, except the pinned panels. An evicted
+    object is loaded again (from the panel cache or the database) the next
+    time it is requested. The registry is guarded by a lock, so data sources
+    can be loaded from several threads.
+
+    ---------------------------------------------------------------------------
+
+    数据源已加载表与面板的内存管理器。
+
+    每个已加载对象以 (表, 名称) 登记其字节数。总量超过预算时，按最近最少使用的
+    顺序从数据源中淘汰对象，固定的面板除外。被淘汰的对象在下次请求时重新加载
+    （来自面板缓存或数据库）。登记表由锁保护，数据源可在多个线程中加载。
+
+    ---------------------------------------------------------------------------
+    """
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        pinned: Optional[List[str]] = None
+    ):
+        """
+        ===========================================================================
+
+        Initializes the memory manager.
+
+        Parameters
+        ----------
+        budget : Optional[int], optional
+            The memory budget in bytes. None means unlimited. Defaults to None.
+        pinned : Optional[List[str]], optional
+            Names of panels that are never evicted. Defaults to None.
+
+        ---------------------------------------------------------------------------
+
+        初始化内存管理器。
+
+        参数
+        ----------
+        budget : Optional[int], optional
+            内存预算（字节），None 表示不限制。默认为 None。
+        pinned : Optional[List[str]], optional
+            永不淘汰的面板名称。默认为 None。
+
+        ---------------------------------------------------------------------------
+        """
+        self.budget = budget
+        self.pinned = set([] if pinned is None else [i.upper() for i in pinned])
+        self._entries: OrderedDict = OrderedDict()
+        self._evicted: set = set()
+        self._stats: Dict[str, int] = {'hits': 0, 'loads': 0, 'reloads': 0, 'evictions': 0, 'evicted_bytes': 0}
+        self._lock = threading.RLock()
+        self._holds = 0
+
+    @staticmethod
+    def __objects__(values: np.ndarray) -> int:
+        """
+        ===========================================================================
+
+        Estimates the deep size in bytes of an object array (the pointers and
+        the objects), from the mean size of about 1000 evenly spaced elements.
+
+        ---------------------------------------------------------------------------
+
+        估计对象数组的深度字节数（指针与对象），由约 1000 个等间隔元素的平均大小
+        推算。
+
+        ---------------------------------------------------------------------------
+        """
+        if not len(values):
+            return 0
+        sample = values[::max(len(values) // 1000, 1)]
+        return int(len(values) * (8 + np.mean([sys.getsizeof(i) for i in sample])))
+
+    @staticmethod
+    def nbytes(obj: Any) -> int:
+        """
+        ===========================================================================
+
+        Returns the size in bytes of a loaded object.
+
+        Object columns and indexes (e.g. string codes) are counted with their
+        objects, estimated from a sample (see `__objects__`), as the exact
+        deep size takes seconds on a full panel. The levels of a MultiIndex
+        are unique values and are counted exactly.
+
+        ---------------------------------------------------------------------------
+
+        返回已加载对象的字节数。
+
+        对象类型的列与索引（例如字符串代码）连同其对象一并计算，由抽样估计（见
+        `__objects__`），因为完整面板的精确深度大小需要数秒。MultiIndex 的层级为
+        唯一值，精确计算。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(obj, np.ndarray):
+            return int(obj.nbytes) if obj.dtype != object else main.__objects__(obj.ravel())
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame()
+        if not isinstance(obj, pd.DataFrame):
+            return 0
+        size = int(obj.memory_usage(index=False, deep=False).sum())
+        for i in np.flatnonzero((obj.dtypes == object).values):
+            values = obj.iloc[:, i].values
+            size += main.__objects__(values) - values.nbytes
+        index = obj.index
+        if isinstance(index, pd.MultiIndex) or index.dtype != object:
+            size += int(index.memory_usage(deep=True))
+        else:
+            size += main.__objects__(index.values)
+        return size
+
+    def register(
+        self,
+        owner: Any,
+        name: str,
+        obj: Any
+    ):
+        """
+        ===========================================================================
+
+        Registers (or updates) a loaded object as the most recently used.
+
+        Parameters
+        ----------
+        owner : Any
+            The data source holding the object.
+        name : str
+            The attribute name of the object on the data source.
+        obj : Any
+            The loaded object.
+
+        ---------------------------------------------------------------------------
+
+        登记（或更新）已加载对象，并标记为最近使用。
+
+        参数
+        ----------
+        owner : Any
+            持有该对象的数据源。
+        name : str
+            对象在数据源上的属性名。
+        obj : Any
+            已加载的对象。
+
+        ---------------------------------------------------------------------------
+        """
+        key = (owner.table, name)
+        with self._lock:
+            if key in self._evicted:
+                self._evicted.discard(key)
+                self._stats['reloads'] += 1
+            elif key not in self._entries:
+                self._stats['loads'] += 1
+            self._entries[key] = {'owner': weakref.ref(owner), 'bytes': self.nbytes(obj)}
+            self._entries.move_to_end(key)
+
+    def touch(
+        self,
+        owner: Any,
+        names: List[str]
+    ):
+        """
+        ===========================================================================
+
+        Marks registered objects as the most recently used.
+
+        ---------------------------------------------------------------------------
+
+        将已登记对象标记为最近使用。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            for i in names:
+                key = (owner.table, i)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+
+    def forget(
+        self,
+        owner: Any,
+        name: str
+    ):
+        """
+        ===========================================================================
+
+        Removes an object from the registry without counting an eviction.
+
+        ---------------------------------------------------------------------------
+
+        从登记中移除对象，不计入淘汰。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            self._entries.pop((owner.table, name), None)
+
+    @contextmanager
+    def hold(self):
+        """
+        ===========================================================================
+
+        Defers eviction while loads run concurrently, then enforces the budget
+        once on exit.
+
+        Without it, a thread could evict an object another thread has just
+        loaded and not yet read.
+
+        ---------------------------------------------------------------------------
+
+        在并发加载期间推迟淘汰，退出时统一执行一次预算检查。
+
+        否则一个线程可能淘汰另一个线程刚加载但尚未读取的对象。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            self._holds += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._holds -= 1
+            self.enforce()
+
+    def enforce(self):
+        """
+        ===========================================================================
+
+        Evicts the least recently used unpinned objects until the budget holds.
+
+        ---------------------------------------------------------------------------
+
+        淘汰最近最少使用的非固定对象，直到满足预算。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.budget is None:
+            return
+        with self._lock:
+            if self._holds:
+                return
+            usage = sum([i['bytes'] for i in self._entries.values()])
+            candidates = [i for i in self._entries.keys() if i[1] not in self.pinned]
+            for key in candidates:
+                if usage <= self.budget:
+                    break
+                entry = self._entries.pop(key, None)
+                if entry is None:
+                    continue
+                owner = entry['owner']()
+                if owner is not None:
+                    owner.__evict__(key[1])
+                self._evicted.add(key)
+                self._stats['evictions'] += 1
+                self._stats['evicted_bytes'] += entry['bytes']
+                usage = sum([i['bytes'] for i in self._entries.values()])
+
+    def clear(self):
+        """
+        ===========================================================================
+
+        Evicts every registered object, pinned ones included (e.g. after the
+        dtype mode changes).
+
+        ---------------------------------------------------------------------------
+
+        淘汰全部已登记对象，包括固定对象（例如数据类型模式改变之后）。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            for key in list(self._entries.keys()):
+                entry = self._entries.pop(key, None)
+                if entry is None:
+                    continue
+                owner = entry['owner']()
+                if owner is not None:
+                    owner.__evict__(key[1])
+                self._evicted.add(key)
+                self._stats['evictions'] += 1
+                self._stats['evicted_bytes'] += entry['bytes']
+
+    def usage(self) -> pd.Series:
+        """
+        ===========================================================================
+
+        Returns the bytes currently held per (table, name), most recent last.
+
+        Returns
+        -------
+        pd.Series
+            Bytes indexed by (table, name).
+
+        ---------------------------------------------------------------------------
+
+        返回当前每个 (表, 名称) 占用的字节数，最近使用的排在最后。
+
+        返回
+        -------
+        pd.Series
+            以 (表, 名称) 为索引的字节数。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        index = pd.MultiIndex.from_tuples([i[0] for i in entries], names=['TABLE', 'NAME'])
+        return pd.Series([i[1]['bytes'] for i in entries], index=index, dtype='int64', name='BYTES')
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        ===========================================================================
+
+        Returns the budget, the current usage and the eviction statistics.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Keys: budget, usage, objects, pinned, hits, loads, reloads,
+            evictions, evicted_bytes.
+
+        ---------------------------------------------------------------------------
+
+        返回预算、当前占用以及淘汰统计。
+
+        返回
+        -------
+        Dict[str, Any]
+            键：budget、usage、objects、pinned、hits、loads、reloads、
+            evictions、evicted_bytes。
+
+        ---------------------------------------------------------------------------
+        """
+        usage = self.usage()
+        dic = {
+            'budget': self.budget,
+            'usage': int(usage.sum()),
+            'objects': len(usage),
+            'pinned': int(usage[usage.index.get_level_values('NAME').isin(self.pinned)].sum()),
+        }
+        return dic | self._stats
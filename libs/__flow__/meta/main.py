@@ -5,10 +5,16 @@ Created on Fri Feb  7 23:16:33 2025
 @author: Porco Rosso
 """
 
-from libs.__flow__.config import COLUMNS_INFO
+from libs.__flow__.config import COLUMNS_INFO, CACHE, MEMORY, DTYPE
+from libs import __DUCKDB_STATSMETHOD__
 from libs.__flow__.base.main import __source__
+from libs.__flow__.cache.main import main as panel_cache
+from libs.__flow__.finance import main as finance
+from libs.__flow__.memory.main import main as memory
+from libs.__flow__.security.main import main as security_master
+import numpy as np
 import pandas as pd
-from typing import Any, List, Optional, Union, Tuple
+from typing import Any, Dict, List, Optional, Union, Tuple
 
 class data_source(__source__(), COLUMNS_INFO):
     """
@@ -24,6 +30,10 @@ class data_source(__source__(), COLUMNS_INFO):
 
     ---------------------------------------------------------------------------
     """
+    __panel_cache__ = panel_cache(CACHE.panel_path) if CACHE.panel_cache else None
+    __memory__ = memory(MEMORY.budget, MEMORY.pinned)
+    __security__ = security_master(path=None if __panel_cache__ is None else __panel_cache__.path / 'security')
+
     def __init__(
         self, 
         **kwargs: Any
@@ -156,9 +166,332 @@ class data_source(__source__(), COLUMNS_INFO):
         else:
             raise ValueError(f"Invalid value '{not_have_columns}' for parameter 'columns'. Valid values are: {self.columns}")
     
+    def __slice__(
+        self, 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        codes: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        ===========================================================================
+
+        Standardizes a (start, end, codes) slice of the table.
+
+        Parameters
+        ----------
+        start : Optional[Any], optional
+            The first date of the slice. Defaults to None (the table start).
+        end : Optional[Any], optional
+            The last date of the slice. Defaults to None (today).
+        codes : Optional[List[str]], optional
+            The codes of the slice. Defaults to None (all codes).
+
+        Returns
+        -------
+        Dict[str, Any]
+            The slice with keys 'start', 'end' and 'codes'.
+
+        ---------------------------------------------------------------------------
+
+        标准化表的 (start, end, codes) 切片。
+
+        参数
+        ----------
+        start : Optional[Any], optional
+            切片的起始日期。默认为 None（表的起始日期）。
+        end : Optional[Any], optional
+            切片的结束日期。默认为 None（今天）。
+        codes : Optional[List[str]], optional
+            切片的代码。默认为 None（全部代码）。
+
+        返回
+        -------
+        Dict[str, Any]
+            包含 'start'、'end' 和 'codes' 的切片。
+
+        ---------------------------------------------------------------------------
+        """
+        default = self.trade_start if self.filter_key == self.trade_dt else self.ann_start
+        start = pd.to_datetime(default if start is None else start)
+        end = None if end is None else pd.to_datetime(end)
+        codes = None if codes is None else sorted(set([codes] if isinstance(codes, str) else codes))
+        return {'start': start, 'end': end, 'codes': codes}
+
+    def __where__(
+        self, 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        codes: Optional[List[str]] = None, 
+        after: Optional[Any] = None, 
+        before: Optional[Any] = None, 
+        exclude: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        ===========================================================================
+
+        Builds the SQL where clause of a slice.
+
+        ---------------------------------------------------------------------------
+
+        构建切片的 SQL where 条件。
+
+        ---------------------------------------------------------------------------
+        """
+        where = []
+        if start is not None:
+            where.append(f"{self.filter_key} >= '{start}'")
+        if after is not None:
+            where.append(f"{self.filter_key} > '{after}'")
+        if before is not None:
+            where.append(f"{self.filter_key} < '{before}'")
+        if end is not None:
+            where.append(f"{self.filter_key} <= '{end}'")
+        if codes is not None:
+            where.append(f"{self.code} IN ({', '.join([repr(str(i)) for i in codes])})")
+        if exclude is not None and len(exclude):
+            where.append(f"{self.code} NOT IN ({', '.join([repr(str(i)) for i in exclude])})")
+        return ' AND '.join(where) if len(where) else None
+
+    def __covers__(
+        self, 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        codes: Optional[List[str]] = None, 
+        held: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        ===========================================================================
+
+        Checks whether the loaded slice (or `held`, e.g. the slice of a kept
+        pinned panel) covers the requested slice.
+
+        A table loaded with a custom 'where' is always considered as covering.
+
+        ---------------------------------------------------------------------------
+
+        检查已加载切片（或 `held`，例如保留的固定面板的切片）是否覆盖请求的切片。
+
+        使用自定义 'where' 加载的表总被视为覆盖。
+
+        ---------------------------------------------------------------------------
+        """
+        if held is None:
+            held = getattr(self, '_internal_slice', None)
+            if held is None:
+                return hasattr(self, '_internal_data')
+        req = self.__slice__(start, end, codes)
+        bools = (
+            req['start'] >= held['start'] 
+            and (held['end'] is None or (req['end'] is not None and req['end'] <= held['end'])) 
+            and (held['codes'] is None or (req['codes'] is not None and set(req['codes']) <= set(held['codes'])))
+        )
+        return bools
+
+    def __slice_parts__(
+        self, 
+        held: Dict[str, Any], 
+        req: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        ===========================================================================
+
+        Splits the union of the loaded and the requested slice into missing parts.
+
+        Parameters
+        ----------
+        held : Dict[str, Any]
+            The loaded slice.
+        req : Dict[str, Any]
+            The requested slice.
+
+        Returns
+        -------
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]
+            The where arguments of the missing parts, and the union slice.
+
+        ---------------------------------------------------------------------------
+
+        将已加载切片与请求切片的并集拆分为缺失部分。
+
+        参数
+        ----------
+        held : Dict[str, Any]
+            已加载的切片。
+        req : Dict[str, Any]
+            请求的切片。
+
+        返回
+        -------
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]
+            缺失部分的 where 参数，以及并集切片。
+
+        ---------------------------------------------------------------------------
+        """
+        union = {
+            'start': min(held['start'], req['start']),
+            'end': None if held['end'] is None or req['end'] is None else max(held['end'], req['end']),
+            'codes': None if held['codes'] is None or req['codes'] is None else sorted(set(held['codes']) | set(req['codes']))
+        }
+        parts = []
+        if union['start'] < held['start']:
+            parts.append({'start': union['start'], 'before': held['start'], 'codes': held['codes']})
+        if held['end'] is not None and (union['end'] is None or union['end'] > held['end']):
+            parts.append({'after': held['end'], 'end': union['end'], 'codes': held['codes']})
+        if held['codes'] is not None:
+            if union['codes'] is None:
+                parts.append({'start': union['start'], 'end': union['end'], 'exclude': held['codes']})
+            elif len(union['codes']) > len(held['codes']):
+                codes = sorted(set(union['codes']) - set(held['codes']))
+                parts.append({'start': union['start'], 'end': union['end'], 'codes': codes})
+        return parts, union
+
+    def __read_slice__(
+        self, 
+        keys: List[str], 
+        columns: List[str], 
+        where: Optional[str], 
+        **kwargs: Any
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Reads the index keys and columns of one slice from the database.
+
+        ---------------------------------------------------------------------------
+
+        从数据库读取一个切片的索引键和列。
+
+        ---------------------------------------------------------------------------
+        """
+        try:
+            df = self.__read__(columns=keys + columns, where=where, show_time=True, **kwargs)
+        except:
+            df = self.__read__(columns=keys + columns, show_time=True, **kwargs)
+            print(f"WARNING: UNSTANDARD LOADING ON DATA SOURCE <{self.table}>")
+        if len(keys):
+            df = df.set_index(keys)
+        return df
+
+    def __key_order__(
+        self, 
+        index: pd.Index, 
+        levels: List[pd.Index], 
+        size: int
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Encodes index keys as sortable int64 values over the given level values.
+
+        Keys whose value is not found in `levels` are encoded as -1. Repeated
+        keys are told apart by their order of appearance, `size` being an
+        upper bound of the repeats shared by the encodings to be compared.
+
+        ---------------------------------------------------------------------------
+
+        基于给定层级取值，将索引键编码为可排序的 int64 值。
+
+        层级中不存在的键编码为 -1，重复的键按出现顺序区分，`size` 为待比较的各编码共用的重复次数上限。
+
+        ---------------------------------------------------------------------------
+        """
+        index = index if isinstance(index, pd.MultiIndex) else pd.MultiIndex.from_arrays([index])
+        found = np.ones(len(index), dtype=bool)
+        key = np.zeros(len(index), dtype=np.int64)
+        for i, level in enumerate(levels):
+            x = level.get_indexer(index.get_level_values(i))
+            found &= x >= 0
+            key = key * (len(level) + 1) + x
+        order = np.argsort(key, kind='stable')
+        ranks = np.arange(len(key))
+        starts = np.r_[True, key[order][1:] != key[order][:-1]]
+        ranks = ranks - np.maximum.accumulate(np.where(starts, ranks, 0))
+        occurrence = np.empty(len(key), dtype=np.int64)
+        occurrence[order] = ranks
+        key = key * size + occurrence
+        return np.where(found, key, -1)
+
+    def __align__(
+        self, 
+        df: pd.DataFrame, 
+        index: pd.Index
+    ) -> Dict[str, np.ndarray]:
+        """
+        ===========================================================================
+
+        Aligns the rows of a keyed frame to a target index by sorted key order.
+
+        Both sides are encoded with ``__key_order__`` over the target levels,
+        the target keys are sorted once, and each row is located with a
+        searchsorted. No pandas join is involved, and the result does not depend
+        on the row order returned by the database.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Rows indexed by the same keys as `index`.
+        index : pd.Index
+            The target index.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            The aligned values of each column. Rows of `index` without a match
+            are missing (NaN, NaT or None).
+
+        ---------------------------------------------------------------------------
+
+        按排序后的键顺序将带键数据的行对齐到目标索引。
+
+        两侧均通过 ``__key_order__`` 基于目标层级编码，目标键只排序一次，
+        每一行通过 searchsorted 定位。不使用 pandas 连接，结果不依赖数据库返回的行顺序。
+
+        参数
+        ----------
+        df : pd.DataFrame
+            以与 `index` 相同的键为索引的行。
+        index : pd.Index
+            目标索引。
+
+        返回
+        -------
+        Dict[str, np.ndarray]
+            每一列对齐后的数值，`index` 中无匹配的行为缺失值（NaN、NaT 或 None）。
+
+        ---------------------------------------------------------------------------
+        """
+        levels = list(index.levels) if isinstance(index, pd.MultiIndex) else [index.unique()]
+        size = max(len(index), len(df))
+        target = self.__key_order__(index, levels, size)
+        source = self.__key_order__(df.index, levels, size)
+        order = np.argsort(target, kind='stable')
+        sorted_target = target[order]
+        pos = np.clip(np.searchsorted(sorted_target, source), 0, len(index) - 1)
+        matched = (source >= 0) & (sorted_target[pos] == source)
+        rows, src = order[pos[matched]], np.flatnonzero(matched)
+        complete = len(rows) == len(index)
+
+        dic = {}
+        for i in df.columns:
+            values = df[i].values
+            if complete:
+                x = np.empty(len(index), dtype=values.dtype)
+            elif values.dtype.kind in 'biuf':
+                x = np.full(len(index), np.nan)
+            elif values.dtype.kind in 'mM':
+                x = np.full(len(index), np.datetime64('NaT'), dtype=values.dtype)
+            else:
+                x = np.full(len(index), None, dtype=object)
+            x[rows] = values[src]
+            dic[i] = x
+        return dic
+
     def __read_from_db__(
         self, 
         columns: List[str], 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        codes: Optional[List[str]] = None, 
         **kwargs: Any
     ):
         """
@@ -166,53 +499,693 @@ class data_source(__source__(), COLUMNS_INFO):
 
         Reads data from the SQL database and stores it internally.
 
+        The date range and codes are pushed down into the SQL where clause.
+        The loaded slice is kept in `_internal_slice`, so a later wider request
+        only reads the missing dates or codes.
+        Columns added to a loaded table are read together with the index keys
+        in one projected query and aligned to the loaded rows by key.
+
         Parameters
         ----------
         columns : List[str]
             A list of column names to read from the database.
+        start : Optional[Any], optional
+            The first date to load. Defaults to None (the table start).
+        end : Optional[Any], optional
+            The last date to load. Defaults to None (today).
+        codes : Optional[List[str]], optional
+            The codes to load. Defaults to None (all codes).
         **kwargs : Any
-            Additional keyword arguments for the SQL read operation.
+            Additional keyword arguments for the SQL read operation. A custom
+            'where' replaces the slice.
 
         ---------------------------------------------------------------------------
 
         从SQL数据库读取数据并内部存储。
 
+        日期范围和代码下推至 SQL where 条件。已加载的切片保存在 `_internal_slice`，
+        之后更宽的请求只读取缺失的日期或代码。
+        已加载表新增的列与索引键在同一次投影查询中读取，并按键对齐到已加载的行。
+
         参数
         ----------
         columns : List[str]
             要从数据库读取的列名列表。
+        start : Optional[Any], optional
+            加载的起始日期。默认为 None（表的起始日期）。
+        end : Optional[Any], optional
+            加载的结束日期。默认为 None（今天）。
+        codes : Optional[List[str]], optional
+            加载的代码。默认为 None（全部代码）。
         **kwargs : Any
-            SQL读取操作的附加关键字参数。
+            SQL读取操作的附加关键字参数。自定义 'where' 时替代切片。
 
         ---------------------------------------------------------------------------
         """
-        start = self.trade_start if self.filter_key == self.trade_dt else self.ann_start        
+        keys = [i for i in self.index_keys if i in self.columns]
+        custom = 'where' in kwargs
+        where = kwargs.pop('where', None)
+        req = self.__slice__(start, end, codes)
+        refresh = columns
         if not hasattr(self, '_internal_data'):
-            keys = [i for i in self.index_keys if i in self.columns]
-            try:
-                df = self.__read__(columns=keys + columns, where=kwargs.get('where', f"{self.filter_key} >= '{start}'"), show_time=True, **kwargs)
-            except:
-                df = self.__read__(columns=keys + columns, show_time=True, **kwargs)
-                print(f"WARNING: UNSTANDARD LOADING ON DATA SOURCE <{self.table}>")
-            if len(keys):
-                df = df.set_index(keys)
-            setattr(self, '_internal_data', df)
+            where = where if custom else self.__where__(req['start'], req['end'], req['codes'])
+            self.__keep__('_internal_data', self.__read_slice__(keys, columns, where, **kwargs))
+            setattr(self, '_internal_slice', None if custom else req)
         else:
+            held = getattr(self, '_internal_slice', None)
+            where = where if custom or held is None else self.__where__(held['start'], held['end'], held['codes'])
             columns = [i for i in columns if i not in self._internal_data.columns]
+            refresh = columns
             if len(columns):
-                try:
-                    df = self.__read__(columns=columns, where=kwargs.get('where', f"{self.filter_key} >= '{start}'"))
-                except:
-                    df = self.__read__(columns=columns)
-                    print(f"WARNING: UNSTANDARD LOADING ON DATA SOURCE <{self.table}>")
-                self._internal_data[columns] = df.values
+                df = self.__read_slice__(keys, columns, where, **kwargs)
+                if len(keys):
+                    for i, j in self.__align__(df, self._internal_data.index).items():
+                        self._internal_data[i] = j
+                else:
+                    self._internal_data[columns] = df.values
+            if not custom and held is not None and not self.__covers__(start, end, codes):
+                parts, union = self.__slice_parts__(held, req)
+                old_columns = list(self._internal_data.columns)
+                df = [self.__read_slice__(keys, old_columns, self.__where__(**i), **kwargs) for i in parts]
+                setattr(self, '_internal_data', pd.concat([self._internal_data] + df).sort_index())
+                setattr(self, '_internal_slice', union)
+                refresh = old_columns
+            self.__keep__('_internal_data', self._internal_data)
             
         if self.filter_key == self.trade_dt:
             try:
-                [setattr(self, i, self._internal_data[i].unstack(self.filter_key).T.sort_index())  for i in columns]
+                [self.__keep__(i, self._internal_data[i].unstack(self.filter_key).T.sort_index())  for i in refresh]
             except:
                 pass
 
+    def __is_full_slice__(self) -> bool:
+        """
+        ===========================================================================
+
+        Checks whether the loaded slice is the full default slice of the table.
+
+        ---------------------------------------------------------------------------
+
+        检查已加载切片是否为表的完整默认切片。
+
+        ---------------------------------------------------------------------------
+        """
+        held = getattr(self, '_internal_slice', None)
+        return held is not None and held == self.__slice__()
+
+    def __slice_frame__(
+        self, 
+        df: pd.DataFrame, 
+        start: Optional[Any] = None, 
+        end: Optional[Any] = None, 
+        codes: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Restricts a returned frame to the requested slice.
+
+        ---------------------------------------------------------------------------
+
+        将返回的数据限制在请求的切片内。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.filter_key in df.index.names:
+            dates = df.index.get_level_values(self.filter_key)
+            if start is not None:
+                df = df[dates >= start]
+                dates = df.index.get_level_values(self.filter_key)
+            if end is not None:
+                df = df[dates <= end]
+        if codes is not None:
+            codes = [codes] if isinstance(codes, str) else codes
+            if self.code in df.index.names:
+                df = df[df.index.get_level_values(self.code).isin(codes)]
+            elif self.code in df.columns.names:
+                df = df.loc[:, df.columns.get_level_values(self.code).isin(codes)]
+        return df
+
+    def __keep__(
+        self, 
+        name: str, 
+        obj: Any
+    ):
+        """
+        ===========================================================================
+
+        Stores a loaded table or panel and registers it with the memory manager.
+
+        Panels are stored with int32 security ID columns (see
+        `security_master.keys`); `__get__` decodes them back to codes.
+
+        ---------------------------------------------------------------------------
+
+        保存已加载的表或面板，并在内存管理器中登记。
+
+        面板以 int32 证券 ID 作为列存储（见 `security_master.keys`）；`__get__`
+        将其解码回代码。
+
+        ---------------------------------------------------------------------------
+        """
+        if name != '_internal_data' and self.filter_key == self.trade_dt:
+            obj = self.__astype__(name, self.__encode__(obj))
+        self.__dict__.get('_kept_slices', {}).pop(name, None)
+        setattr(self, name, obj)
+        self.__memory__.register(self, name, obj)
+
+    def __encode__(
+        self, 
+        df: Any
+    ) -> Any:
+        """
+        ===========================================================================
+
+        Replaces the code columns of a panel with security IDs. Panels whose
+        columns are already IDs (e.g. from the panel cache) are returned as
+        they are.
+
+        ---------------------------------------------------------------------------
+
+        将面板的代码列替换为证券 ID。列已为 ID 的面板（例如来自面板缓存）原样返回。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(df, pd.DataFrame) and df.columns.name == self.code and df.columns.dtype.kind not in 'iu':
+            df = self.__security__.encode(df, self.code, register=True)
+        return df
+
+    def __output__(
+        self, 
+        name: str
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Returns a stored panel as served to callers: values decoded by
+        `__decode__` and security IDs decoded back to codes.
+
+        ---------------------------------------------------------------------------
+
+        返回提供给调用方的已存储面板：数值经 `__decode__` 解码，证券 ID 解码回代码。
+
+        ---------------------------------------------------------------------------
+        """
+        df = self.__decode__(name, getattr(self, name))
+        if isinstance(df, pd.DataFrame) and df.columns.name == self.code and df.columns.dtype.kind in 'iu':
+            df = self.__security__.decode(df, self.code)
+        return df
+
+    def __dtype__(
+        self, 
+        name: str
+    ) -> Optional[np.dtype]:
+        """
+        ===========================================================================
+
+        Returns the storage dtype of a panel under the session dtype policy.
+
+        In 'compact' mode, status flags are stored as int8, industry and
+        concept labels as int32 codes and other values as `DTYPE.floats`.
+        In 'float64' mode, panels are stored as loaded.
+
+        ---------------------------------------------------------------------------
+
+        返回会话数据类型策略下面板的存储类型。
+
+        'compact' 模式下，状态标志存储为 int8，行业与概念标签存储为 int32 编码，
+        其他数值存储为 `DTYPE.floats`。'float64' 模式下按加载时的类型存储。
+
+        ---------------------------------------------------------------------------
+        """
+        if DTYPE.mode != 'compact':
+            return None
+        if name in DTYPE.flags:
+            return np.dtype('int8')
+        if name in DTYPE.labels:
+            return np.dtype('int32')
+        return np.dtype(DTYPE.floats)
+
+    def __astype__(
+        self, 
+        name: str, 
+        df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Casts a panel to its storage dtype (see `__dtype__`).
+
+        Missing values of integer panels are stored as `DTYPE.missing`. String
+        labels are encoded against the categories kept for the panel, so codes
+        stay stable when new trade days are appended. A panel whose values do
+        not fit the integer dtype is stored as `DTYPE.floats`. If `DTYPE.check`
+        is True, a warning is printed when the float cast changes a value by
+        more than `DTYPE.tolerance` (relative).
+
+        ---------------------------------------------------------------------------
+
+        将面板转换为其存储类型（见 `__dtype__`）。
+
+        整数面板的缺失值存储为 `DTYPE.missing`。字符串标签按面板保存的类别编码，
+        追加新交易日时编码保持不变。数值超出整数类型范围的面板存储为 `DTYPE.floats`。
+        若 `DTYPE.check` 为 True，当浮点转换引起的相对误差超过 `DTYPE.tolerance` 时打印警告。
+
+        ---------------------------------------------------------------------------
+        """
+        dtype = self.__dtype__(name)
+        if dtype is None or not isinstance(df, pd.DataFrame) or (df.dtypes == dtype).all():
+            return df
+        values = df.values
+        if np.issubdtype(dtype, np.integer) and values.dtype == object:
+            categories = self.__dict__.setdefault('_categories', {}).get(name, np.array([], dtype=object))
+            new = pd.unique(values[pd.notnull(values)])
+            categories = np.concatenate([categories, new[~pd.Index(new).isin(categories)]]).astype(object)
+            self._categories[name] = categories
+            x = pd.Index(categories).get_indexer(values.ravel()).reshape(values.shape)
+            x = np.where(x < 0, DTYPE.missing, x).astype(dtype)
+            return pd.DataFrame(x, index=df.index, columns=df.columns, copy=False)
+        if not np.issubdtype(values.dtype, np.number):
+            return df
+        if np.issubdtype(dtype, np.integer):
+            missing = np.isnan(values) if np.issubdtype(values.dtype, np.floating) else np.zeros(values.shape, dtype=bool)
+            valid = values[~missing]
+            info = np.iinfo(dtype)
+            if not len(valid) or (
+                valid.min() >= info.min and valid.max() <= info.max 
+                and (valid == np.round(valid)).all() and not (valid == DTYPE.missing).any()
+            ):
+                x = np.where(missing, DTYPE.missing, values).astype(dtype)
+                return pd.DataFrame(x, index=df.index, columns=df.columns, copy=False)
+            dtype = np.dtype(DTYPE.floats)
+        if not np.issubdtype(values.dtype, np.floating) or values.dtype.itemsize <= dtype.itemsize:
+            return df
+        x = values.astype(dtype)
+        if DTYPE.check:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                diff = np.abs(x.astype(values.dtype) - values) / np.abs(values)
+            diff = np.nanmax(np.where(np.isfinite(diff), diff, np.nan)) if diff.size and np.isfinite(diff).any() else 0.0
+            if diff > DTYPE.tolerance:
+                print(f"WARNING: RELATIVE ERROR {diff:.3e} AGAINST FLOAT64 ON DATA SOURCE <{self.table}.{name}>")
+        return pd.DataFrame(x, index=df.index, columns=df.columns, copy=False)
+
+    def __decode__(
+        self, 
+        name: str, 
+        df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Returns an integer panel with missing values restored, if `DTYPE.decode`.
+
+        Flags come back as float32 with NaN and string labels as their labels,
+        so callers see the same values as in 'float64' mode, while the stored
+        panel stays compact.
+
+        ---------------------------------------------------------------------------
+
+        若 `DTYPE.decode` 为 True，返回恢复缺失值的整数面板。
+
+        标志以带 NaN 的 float32 返回，字符串标签还原为标签，调用方看到的数值与
+        'float64' 模式一致，而存储的面板保持紧凑。
+
+        ---------------------------------------------------------------------------
+        """
+        if not DTYPE.decode or not isinstance(df, pd.DataFrame) or len(df.dtypes.unique()) != 1 or not np.issubdtype(df.dtypes.iloc[0], np.integer):
+            return df
+        if name not in DTYPE.flags and name not in DTYPE.labels:
+            return df
+        values = df.values
+        missing = values == DTYPE.missing
+        categories = self.__dict__.get('_categories', {}).get(name, None)
+        if categories is not None:
+            x = np.asarray(categories, dtype=object)[np.where(missing, 0, values)] if len(categories) else np.full(values.shape, None, dtype=object)
+            x[missing] = np.nan
+        else:
+            x = values.astype(np.float32)
+            x[missing] = np.nan
+        return pd.DataFrame(x, index=df.index, columns=df.columns, copy=False)
+
+    def __evict__(
+        self, 
+        name: str
+    ):
+        """
+        ===========================================================================
+
+        Drops a loaded table or panel on behalf of the memory manager.
+
+        Dropping `_internal_data` of a partial slice also drops the panels built
+        from it, since a later request could not tell their slice apart.
+        Pinned panels are kept with their slice in `_kept_slices` instead, and
+        are loaded again when a request is not covered by it (see `__load__`).
+
+        ---------------------------------------------------------------------------
+
+        代内存管理器释放已加载的表或面板。
+
+        释放部分切片的 `_internal_data` 时，同时释放由其生成的面板，
+        因为之后的请求无法识别这些面板的切片范围。固定面板则连同其切片保存在
+        `_kept_slices` 中保留，请求超出该切片时重新加载（见 `__load__`）。
+
+        ---------------------------------------------------------------------------
+        """
+        if name == '_internal_data' and hasattr(self, '_internal_data'):
+            if not self.__is_full_slice__():
+                held = getattr(self, '_internal_slice', None)
+                for i in self._internal_data.columns:
+                    if i not in self.__dict__:
+                        continue
+                    if i in self.__memory__.pinned and held is not None:
+                        self.__dict__.setdefault('_kept_slices', {})[i] = held
+                    else:
+                        delattr(self, i)
+                        self.__memory__.forget(self, i)
+            if hasattr(self, '_internal_slice'):
+                delattr(self, '_internal_slice')
+        if name in self.__dict__:
+            delattr(self, name)
+            self.__dict__.get('_kept_slices', {}).pop(name, None)
+
+    def __checksum__(self) -> str:
+        """
+        ===========================================================================
+
+        Returns the SQL expression of the content checksum of the table: the
+        sum of a hash of every row over all loaded columns, so a value
+        corrected in place changes it as well as new or deleted rows.
+
+        ---------------------------------------------------------------------------
+
+        返回表内容校验和的 SQL 表达式：所有加载列上每行哈希值之和，
+        因此原地修正的数值与新增或删除的行都会改变校验和。
+
+        ---------------------------------------------------------------------------
+        """
+        columns = sorted(self.columns)
+        if isinstance(self, __DUCKDB_STATSMETHOD__):
+            return f"CAST(SUM(HASH({', '.join(columns)})) AS VARCHAR)"
+        columns = ', '.join([f"IFNULL({i}, '')" for i in columns])
+        return f"CAST(SUM(CRC32(CONCAT_WS('|', {columns}))) AS CHAR)"
+
+    def __digest__(
+        self, 
+        where: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ===========================================================================
+
+        Returns the row count and the content checksum (see `__checksum__`) of
+        the rows of the table matching `where`.
+
+        Parameters
+        ----------
+        where : Optional[str], optional
+            The SQL where condition. Defaults to None (the whole table).
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            A dict with keys 'count' and 'checksum', or None if the query fails.
+
+        ---------------------------------------------------------------------------
+
+        返回表中满足 `where` 的行的行数与内容校验和（见 `__checksum__`）。
+
+        参数
+        ----------
+        where : Optional[str], optional
+            SQL where 条件。默认为 None（整张表）。
+
+        返回
+        -------
+        Optional[Dict[str, Any]]
+            包含 'count' 与 'checksum' 的字典；查询失败时返回 None。
+
+        ---------------------------------------------------------------------------
+        """
+        try:
+            df = self.__read__(columns=f"COUNT(*) AS COUNTS, {self.__checksum__()} AS CHECKSUM", where=where)
+            return {'count': int(df.iloc[0, 0]), 'checksum': str(df.iloc[0, 1])}
+        except:
+            return None
+
+    def __version__(
+        self, 
+        end: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ===========================================================================
+
+        Returns the ingest version of the table, used as the panel cache key.
+
+        The version is the last trade day, the row count and the content
+        checksum (see `__checksum__`) of the loaded slice, so corrections
+        re-ingested in place invalidate the cached panels. The version of the
+        full slice is queried once per session and kept on the object.
+
+        Parameters
+        ----------
+        end : Optional[str], optional
+            The last trade day of the slice, e.g. of a cached panel to append
+            to. Defaults to None (the full slice).
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            A dict with keys 'end', 'count' and 'checksum', or None if the
+            table is not a trade day table or the query fails.
+
+        ---------------------------------------------------------------------------
+
+        返回表的入库版本，作为面板缓存的键。
+
+        版本由加载区间的最后交易日、行数与内容校验和（见 `__checksum__`）组成，
+        因此原地重新入库的修正会使缓存面板失效。完整区间的版本每个会话只查询一次
+        并保存在对象上。
+
+        参数
+        ----------
+        end : Optional[str], optional
+            区间的最后交易日，例如待追加的缓存面板的最后交易日。默认为 None（完整区间）。
+
+        返回
+        -------
+        Optional[Dict[str, Any]]
+            包含 'end'、'count' 与 'checksum' 的字典；非交易日表或查询失败时返回
+            None。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.filter_key != self.trade_dt:
+            return None
+        if end is None and hasattr(self, '_version'):
+            return self._version
+        where = f"{self.trade_dt} >= '{self.trade_start}'"
+        where = where if end is None else f"{where} AND {self.trade_dt} <= '{end}'"
+        try:
+            df = self.__read__(columns=f"MAX({self.trade_dt}) AS END_DT", where=where)
+            digest = self.__digest__(where)
+            version = None if digest is None else {'end': str(pd.to_datetime(df.iloc[0, 0]))} | digest
+        except:
+            version = None
+        if end is None:
+            setattr(self, '_version', version)
+        return version
+
+    def __cache_meta__(
+        self, 
+        name: str
+    ) -> Dict[str, Any]:
+        """
+        ===========================================================================
+
+        Returns the dtype mode and label categories stored with a cached panel,
+        so a panel is only served to a session of the same dtype mode.
+
+        ---------------------------------------------------------------------------
+
+        返回与缓存面板一起保存的数据类型模式与标签类别，
+        使面板仅提供给相同数据类型模式的会话。
+
+        ---------------------------------------------------------------------------
+        """
+        meta = {'mode': DTYPE.mode}
+        categories = self.__dict__.get('_categories', {}).get(name, None)
+        if categories is not None:
+            meta['categories'] = [str(i) for i in categories]
+        return meta
+
+    def __load_from_cache__(
+        self, 
+        columns: List[str]
+    ) -> List[str]:
+        """
+        ===========================================================================
+
+        Loads panels from the panel cache, appending new trade days if needed.
+
+        A cached panel whose version matches the table is opened as a memory
+        map. A panel that is only behind by new trade days (its days unchanged,
+        by count and checksum) is brought up to date by reading the missing
+        days from the database and appending them.
+
+        Parameters
+        ----------
+        columns : List[str]
+            Column names to load.
+
+        Returns
+        -------
+        List[str]
+            Column names that could not be served by the panel cache.
+
+        ---------------------------------------------------------------------------
+
+        从面板缓存加载面板，必要时追加新的交易日。
+
+        版本与表一致的缓存面板以内存映射方式打开；仅落后若干新交易日（已有日期的
+        行数与校验和不变）的面板，从数据库读取缺失日期后追加更新。
+
+        参数
+        ----------
+        columns : List[str]
+            需要加载的列名。
+
+        返回
+        -------
+        List[str]
+            无法由面板缓存提供的列名。
+
+        ---------------------------------------------------------------------------
+        """
+        version = self.__version__() if self.__panel_cache__ is not None else None
+        if version is None:
+            return columns
+        cache = self.__panel_cache__
+        infos = {i: cache.info(self.schema, self.table, i) for i in columns}
+        appends = {i: j for i, j in infos.items() if j is not None and j['end'] < version['end']}
+        for end in set([i['end'] for i in appends.values()]):
+            keys = [self.trade_dt, self.code]
+            before = self.__version__(end)
+            if before is None:
+                continue
+            cols = [i for i, j in appends.items() if j['end'] == end and j.get('checksum') == before['checksum']]
+            if not cols:
+                continue
+            try:
+                df = self.__read__(columns=keys + cols, where=f"{self.trade_dt} > '{end}'")
+            except:
+                continue
+            df = df.set_index(keys)
+            for i in cols:
+                if infos[i]['count'] + len(df) != version['count']:
+                    continue
+                obj = self.__astype__(i, self.__encode__(df[i].unstack(self.code).sort_index()))
+                if cache.append(self.schema, self.table, i, obj, **(version | self.__cache_meta__(i))):
+                    infos[i] = cache.info(self.schema, self.table, i)
+                    
+        for i, j in infos.items():
+            if (
+                j is not None and j['end'] == version['end'] and j['count'] == version['count'] 
+                and j.get('checksum') == version['checksum'] and j.get('mode', 'float64') == DTYPE.mode
+            ):
+                if 'categories' in j:
+                    self.__dict__.setdefault('_categories', {})[i] = np.array(j['categories'], dtype=object)
+                self.__keep__(i, cache.load(self.schema, self.table, i, self.trade_dt, self.code))
+        return [i for i in columns if i not in self.__dict__]
+
+    def __save_to_cache__(
+        self, 
+        columns: List[str]
+    ):
+        """
+        ===========================================================================
+
+        Writes freshly loaded panels to the panel cache.
+
+        Only panels of the full default slice are written, as a partial
+        slice would be served as the full table later.
+
+        Parameters
+        ----------
+        columns : List[str]
+            Column names whose panels are written.
+
+        ---------------------------------------------------------------------------
+
+        将新加载的面板写入面板缓存。
+
+        仅写入完整默认切片的面板，避免部分切片之后被当作完整表使用。
+
+        参数
+        ----------
+        columns : List[str]
+            需要写入面板的列名。
+
+        ---------------------------------------------------------------------------
+        """
+        version = self.__version__() if self.__panel_cache__ is not None else None
+        if version is None or not self.__is_full_slice__():
+            return
+        for i in columns:
+            if i in self.__dict__:
+                try:
+                    self.__panel_cache__.write(self.schema, self.table, i, getattr(self, i), **(version | self.__cache_meta__(i)))
+                except OSError:
+                    print(f"WARNING: PANEL CACHE NOT WRITTEN ON DATA SOURCE <{self.table}.{i}>")
+
+    def __load__(
+        self, 
+        columns: List[str], 
+        **kwargs: Any
+    ):
+        """
+        ===========================================================================
+
+        Loads columns through the panel cache, then the database.
+
+        Parameters
+        ----------
+        columns : List[str]
+            A list of column names to load.
+        **kwargs : Any
+            Additional keyword arguments for the SQL read operation, including
+            the 'start', 'end' and 'codes' slice. A custom 'where' bypasses the
+            panel cache.
+
+        ---------------------------------------------------------------------------
+
+        依次通过面板缓存和数据库加载列。
+
+        参数
+        ----------
+        columns : List[str]
+            需要加载的列名列表。
+        **kwargs : Any
+            SQL读取操作的附加关键字参数，包括 'start'、'end' 和 'codes' 切片。
+            自定义 'where' 时跳过面板缓存。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.filter_key == self.trade_dt and 'where' not in kwargs:
+            slices = {i: kwargs.get(i, None) for i in ['start', 'end', 'codes']}
+            internal = self._internal_data.columns if hasattr(self, '_internal_data') else []
+            stale = [i for i in columns if i in internal and not self.__covers__(**slices)]
+            kept = self.__dict__.get('_kept_slices', {})
+            stale += [i for i in columns if i in kept and i not in stale and not self.__covers__(**slices, held=kept[i])]
+            missing = [i for i in columns if i not in self.__dict__]
+            rebuild = [i for i in missing if i in internal and i not in stale]
+            [self.__keep__(i, self._internal_data[i].unstack(self.filter_key).T.sort_index()) for i in rebuild]
+            missing = [i for i in missing if i not in rebuild]
+            missing = self.__load_from_cache__(missing) if len(missing) else missing
+            if len(missing) or len(stale):
+                self.__read_from_db__(missing + stale, **kwargs)
+                self.__save_to_cache__(missing)
+        else:
+            self.__read_from_db__(columns, **kwargs)
+
     def __get__(
         self, 
         columns: Union[str, List[str]], 
@@ -254,23 +1227,25 @@ class data_source(__source__(), COLUMNS_INFO):
         ---------------------------------------------------------------------------
         """
         columns = self.__standard_columns__(columns)
-        self.__read_from_db__(columns, **kwargs)
+        self.__load__(columns, **kwargs)
         
         if self.filter_key == self.trade_dt:
             if (len(columns) - 1):
                 try:
-                    df = pd.concat({i: getattr(self, i) for i in columns}, axis=1)
+                    df = pd.concat({i: self.__output__(i) for i in columns}, axis=1)
                     df.columns.names = ['VALUE'] + list(df.columns.names)[1:]
                 except:
                     df = getattr(self, '_internal_data')[columns]
             else:
                 try:
-                    df = getattr(self, columns[0])
+                    df = self.__output__(columns[0])
                 except:
                     df = getattr(self, '_internal_data')[columns]
         else:
             df = getattr(self, '_internal_data')[columns]
         
+        self.__memory__.touch(self, columns + ['_internal_data'])
+        self.__memory__.enforce()
         return df
     
     
@@ -319,7 +1294,8 @@ class data_source(__source__(), COLUMNS_INFO):
             if self.table:
                 self.__read_from_db__([], **kwargs)
         elif how == 'full':
-            self.__read_from_db__([i for i in self.columns if i not in self.index_keys], **kwargs)
+            self.__load__([i for i in self.columns if i not in self.index_keys], **kwargs)
+            self.__memory__.enforce()
         elif how == 'min' :
             pass
         else:
@@ -351,6 +1327,46 @@ class data_source(__source__(), COLUMNS_INFO):
         ---------------------------------------------------------------------------
         """
         return self.__data_init__(how)
+
+    def prefetch(
+        self, 
+        columns: Union[str, List[str]], 
+        **kwargs: Any
+    ):
+        """
+        ===========================================================================
+
+        Loads several columns of the table in one query.
+
+        Columns not yet loaded are read together, with the index keys, in a
+        single projected scan instead of one scan per column.
+
+        Parameters
+        ----------
+        columns : Union[str, List[str]]
+            A single column name or a list of column names to load.
+        **kwargs : Any
+            Additional keyword arguments for data loading, e.g. the 'start',
+            'end' and 'codes' slice.
+
+        ---------------------------------------------------------------------------
+
+        在一次查询中加载表的多个列。
+
+        尚未加载的列与索引键在同一次投影扫描中读取，而非每列扫描一次。
+
+        参数
+        ----------
+        columns : Union[str, List[str]]
+            需要加载的单个列名或列名列表。
+        **kwargs : Any
+            数据加载的附加关键字参数，例如 'start'、'end' 和 'codes' 切片。
+
+        ---------------------------------------------------------------------------
+        """
+        columns = [i for i in self.__standard_columns__(columns) if i not in self.index_keys]
+        self.__load__(columns, **kwargs)
+        self.__memory__.enforce()
         
             
     def __call__(
@@ -360,6 +1376,8 @@ class data_source(__source__(), COLUMNS_INFO):
         quarter_adj: bool = False, 
         quarter_diff: int = 1, 
         shift: int = 0, 
+        start: Optional[Any] = None, 
+        codes: Optional[List[str]] = None, 
         **kwargs: Any
     ) -> pd.DataFrame:
         """
@@ -367,6 +1385,9 @@ class data_source(__source__(), COLUMNS_INFO):
 
         Retrieves and processes data for specified columns, with optional adjustments.
 
+        The date range and codes are pushed down into the database query and
+        the result is restricted to them.
+
         Parameters
         ----------
         columns : Union[str, List[str]]
@@ -379,6 +1400,10 @@ class data_source(__source__(), COLUMNS_INFO):
             Quarter difference for adjustment. Defaults to 1.
         shift : int, optional
             Shift for data. Defaults to 0.
+        start : Optional[Any], optional
+            The start date for data retrieval. Defaults to None.
+        codes : Optional[List[str]], optional
+            The codes for data retrieval. Defaults to None (all codes).
         **kwargs : Any
             Additional keyword arguments for data retrieval.
 
@@ -391,6 +1416,8 @@ class data_source(__source__(), COLUMNS_INFO):
 
         检索和处理指定列的数据，并进行可选调整。
 
+        日期范围和代码下推至数据库查询，并据此限制返回结果。
+
         参数
         ----------
         columns : Union[str, List[str]]
@@ -403,6 +1430,10 @@ class data_source(__source__(), COLUMNS_INFO):
             季度调整的季度差异。默认为 1。
         shift : int, optional
             数据偏移。默认为 0。
+        start : Optional[Any], optional
+            数据检索的起始日期。默认为 None。
+        codes : Optional[List[str]], optional
+            数据检索的代码。默认为 None（全部代码）。
         **kwargs : Any
             数据检索的附加关键字参数。
 
@@ -413,9 +1444,8 @@ class data_source(__source__(), COLUMNS_INFO):
 
         ---------------------------------------------------------------------------
         """
-        df = self.__get__(columns, **kwargs)
-        if end is not None:
-            df = df[df.index.get_level_values(self.filter_key) <= end]
+        df = self.__get__(columns, start=start, end=end, codes=codes, **kwargs)
+        df = self.__slice_frame__(df, start, end, codes)
         if self.ann_dt in df.index.names:
             df.index = df.index.droplevel(self.ann_dt)
             df = df.iloc[:, 0] if df.shape[1] == 1 else df
@@ -537,7 +1567,8 @@ class data_source(__source__(), COLUMNS_INFO):
         self, 
         column: str, 
         periods: int, 
-        trade_dt: pd.DatetimeIndex
+        trade_dt: pd.DatetimeIndex,
+        lags: Optional[int] = None
     ) -> pd.DataFrame:
         """
         ===========================================================================
@@ -552,11 +1583,15 @@ class data_source(__source__(), COLUMNS_INFO):
             The number of historical periods to retrieve.
         trade_dt : pd.DatetimeIndex
             A DatetimeIndex representing valid trading days.
+        lags : Optional[int], optional
+            The number of quarters returned per date, at least `periods`. Extra
+            quarters feed the quarter adjustment. Defaults to None (`periods`).
 
         Returns
         -------
         pd.DataFrame
-            A DataFrame containing the processed historical financial data.
+            A DataFrame containing the processed historical financial data,
+            with exactly `lags` report periods per date.
 
         ---------------------------------------------------------------------------
 
@@ -570,33 +1605,31 @@ class data_source(__source__(), COLUMNS_INFO):
             要检索的历史周期数。
         trade_dt : pd.DatetimeIndex
             表示有效交易日的DatetimeIndex。
+        lags : Optional[int], optional
+            每个日期返回的季度数，不少于 `periods`，多出的季度用于季度调整。
+            默认为 None（即 `periods`）。
 
         返回
         -------
         pd.DataFrame
-            包含处理后的历史财务数据的DataFrame。
+            包含处理后的历史财务数据的DataFrame，每个日期恰好包含 `lags` 个报告期。
 
         ---------------------------------------------------------------------------
         """
         df = self.__get__(column).iloc[:, 0]
-        trade_dt = pd.Index(trade_dt, name=self.ann_dt)
-        nature_dt = pd.date_range(trade_dt.min(), trade_dt.max())
-        total_report_periods = pd.date_range(pd.Timestamp('2000-01-01'), pd.Timestamp.today(), freq='Q')
-        
-        df = df.unstack(self.ann_dt).T
+        dates = pd.DatetimeIndex(trade_dt)
+        dates = dates[dates >= pd.to_datetime(self.ann_start)]
         limit = pd.date_range('2000-12-31', periods=periods + 1, freq='q')
         limit = int((limit.max() - limit.min()).days)
-        df = df.reindex(nature_dt).ffill(limit = limit).reindex(trade_dt)
-        df = df.loc[self.ann_start:].stack(self.report_period)
-        df = df[df.index.get_level_values(self.ann_dt) > df.index.get_level_values(self.report_period)]
-        def fun(df: pd.DataFrame) -> pd.DataFrame:
-            date = df.index.get_level_values(self.ann_dt)[0]
-            needed = total_report_periods[total_report_periods <= date][-1 * (periods):]
-            df.index = df.index.get_level_values(self.report_period)
-            if not needed.isin(df.index).all():
-                df = df.reindex(needed)
-            return df
-        df = df.groupby(self.ann_dt).apply(lambda x: fun(x))
+        lags = periods if lags is None else max(lags, periods)
+
+        x = finance.events(df, self.ann_dt, self.report_period, self.code, how='last')
+        cube, quarters, codes = finance.as_of_cube(x, dates, lags, self.ann_dt, self.report_period, self.code, limit=limit)
+        index = pd.MultiIndex.from_arrays(
+            [dates.repeat(lags), finance.quarter_end(quarters)],
+            names=[self.ann_dt, self.report_period]
+        )
+        df = pd.DataFrame(cube.reshape(-1, cube.shape[-1]), index=index, columns=codes)
         return df
 
     def __finance_history_adj__(
@@ -659,35 +1692,16 @@ class data_source(__source__(), COLUMNS_INFO):
 
         ---------------------------------------------------------------------------
         """
+        dates = df.index.get_level_values(self.ann_dt).unique()
+        lags = df.shape[0] // len(dates)
+        cube = df.values.reshape(len(dates), lags, df.shape[1])
         if quarter_adj:
-            tmp = df[(df.index.get_level_values(self.report_period).month == quarter_adj)]
-            df = df.groupby(self.ann_dt).diff(quarter_diff)
-            df.loc[tmp.index] = tmp
-        
-        def period(df: pd.DataFrame) -> pd.DataFrame:
-            df.index = range(-df.shape[0], 0)
-            df.index.name = self.report_period
-            return df
-        df = df.groupby(self.ann_dt).apply(lambda x: period(x))    
-        df = df.unstack(self.ann_dt).dropna(how='all', axis=1).T
-        
-        bools = df.iloc[:, -1].isnull()
-        while shift and bools.any():
-            shift -= 1
-            df.loc[bools] =  df.loc[bools].shift(axis=1)
-            bools = df.iloc[:, -1].isnull()
-        df = df.iloc[:, -periods:]
-        
-        if min_periods is not None:
-            df = df[df.notnull().sum(axis=1) >= min_periods]
-        df.index.names = [self.code, self.trade_dt]
-        if df.shape[1] == 1:
-            df = df.iloc[:, 0].unstack(self.code)
-        else:
-            df = df.unstack(self.trade_dt).T
-            df.index = df.index.reorder_levels([self.trade_dt, self.report_period])
-        
-        df = df.sort_index().sort_index(axis=1)
+            months = df.index.get_level_values(self.report_period).month.values.reshape(len(dates), lags, 1)
+            diff = np.full_like(cube, np.nan)
+            diff[:, quarter_diff:] = cube[:, quarter_diff:] - cube[:, :-quarter_diff]
+            cube = np.where(months == quarter_adj, cube, diff)
+        cube = finance.cube_window(cube, shift, periods, min_periods)
+        df = finance.cube_frame(cube, dates, df.columns, self.trade_dt, self.report_period, dropna=True)
         return df
 
     def __finance__(
@@ -705,6 +1719,10 @@ class data_source(__source__(), COLUMNS_INFO):
 
         Processes financial data, handling quarter adjustments, shifting, and period filtering.
 
+        The point-in-time values of all trade days are looked up at once from
+        the announcements sorted by (code, report period, announcement date),
+        the first announced value of each report period being kept.
+
         Parameters
         ----------
         df : pd.Series
@@ -731,6 +1749,9 @@ class data_source(__source__(), COLUMNS_INFO):
 
         处理财务数据，处理季度调整、移动和周期过滤。
 
+        所有交易日的时点数据由按 (代码, 报告期, 公告日) 排序的公告一次性查找得到，
+        每个报告期保留首次公告的数值。
+
         参数
         ----------
         df : pd.Series
@@ -755,59 +1776,13 @@ class data_source(__source__(), COLUMNS_INFO):
 
         ---------------------------------------------------------------------------
         """
-        total_report_periods = pd.date_range(pd.Timestamp('2000-01-01'), pd.Timestamp.today(), freq='Q')
-        total_nature_days = pd.date_range(self.trade_start, pd.Timestamp.today(), freq='d')
+        dates = pd.DatetimeIndex(trade_days)
+        dates = dates[(dates >= pd.to_datetime(self.trade_start)) & (dates <= pd.Timestamp.today())]
 
-        def report_periods_check(check_df: pd.DataFrame, date: pd.Timestamp) -> Tuple[pd.DataFrame, pd.DataFrame]:
-            needed = total_report_periods[total_report_periods <= date][-1 * (shift+periods):]
-            if not needed.isin(check_df.index).all():
-                check_df = check_df.reindex(needed)
-            obj = check_df.copy(deep=False)
-            obj.index = range(-1*obj.shape[0], 0)
-            return check_df, obj
-        
-            
-        df = df.sort_index()
-        
+        x = finance.events(df, self.ann_dt, self.report_period, self.code, how='first')
         if quarter_adj:
-            tmp = df[(df.index.get_level_values(self.report_period).month == quarter_adj)]
-            df = pd.merge(df.reset_index(), df.reset_index(self.ann_dt)[df.name].unstack().diff().unstack().to_frame(0), on=[self.report_period, self.code], how='left').set_index([self.ann_dt, self.report_period, self.code])[0]
-            df.loc[tmp.index] = tmp
-        
-        meta_df, unmerged = df.loc[:self.trade_start], df.loc[self.trade_start:].unstack(self.code)
-        meta_df.index = meta_df.index.droplevel(self.ann_dt)
-        meta_df = meta_df.unstack(self.code).reindex(df.index.get_level_values(self.code).unique(), axis=1).sort_index(axis=1)
-        meta_df, check_df = report_periods_check(meta_df, self.trade_start)
-
-        dic = {}
-        dic[pd.to_datetime(self.trade_start)] = check_df
-        for i in total_nature_days:
-            if i not in unmerged.index:
-                meta_df, dic[i] = report_periods_check(meta_df, i)
-            else:
-                merger = unmerged.loc[i]
-                unmerged = unmerged.iloc[merger.shape[0]:]
-                if not merger.index.isin(meta_df.index).all():
-                    meta_df = meta_df.reindex(meta_df.index.union(merger.index).sort_values())
-                meta_df = meta_df.fillna(merger)
-                meta_df, dic[i] = report_periods_check(meta_df, i)
-        dic = {i: j for i,j in dic.items() if i in trade_days}
-        dic = pd.concat(dic, axis=1).T
-        dic.index.names = [self.trade_dt, self.code]
-        dic.columns.names = [self.report_period]
-        bools = dic.iloc[:, -1].isnull()
-        while shift and bools.any():
-            shift -= 1
-            dic.loc[bools] =  dic.loc[bools].shift(axis=1)
-            bools = dic.iloc[:, -1].isnull()
-        dic = dic.iloc[:, -periods:]
-        
-        if min_periods is not None:
-            dic = dic[dic.notnull().sum(axis=1) >= min_periods]
-        if dic.shape[1] == 1:
-            dic = dic.iloc[:, 0].unstack(self.code)
-        else:
-            dic = dic.unstack(self.trade_dt).T
-            dic.index = dic.index.reorder_levels([self.trade_dt, self.report_period])
-        dic = dic.sort_index().sort_index(axis=1)
-        return dic
+            x = finance.quarter_adjust(x, self.report_period, self.code, quarter_adj, quarter_diff)
+        cube, _, codes = finance.as_of_cube(x, dates, shift + periods, self.ann_dt, self.report_period, self.code)
+        cube = finance.cube_window(cube, shift, periods, min_periods)
+        df = finance.cube_frame(cube, dates, codes, self.trade_dt, self.report_period, dropna=min_periods is not None)
+        return df
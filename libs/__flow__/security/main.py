@@ -0,0 +1,806 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:05:27 2026
+
+@author: Porco Rosso
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class main():
+    """
+    ===========================================================================
+
+    Security master with stable int32 security IDs.
+
+    Every code seen in the listing and status tables gets an ID, the position
+    of the code in an append-only code file, so IDs never change between
+    sessions. The code formats (6-digit number, '.XSHG'/'.XSHE'/'.BJSE',
+    '.SH'/'.SZ'/'.BJ', broker 'SH600000'), names, listing and delisting dates
+    and boards are computed once, and any code conversion is an array lookup
+    by ID. Data source panels are stored with ID columns (see `keys`) and
+    decoded to codes only when returned.
+
+    Directory layout:
+        {path}/codes.npy
+
+    ---------------------------------------------------------------------------
+
+    具有稳定 int32 证券 ID 的证券主表。
+
+    上市表与状态表中出现的每个代码都分配一个 ID，即该代码在只追加代码文件中的位置，
+    因此 ID 在各会话间保持不变。代码格式（6位数字、'.XSHG'/'.XSHE'/'.BJSE'、
+    '.SH'/'.SZ'/'.BJ'、券商格式 'SH600000'）、名称、上市与退市日期以及板块只计算一次，
+    任何代码转换均为按 ID 的数组查找。数据源面板以 ID 作为列存储（见 `keys`），
+    仅在返回时解码为代码。
+
+    ---------------------------------------------------------------------------
+    """
+    codes_file: str = 'codes.npy'
+    formats: List[str] = ['CODE', 'NUMBER', 'JQ', 'WIND', 'BROKER']
+    exchanges: dict = {
+        'SH': {'JQ': '.XSHG', 'WIND': '.SH', 'BROKER': 'SH', 'PATTERN': r'XSHG|\.SH$|^SH'},
+        'SZ': {'JQ': '.XSHE', 'WIND': '.SZ', 'BROKER': 'SZ', 'PATTERN': r'XSHE|\.SZ$|^SZ'},
+        'BJ': {'JQ': '.BJSE', 'WIND': '.BJ', 'BROKER': 'BJ', 'PATTERN': r'BJSE|\.BJ$|^BJ'},
+    }
+
+    def __init__(
+        self,
+        listing: Optional[pd.DataFrame] = None,
+        codes: Optional[List[str]] = None,
+        path: Optional[str] = None
+    ):
+        """
+        ===========================================================================
+
+        Builds the security master.
+
+        Parameters
+        ----------
+        listing : Optional[pd.DataFrame], optional
+            The listing table indexed by code, with name, listing date and
+            delisting date as its first three columns. None starts from the
+            persisted codes only (see `update`). Defaults to None.
+        codes : Optional[List[str]], optional
+            Extra codes (e.g. from the status table). Defaults to None.
+        path : Optional[str], optional
+            Directory of the persisted code file. None keeps the IDs in
+            memory only. Defaults to None.
+
+        ---------------------------------------------------------------------------
+
+        构建证券主表。
+
+        参数
+        ----------
+        listing : Optional[pd.DataFrame], optional
+            以代码为索引的上市表，前三列依次为名称、上市日期和退市日期。None 表示
+            仅从已持久化的代码开始（见 `update`）。默认为 None。
+        codes : Optional[List[str]], optional
+            额外的代码（例如来自状态表）。默认为 None。
+        path : Optional[str], optional
+            持久化代码文件所在目录，None 表示 ID 仅保存在内存中。默认为 None。
+
+        ---------------------------------------------------------------------------
+        """
+        self.path = None if path is None else Path(path)
+        self._lock = threading.RLock()
+        self._listing = pd.DataFrame(columns=['NAME', 'LIST_DATE', 'DELIST_DATE'], index=pd.Index([], dtype=object))
+        self.update(listing, codes)
+
+    def update(
+        self,
+        listing: Optional[pd.DataFrame] = None,
+        codes: Optional[List[str]] = None
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Adds a listing table and/or codes to the master.
+
+        Unseen codes get the next IDs, in sorted order, and are appended to the
+        code file; the IDs of known codes never change.
+
+        Parameters
+        ----------
+        listing : Optional[pd.DataFrame], optional
+            The listing table (see `__init__`), replacing the previous one.
+            Defaults to None.
+        codes : Optional[List[str]], optional
+            Extra codes. Defaults to None.
+
+        Returns
+        -------
+        main
+            The master itself.
+
+        ---------------------------------------------------------------------------
+
+        向主表添加上市表和/或代码。
+
+        未出现过的代码按排序依次分配新 ID 并追加到代码文件；已有代码的 ID 不变。
+
+        参数
+        ----------
+        listing : Optional[pd.DataFrame], optional
+            上市表（见 `__init__`），替换原有上市表。默认为 None。
+        codes : Optional[List[str]], optional
+            额外的代码。默认为 None。
+
+        返回
+        -------
+        main
+            主表本身。
+
+        ---------------------------------------------------------------------------
+        """
+        with self._lock:
+            if listing is not None:
+                listing = listing[~listing.index.duplicated()]
+                self._listing = listing.set_axis(pd.Index(listing.index.astype(str), name=listing.index.name))
+            seen = pd.Index([str(i) for i in ([] if codes is None else codes)], dtype=object)
+            seen = seen.union(self._listing.index) if listing is not None else seen.unique()
+            known = self.table['CODE'].values.astype(str) if hasattr(self, 'table') else self.__read_codes__()
+            new = seen[~seen.isin(known)].sort_values()
+            if hasattr(self, 'table') and not len(new) and listing is None:
+                return self
+            all_codes = np.concatenate([known, np.asarray(new, dtype=str)]) if len(new) else known
+            if len(new):
+                self.__write_codes__(all_codes)
+            self.__build__(all_codes)
+        return self
+
+    def __build__(
+        self,
+        all_codes: np.ndarray
+    ):
+        """
+        ===========================================================================
+
+        Computes the formats, names, dates and boards of the codes in ID order.
+
+        ---------------------------------------------------------------------------
+
+        按 ID 顺序计算各代码的格式、名称、日期与板块。
+
+        ---------------------------------------------------------------------------
+        """
+        number = self.number(all_codes)
+        exchange = self.exchange(number, all_codes)
+        df = pd.DataFrame({'CODE': all_codes, 'NUMBER': number}, index=pd.RangeIndex(len(all_codes), name='ID'))
+        for i in self.formats[2:]:
+            df[i] = self.format(number, exchange, i)
+        listing = self._listing.reindex(all_codes)
+        df['NAME'] = listing.iloc[:, 0].values
+        df['LIST_DATE'] = pd.to_datetime(listing.iloc[:, 1]).values
+        df['DELIST_DATE'] = pd.to_datetime(listing.iloc[:, 2]).values
+        df['BOARD'] = self.board(number, exchange)
+        self.table = df
+        self._code = pd.Index(df['CODE'].values)
+        self._number = pd.Series(df.index.values, index=df['NUMBER'].values).groupby(level=0).first()
+
+    def __read_codes__(self) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the persisted codes in ID order.
+
+        ---------------------------------------------------------------------------
+
+        按 ID 顺序返回已持久化的代码。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.path is None or not (self.path / self.codes_file).exists():
+            return np.array([], dtype=str)
+        try:
+            return np.load(self.path / self.codes_file)
+        except (OSError, ValueError):
+            return np.array([], dtype=str)
+
+    def __write_codes__(
+        self,
+        codes: np.ndarray
+    ):
+        """
+        ===========================================================================
+
+        Writes the codes in ID order atomically.
+
+        ---------------------------------------------------------------------------
+
+        原子化写入按 ID 排序的代码。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.path is None:
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp = self.path / ('tmp_' + self.codes_file)
+            np.save(tmp, np.asarray(codes, dtype=str))
+            os.replace(tmp, self.path / self.codes_file)
+        except OSError:
+            print(f"WARNING: SECURITY MASTER NOT WRITTEN ON <{self.path}>")
+
+    @staticmethod
+    def number(codes: Any) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the 6-digit numbers of codes of any format.
+
+        The digits are extracted once per distinct code and broadcast back.
+
+        ---------------------------------------------------------------------------
+
+        返回任意格式代码的6位数字。
+
+        每个不同代码只提取一次数字，再广播回原位置。
+
+        ---------------------------------------------------------------------------
+        """
+        values, uniques = pd.factorize(pd.Index(np.asarray(codes, dtype=object)).astype(str))
+        uniques = pd.Index(uniques).str.replace(r'\D', '', regex=True).str.zfill(6)
+        return np.asarray(uniques, dtype=str)[values] if len(values) else np.array([], dtype=str)
+
+    @staticmethod
+    def exchange(
+        number: np.ndarray,
+        codes: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the exchange ('SH', 'SZ' or 'BJ') of 6-digit numbers.
+
+        The suffix of the code decides when present, the leading digits
+        otherwise.
+
+        ---------------------------------------------------------------------------
+
+        返回6位数字代码所属交易所（'SH'、'SZ' 或 'BJ'）。
+
+        代码带后缀时以后缀为准，否则按首位数字判断。
+
+        ---------------------------------------------------------------------------
+        """
+        number = pd.Index(np.asarray(number, dtype=str))
+        x = np.where(number.str[:1].isin(['5', '6', '9']), 'SH', np.where(number.str[:1].isin(['4', '8']), 'BJ', 'SZ'))
+        x = np.where(number.str[:2] == '92', 'BJ', x)
+        if codes is not None:
+            suffix = pd.Index(np.asarray(codes, dtype=str)).str.upper()
+            for i, j in main.exchanges.items():
+                x = np.where(suffix.str.contains(j['PATTERN'], regex=True), i, x)
+        return x
+
+    @staticmethod
+    def format(
+        number: np.ndarray,
+        exchange: np.ndarray,
+        how: str
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns codes in the 'JQ', 'WIND' or 'BROKER' format from 6-digit
+        numbers and exchanges.
+
+        ---------------------------------------------------------------------------
+
+        由6位数字与交易所生成 'JQ'、'WIND' 或 'BROKER' 格式的代码。
+
+        ---------------------------------------------------------------------------
+        """
+        number = np.asarray(number, dtype=str)
+        if not len(number):
+            return np.array([], dtype=str)
+        suffix = pd.Series(exchange).map({i: j[how] for i, j in main.exchanges.items()}).fillna('').values.astype(str)
+        return np.char.add(suffix, number) if how == 'BROKER' else np.char.add(number, suffix)
+
+    @staticmethod
+    def board(
+        number: np.ndarray,
+        exchange: np.ndarray
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the board ('MAIN', 'STAR', 'CHINEXT' or 'BSE') of securities.
+
+        ---------------------------------------------------------------------------
+
+        返回证券所属板块（'MAIN'、'STAR'、'CHINEXT' 或 'BSE'）。
+
+        ---------------------------------------------------------------------------
+        """
+        prefix = pd.Index(np.asarray(number, dtype=str)).str[:3]
+        x = np.where(prefix.isin(['688', '689']), 'STAR', 'MAIN')
+        x = np.where(prefix.isin(['300', '301']), 'CHINEXT', x)
+        x = np.where(np.asarray(exchange) == 'BJ', 'BSE', x)
+        return x
+
+    def ids(
+        self,
+        codes: Any
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the security IDs of codes of any format.
+
+        Parameters
+        ----------
+        codes : Any
+            Codes in the stored format or any other format.
+
+        Returns
+        -------
+        np.ndarray
+            int32 IDs, -1 for unknown codes.
+
+        ---------------------------------------------------------------------------
+
+        返回任意格式代码的证券 ID。
+
+        参数
+        ----------
+        codes : Any
+            存储格式或其他任意格式的代码。
+
+        返回
+        -------
+        np.ndarray
+            int32 ID，未知代码为 -1。
+
+        ---------------------------------------------------------------------------
+        """
+        codes = np.asarray(codes, dtype=object)
+        x = self._code.get_indexer(codes)
+        miss = x < 0
+        if miss.any():
+            x[miss] = self._number.reindex(self.number(codes[miss])).fillna(-1).values
+        return x.astype(np.int32)
+
+    def keys(
+        self,
+        codes: Any
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the security IDs of codes in the stored format, registering
+        unseen codes.
+
+        Unlike `ids`, codes are matched exactly, so e.g. an index and a stock
+        with the same digits keep distinct IDs. This is the key of the data
+        source panels.
+
+        Parameters
+        ----------
+        codes : Any
+            Codes in the stored format.
+
+        Returns
+        -------
+        np.ndarray
+            int32 IDs.
+
+        ---------------------------------------------------------------------------
+
+        返回存储格式代码的证券 ID，并登记未出现过的代码。
+
+        与 `ids` 不同，代码按原样精确匹配，例如数字相同的指数与股票保持不同的 ID。
+        这是数据源面板的键。
+
+        参数
+        ----------
+        codes : Any
+            存储格式的代码。
+
+        返回
+        -------
+        np.ndarray
+            int32 ID。
+
+        ---------------------------------------------------------------------------
+        """
+        codes = pd.Index(np.asarray(codes, dtype=object)).astype(str)
+        x = self._code.get_indexer(codes)
+        if (x < 0).any():
+            with self._lock:
+                self.update(codes=codes[self._code.get_indexer(codes) < 0])
+                x = self._code.get_indexer(codes)
+        return x.astype(np.int32)
+
+    def codes(
+        self,
+        ids: Any,
+        how: str = 'CODE'
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the codes of security IDs in a given format.
+
+        Parameters
+        ----------
+        ids : Any
+            Security IDs.
+        how : str, optional
+            One of 'CODE' (stored format), 'NUMBER', 'JQ', 'WIND' or 'BROKER'.
+            Defaults to 'CODE'.
+
+        Returns
+        -------
+        np.ndarray
+            The codes, None for unknown IDs.
+
+        ---------------------------------------------------------------------------
+
+        返回证券 ID 指定格式的代码。
+
+        参数
+        ----------
+        ids : Any
+            证券 ID。
+        how : str, optional
+            'CODE'（存储格式）、'NUMBER'、'JQ'、'WIND' 或 'BROKER' 之一。默认为 'CODE'。
+
+        返回
+        -------
+        np.ndarray
+            代码，未知 ID 为 None。
+
+        ---------------------------------------------------------------------------
+        """
+        how = how.upper()
+        if how not in self.formats:
+            raise ValueError(f"Invalid value '{how}' for parameter 'how'. Valid values are: {', '.join(self.formats)}")
+        ids = np.asarray(ids, dtype=np.int64)
+        values = self.table[how].values.astype(object)
+        x = values[np.clip(ids, 0, max(len(values) - 1, 0))] if len(values) else np.full(ids.shape, None, dtype=object)
+        x[(ids < 0) | (ids >= len(values))] = None
+        return x
+
+    def convert(
+        self,
+        codes: Any,
+        how: str = 'NUMBER'
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Converts codes of any format to a given format.
+
+        Unknown codes are converted by rule from their digits, so the result
+        never depends on an external service.
+
+        Parameters
+        ----------
+        codes : Any
+            Codes of any format.
+        how : str, optional
+            One of 'CODE', 'NUMBER', 'JQ', 'WIND' or 'BROKER'. Defaults to 'NUMBER'.
+
+        Returns
+        -------
+        np.ndarray
+            The converted codes.
+
+        ---------------------------------------------------------------------------
+
+        将任意格式的代码转换为指定格式。
+
+        未知代码按其数字规则转换，结果不依赖外部服务。
+
+        参数
+        ----------
+        codes : Any
+            任意格式的代码。
+        how : str, optional
+            'CODE'、'NUMBER'、'JQ'、'WIND' 或 'BROKER' 之一。默认为 'NUMBER'。
+
+        返回
+        -------
+        np.ndarray
+            转换后的代码。
+
+        ---------------------------------------------------------------------------
+        """
+        how = how.upper()
+        codes = np.asarray(codes, dtype=object)
+        x = self.codes(self.ids(codes), how)
+        miss = pd.isnull(x)
+        if miss.any():
+            x[miss] = self.rule(codes[miss], how)
+        return x
+
+    @staticmethod
+    def rule(
+        codes: Any,
+        how: str = 'NUMBER'
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Converts codes of any format to a given format by rule alone.
+
+        The 6-digit number is extracted with a regular expression and the
+        exchange taken from the suffix or the leading digits (see `exchange`).
+        No master, database or external service is involved; 'CODE' gives
+        the 'JQ' format.
+
+        Parameters
+        ----------
+        codes : Any
+            Codes of any format.
+        how : str, optional
+            One of 'CODE', 'NUMBER', 'JQ', 'WIND' or 'BROKER'. Defaults to 'NUMBER'.
+
+        Returns
+        -------
+        np.ndarray
+            The converted codes.
+
+        ---------------------------------------------------------------------------
+
+        仅按规则将任意格式的代码转换为指定格式。
+
+        以正则表达式提取6位数字，交易所取自后缀或首位数字（见 `exchange`）。不依赖
+        主表、数据库或外部服务；'CODE' 返回 'JQ' 格式。
+
+        参数
+        ----------
+        codes : Any
+            任意格式的代码。
+        how : str, optional
+            'CODE'、'NUMBER'、'JQ'、'WIND' 或 'BROKER' 之一。默认为 'NUMBER'。
+
+        返回
+        -------
+        np.ndarray
+            转换后的代码。
+
+        ---------------------------------------------------------------------------
+        """
+        how = how.upper()
+        if how not in main.formats:
+            raise ValueError(f"Invalid value '{how}' for parameter 'how'. Valid values are: {', '.join(main.formats)}")
+        codes = np.asarray(codes, dtype=object)
+        number = main.number(codes)
+        if how == 'NUMBER':
+            return number
+        return main.format(number, main.exchange(number, codes.astype(str)), 'JQ' if how == 'CODE' else how)
+
+    @staticmethod
+    def standard(
+        obj: Union[pd.DataFrame, pd.Series, list],
+        how: Optional[str] = None,
+        code: Optional[str] = None
+    ) -> Union[pd.DataFrame, pd.Series, list]:
+        """
+        ===========================================================================
+
+        Standardizes the code axis of a pandas object, or a list of codes.
+
+        Codes are converted by `rule` only, without building the master.
+
+        Parameters
+        ----------
+        obj : Union[pd.DataFrame, pd.Series, list]
+            The object to be standardized.
+        how : Optional[str], optional
+            None for the 6-digit number, 'jq', 'wind' or 'broker'. Defaults to None.
+        code : Optional[str], optional
+            Name of the code axis. Defaults to None.
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series, list]
+            The standardized object.
+
+        ---------------------------------------------------------------------------
+
+        标准化 pandas 对象的代码轴或代码列表。
+
+        代码仅按 `rule` 转换，无需构建主表。
+
+        参数
+        ----------
+        obj : Union[pd.DataFrame, pd.Series, list]
+            需要标准化的对象。
+        how : Optional[str], optional
+            None 表示6位数字，或 'jq'、'wind'、'broker'。默认为 None。
+        code : Optional[str], optional
+            代码轴名称。默认为 None。
+
+        返回
+        -------
+        Union[pd.DataFrame, pd.Series, list]
+            标准化后的对象。
+
+        ---------------------------------------------------------------------------
+        """
+        how = 'NUMBER' if how is None else how.upper()
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            if code == obj.index.name:
+                obj.index = pd.Index(main.rule(obj.index, how), name=obj.index.name)
+            elif isinstance(obj, pd.DataFrame) and code == obj.columns.name:
+                obj.columns = pd.Index(main.rule(obj.columns, how), name=obj.columns.name)
+            return obj
+        return main.rule(list(obj), how).tolist()
+
+    def encode(
+        self,
+        df: Union[pd.DataFrame, pd.Series],
+        code: str,
+        register: bool = False
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        ===========================================================================
+
+        Replaces the code axis (or index level) of a pandas object with IDs.
+
+        Parameters
+        ----------
+        df : Union[pd.DataFrame, pd.Series]
+            The object to be encoded.
+        code : str
+            Name of the code axis.
+        register : bool, optional
+            If True, codes are in the stored format and matched exactly,
+            unseen codes being registered (see `keys`); otherwise codes of any
+            format are looked up with `ids`. Defaults to False.
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series]
+            The encoded object.
+
+        Raises
+        ------
+        ValueError
+            If a code has no ID, or two codes of an index level share one.
+
+        ---------------------------------------------------------------------------
+
+        将 pandas 对象的代码轴（或索引层级）替换为 ID。
+
+        参数
+        ----------
+        df : Union[pd.DataFrame, pd.Series]
+            需要编码的对象。
+        code : str
+            代码轴名称。
+        register : bool, optional
+            为 True 时代码为存储格式并精确匹配，未出现过的代码被登记（见 `keys`）；
+            否则以 `ids` 查找任意格式的代码。默认为 False。
+
+        返回
+        -------
+        Union[pd.DataFrame, pd.Series]
+            编码后的对象。
+
+        引发
+        ------
+        ValueError
+            如果某个代码没有 ID，或索引层级中两个代码对应同一 ID。
+
+        ---------------------------------------------------------------------------
+        """
+        lookup = self.keys if register else self.ids
+        df = df.copy(deep=False)
+        if isinstance(df, pd.DataFrame) and df.columns.name == code:
+            df.columns = pd.Index(self.__checked__(df.columns, lookup(df.columns), code), name=code)
+        elif code in df.index.names:
+            if isinstance(df.index, pd.MultiIndex):
+                level = df.index.names.index(code)
+                index = df.index.remove_unused_levels()
+                values = index.levels[level]
+                df.index = index.set_levels(self.__checked__(values, lookup(values), code, unique=True), level=level)
+            else:
+                df.index = pd.Index(self.__checked__(df.index, lookup(df.index), code), name=code)
+        return df
+
+    def decode(
+        self,
+        df: Union[pd.DataFrame, pd.Series],
+        code: str,
+        how: str = 'CODE'
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        ===========================================================================
+
+        Replaces an ID axis (or index level) of a pandas object with codes.
+
+        Parameters
+        ----------
+        df : Union[pd.DataFrame, pd.Series]
+            The object to be decoded.
+        code : str
+            Name of the ID axis.
+        how : str, optional
+            The code format (see `codes`). Defaults to 'CODE'.
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series]
+            The decoded object.
+
+        Raises
+        ------
+        ValueError
+            If an ID is not in the master.
+
+        ---------------------------------------------------------------------------
+
+        将 pandas 对象的 ID 轴（或索引层级）替换为代码。
+
+        参数
+        ----------
+        df : Union[pd.DataFrame, pd.Series]
+            需要解码的对象。
+        code : str
+            ID 轴名称。
+        how : str, optional
+            代码格式（见 `codes`）。默认为 'CODE'。
+
+        返回
+        -------
+        Union[pd.DataFrame, pd.Series]
+            解码后的对象。
+
+        引发
+        ------
+        ValueError
+            如果某个 ID 不在主表中。
+
+        ---------------------------------------------------------------------------
+        """
+        df = df.copy(deep=False)
+        if isinstance(df, pd.DataFrame) and df.columns.name == code:
+            df.columns = pd.Index(self.__checked__(df.columns, self.codes(df.columns, how), code), name=code)
+        elif code in df.index.names:
+            if isinstance(df.index, pd.MultiIndex):
+                level = df.index.names.index(code)
+                index = df.index.remove_unused_levels()
+                values = index.levels[level]
+                df.index = index.set_levels(self.__checked__(values, self.codes(values, how), code, unique=True), level=level)
+            else:
+                df.index = pd.Index(self.__checked__(df.index, self.codes(df.index, how), code), name=code)
+        return df
+
+    @staticmethod
+    def __checked__(
+        values: pd.Index,
+        keys: np.ndarray,
+        code: str,
+        unique: bool = False
+    ) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the looked-up keys of `values`, raising on values without a
+        key (-1 or None) and, if `unique`, on values sharing a key.
+
+        ---------------------------------------------------------------------------
+
+        返回 `values` 查找到的键；存在无键的值（-1 或 None）时，或 `unique` 为 True
+        且多个值对应同一键时引发异常。
+
+        ---------------------------------------------------------------------------
+        """
+        invalid = pd.isnull(keys) if keys.dtype == object else keys < 0
+        if unique and not invalid.any():
+            invalid = pd.Index(keys).duplicated(keep=False)
+        if invalid.any():
+            raise ValueError(f"Invalid value '{list(values[invalid][:5].astype(str))}' for index '{code}'. Valid values are: codes of the security master")
+        return keys
@@ -14,8 +14,9 @@ import numpy as np
 import pandas as pd
 
 # Local project-specific imports
-from libs.utils.finance.build.main import cut, group, portfolio, weight
-from libs.__pandas__.config import BUILD as config
+from libs.utils.finance.build.main import cut, group, portfolio, portfolios, weight
+from libs.__pandas__.config import BUILD as config, DTYPE
+from libs.utils.functions import dtype_decorator
 
 
 @pd.api.extensions.register_dataframe_accessor(config.CLASS_NAME)
@@ -68,6 +69,7 @@ class main:
         pct: bool = True,
         order: bool = False,
         nlevels: Optional[Any] = None,
+        codes: bool = False,
     ) -> pd.DataFrame:
         """
         ===========================================================================
@@ -84,6 +86,8 @@ class main:
             Whether to order the groups. Defaults to False.
         nlevels : Optional[Any], optional
             Number of levels for grouping. Defaults to None.
+        codes : bool, optional
+            Whether to return int8 bucket indices (-1 for missing) instead of labels. Defaults to False.
 
         Returns
         -------
@@ -104,6 +108,8 @@ class main:
             是否对组进行排序。默认为 False。
         nlevels : Optional[Any], optional
             分组的级别数。默认为 None。
+        codes : bool, optional
+            是否返回 int8 分组序号（缺失为 -1）而非标签。默认为 False。
 
         返回
         -------
@@ -113,9 +119,10 @@ class main:
         ---------------------------------------------------------------------------
         """
         rule = np.linspace(0, 1, 11).round(2) if rule is None else rule
-        df: pd.DataFrame = group(self._obj, rule=rule, pct=pct, order=order, nlevels=nlevels)
+        df: pd.DataFrame = group(self._obj, rule=rule, pct=pct, order=order, nlevels=nlevels, codes=codes)
         return df
 
+    @dtype_decorator(DTYPE)
     def weight(
         self,
         w_df: Optional[pd.DataFrame] = None,
@@ -163,6 +170,7 @@ class main:
         """
         return weight(self._obj, w_df=w_df, fillna=fillna, pct=pct)
 
+    @dtype_decorator(DTYPE)
     def portfolio(
         self,
         returns: pd.DataFrame,
@@ -220,6 +228,63 @@ class main:
         """
         return portfolio(self._obj, returns=returns, weight=weight, shift=shift, roll=roll, fillna=fillna)
 
+    def portfolios(
+        self,
+        returns: pd.DataFrame,
+        weight: Optional[pd.DataFrame] = None,
+        shift: int = 1,
+        roll: int = 1,
+        fillna: bool = True
+    ) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Calculates the bucket returns of every factor of a bucket panel.
+
+        Parameters
+        ----------
+        returns : pd.DataFrame
+            DataFrame containing returns data.
+        weight : Optional[pd.DataFrame], optional
+            DataFrame containing weights for portfolio construction. Defaults to None.
+        shift : int, optional
+            Shift for returns. Defaults to 1.
+        roll : int, optional
+            Roll for returns. Defaults to 1.
+        fillna : bool, optional
+            Whether to fill NaN values. Defaults to True.
+
+        Returns
+        -------
+        pd.DataFrame
+            The bucket returns, dates x (factor, bucket).
+
+        ---------------------------------------------------------------------------
+
+        计算分组面板中每个因子的分组收益。
+
+        参数
+        ----------
+        returns : pd.DataFrame
+            包含收益数据的 DataFrame。
+        weight : Optional[pd.DataFrame], optional
+            用于投资组合构建的权重 DataFrame。默认为 None。
+        shift : int, optional
+            收益的位移。默认为 1。
+        roll : int, optional
+            收益的滚动。默认为 1。
+        fillna : bool, optional
+            是否填充 NaN 值。默认为 True。
+
+        返回
+        -------
+        pd.DataFrame
+            分组收益，日期 x (因子, 分组)。
+
+        ---------------------------------------------------------------------------
+        """
+        return portfolios(self._obj, returns=returns, weight=weight, shift=shift, roll=roll, fillna=fillna)
+
     def cut(
         self,
         right: Union[int, float],
@@ -227,7 +292,8 @@ class main:
         left: Union[int, float] = 0,
         rng_left: Union[int, float] = 0,
         pct: bool = False,
-        ascending: bool = False
+        ascending: bool = False,
+        limit: Optional[Union[int, float]] = None
     ) -> pd.DataFrame:
         """
         ===========================================================================
@@ -248,6 +314,8 @@ class main:
             Whether to use percentages for boundaries. Defaults to False.
         ascending : bool, optional
             Whether to sort in ascending order. Defaults to False.
+        limit : Optional[Union[int, float]], optional
+            Maximum number of names entering, and leaving, per date. Defaults to None.
 
         Returns
         -------
@@ -272,6 +340,8 @@ class main:
             是否使用百分比作为边界。默认为 False。
         ascending : bool, optional
             是否按升序排序。默认为 False。
+        limit : Optional[Union[int, float]], optional
+            每个日期最多买入、卖出的标的数量。默认为 None。
 
         返回
         -------
@@ -280,7 +350,7 @@ class main:
 
         ---------------------------------------------------------------------------
         """
-        return cut(self._obj, left, right, rng_left, rng_right, pct, ascending)
+        return cut(self._obj, left, right, rng_left, rng_right, pct, ascending, limit)
     
     
     
@@ -15,7 +15,8 @@ import pandas as pd
 
 # Local project-specific imports
 from libs.utils.finance.roll.main import _rolls as rolls
-from libs.__pandas__.config import ROLLS as config
+from libs.__pandas__.config import ROLLS as config, DTYPE
+from libs.utils.functions import dtype_decorator
 
 
 @pd.api.extensions.register_series_accessor(config.CLASS_NAME)
@@ -23,6 +24,7 @@ class main:
     def __init__(self, pandas_obj: pd.Series):
         self._obj = pandas_obj
 
+    @dtype_decorator(DTYPE)
     def __call__(
         self, 
         window: int, 
@@ -37,6 +39,7 @@ class main():
     def __init__(self, pandas_obj: pd.Series):
         self._obj = pandas_obj
 
+    @dtype_decorator(DTYPE)
     def __call__(
         self, 
         window: int, 
@@ -6,9 +6,10 @@ Created on Thu Jul 17 15:18:48 2025
 
 """
 
-from libs.utils.finance.stats.main import standard, OLS, neutral, const
+from libs.utils.finance.stats.main import standard, OLS, neutral, const, rolling_ols, group_neutral, rank, zscore, winsorize, pipeline
 from libs.utils.finance.build.dev import neutral as neutral_dev
-from libs.__pandas__.config import STATS as config
+from libs.__pandas__.config import STATS as config, DTYPE
+from libs.utils.functions import dtype_decorator
 
 import numpy as np
 import pandas as pd
@@ -20,6 +21,7 @@ class main():
     def __init__(self, pandas_obj: pd.Series):
         self._obj = pandas_obj
         
+    @dtype_decorator(DTYPE)
     def standard(
         self, 
         method: str = 'gauss', 
@@ -41,6 +43,7 @@ class main():
     def __init__(self, pandas_obj: pd.Series):
         self._obj = pandas_obj
 
+    @dtype_decorator(DTYPE)
     def standard(
         self, 
         method: str = 'gauss', 
@@ -50,6 +53,47 @@ class main():
         x = standard(self._obj, method=method, rank=rank, axis=axis)
         return x
         
+    @dtype_decorator(DTYPE)
+    def rank(
+        self, 
+        pct: bool = True, 
+        ascending: bool = True, 
+        axis: int = 1, 
+        group: Optional[Union[pd.DataFrame, pd.Series]] = None
+    ) -> pd.DataFrame:
+        return rank(self._obj, pct=pct, ascending=ascending, axis=axis, group=group)
+        
+    @dtype_decorator(DTYPE)
+    def zscore(
+        self, 
+        axis: int = 1, 
+        group: Optional[Union[pd.DataFrame, pd.Series]] = None
+    ) -> pd.DataFrame:
+        return zscore(self._obj, axis=axis, group=group)
+        
+    @dtype_decorator(DTYPE)
+    def winsorize(
+        self, 
+        method: str = 'mad', 
+        limits: Optional[Tuple[float, float]] = None, 
+        axis: int = 1, 
+        group: Optional[Union[pd.DataFrame, pd.Series]] = None
+    ) -> pd.DataFrame:
+        return winsorize(self._obj, method=method, limits=limits, axis=axis, group=group)
+        
+    @dtype_decorator(DTYPE)
+    def pipeline(
+        self, 
+        method: Optional[str] = 'mad', 
+        limits: Optional[Tuple[float, float]] = None, 
+        rank: bool = True, 
+        pct: bool = True, 
+        ascending: bool = True, 
+        axis: int = 1, 
+        group: Optional[Union[pd.DataFrame, pd.Series]] = None
+    ) -> pd.DataFrame:
+        return pipeline(self._obj, method=method, limits=limits, rank=rank, pct=pct, ascending=ascending, axis=axis, group=group)
+        
     def const(
         self, 
         columns: Optional[List[Any]] = None, 
@@ -65,12 +109,13 @@ class main():
         min_periods: Optional[int] = None, 
         dropna: bool = True, 
         keys: Tuple[int, int] = (0, -1), 
-        returns: type = list, 
+        returns: type = pd.DataFrame, 
         weight: Optional[pd.DataFrame] = None
-    ) -> Union[Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]:
+    ) -> Union[Any, Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]:
         
         return OLS(self._obj, const=const, roll=roll, min_periods=min_periods, dropna=dropna, keys=keys, returns=returns, weight=weight)
           
+    @dtype_decorator(DTYPE)
     def neutral(
         self, 
         const: bool = True, 
@@ -79,10 +124,32 @@ class main():
         flatten: bool = False,  
         weight: Optional[np.ndarray] = None, 
         resid: bool = True, 
-        **key_dfs: pd.DataFrame
+        **key_dfs: Union[pd.DataFrame, pd.Series]
     ) -> Any:
         return neutral(self._obj, const=const, neu_axis=neu_axis, periods=periods, flatten=flatten, w=weight, resid=resid, **key_dfs)
+
+    @dtype_decorator(DTYPE)
+    def group_neutral(
+        self, 
+        group: Union[pd.DataFrame, pd.Series], 
+        weight: Optional[Union[pd.DataFrame, pd.Series, np.ndarray]] = None, 
+        resid: bool = True, 
+        **key_dfs: Union[pd.DataFrame, pd.Series]
+    ) -> Any:
+        return group_neutral(self._obj, group=group, w=weight, resid=resid, **key_dfs)
+        
+    @dtype_decorator(DTYPE)
+    def rolling_ols(
+        self, 
+        periods: int, 
+        const: bool = True, 
+        half_life: Optional[Union[int, float]] = None, 
+        min_periods: Optional[int] = None, 
+        **key_dfs: Union[pd.DataFrame, pd.Series]
+    ) -> Any:
+        return rolling_ols(self._obj, periods=periods, const=const, half_life=half_life, min_periods=min_periods, **key_dfs)
         
+    @dtype_decorator(DTYPE)
     def neutral_dev(
         self, 
         const: bool = True, 
@@ -90,7 +157,7 @@ class main():
         periods: Optional[int] = None, 
         flatten: bool = False,  
         resid: bool = True, 
-        **key_dfs: pd.DataFrame
+        **key_dfs: Union[pd.DataFrame, pd.Series]
     ) -> Any:
         return neutral_dev(self._obj, const=const, neu_axis=neu_axis, periods=periods, flatten=flatten, resid=resid, **key_dfs)
         
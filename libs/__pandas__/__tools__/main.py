@@ -6,7 +6,7 @@ Created on Thu Jul 17 15:18:48 2025
 
 """
 import pandas as pd
-from typing import Union, List, Any
+from typing import Union, List, Any, Optional
 
 from libs.__pandas__.config import TOOLS as config
 from libs.utils.finance.tools.main import fillna, shift, log
@@ -18,10 +18,11 @@ class main():
         
     def fillna(
         self, 
-        fill_list: List[Any]
+        fill_list: List[Any], 
+        limit: Optional[Any] = None
     ) -> pd.DataFrame:
 
-        return fillna(self._obj, fill_list)
+        return fillna(self._obj, fill_list, limit)
 
     def shift(
         self, 
@@ -122,5 +122,30 @@ class BACK_TEST:
         
 class FACTORIZE:
     CLASS_NAME:str = 'f'
-        
-        
\ No newline at end of file
+
+
+class DTYPE:
+    """
+    ===========================================================================
+
+    Dtype policy of the stats, rollings and build accessors.
+
+    Inputs narrower than float64 (e.g. float32 panels) are computed in
+    `compute` and, if `preserve`, the results are cast back to the input
+    dtype. If `check`, results are compared against float64 inputs and a
+    warning is printed above `tolerance` (relative).
+
+    ---------------------------------------------------------------------------
+
+    stats、rollings 和 build 访问器的数据类型策略。
+
+    窄于 float64 的输入（例如 float32 面板）以 `compute` 类型计算，若 `preserve`
+    为 True，结果转换回输入类型。若 `check` 为 True，结果与 float64 输入的结果比较，
+    相对误差超过 `tolerance` 时打印警告。
+
+    ---------------------------------------------------------------------------
+    """
+    compute: str = 'float64'
+    preserve: bool = True
+    check: bool = False
+    tolerance: float = 1e-4
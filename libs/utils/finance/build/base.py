@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 19:41:26 2026
+
+@author: Porco Rosso
+
+"""
+
+from numba import njit, prange
+import numpy as np
+
+
+@njit(parallel=True, cache=True)
+def __bucket_returns__(
+    codes: np.ndarray,
+    returns: np.ndarray,
+    weight: np.ndarray,
+    weighted: bool,
+    buckets: int
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Aggregates the returns of every row by bucket index.
+
+    Each row is one pass over the columns accumulating the (weighted) sum
+    and the weight (or count) per bucket; entries with a negative bucket or
+    a missing return or weight are skipped. Buckets without entries (or
+    with zero total weight) are NaN. Rows run in parallel.
+
+    ---------------------------------------------------------------------------
+
+    按分组序号逐行汇总收益。
+
+    每一行对各列遍历一次，累计每个分组的（加权）收益和与权重（或数量）；分组为负、
+    收益或权重缺失的元素被跳过。没有元素（或总权重为零）的分组为 NaN。各行并行执行。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Integer bucket indices, rows x columns (negative for missing).
+    returns : np.ndarray
+        Returns, rows x columns.
+    weight : np.ndarray
+        Weights, rows x columns, used if `weighted`.
+    weighted : bool
+        Whether to weight the returns.
+    buckets : int
+        The number of buckets.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    codes : np.ndarray
+        整数分组序号，行 x 列（负数表示缺失）。
+    returns : np.ndarray
+        收益，行 x 列。
+    weight : np.ndarray
+        权重，行 x 列，`weighted` 时使用。
+    weighted : bool
+        是否对收益加权。
+    buckets : int
+        分组数量。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The bucket returns, rows x buckets.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        各分组的收益，行 x 分组。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = codes.shape
+    out = np.full((T, buckets), np.nan)
+    for t in prange(T):
+        total = np.zeros(buckets)
+        base = np.zeros(buckets)
+        for n in range(N):
+            b = codes[t, n]
+            r = returns[t, n]
+            if b < 0 or b >= buckets or np.isnan(r):
+                continue
+            if weighted:
+                w = weight[t, n]
+                if np.isnan(w):
+                    continue
+                total[b] += r * w
+                base[b] += w
+            else:
+                total[b] += r
+                base[b] += 1.0
+        for b in range(buckets):
+            if base[b] != 0.0:
+                out[t, b] = total[b] / base[b]
+    return out
+
+
+@njit(cache=True)
+def __cut__(
+    ranks: np.ndarray,
+    left: float,
+    right: float,
+    rng_left: float,
+    rng_right: float,
+    pct: bool,
+    limit: float
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Rank band selection with a hold buffer, carried row to row.
+
+    The first row selects the ranks in `[left, right]`. On every later row
+    the held names stay while their rank is in `[left - rng_left, right +
+    rng_right]`; the selection is then topped up with the best ranks from
+    `left` on, or trimmed to its best ranks, to `right - left` names (times
+    the valid count if `pct`). With `limit` >= 0 at most that many names
+    enter and at most that many leave per row (names out of the band leave
+    first, missing ranks before the worst ranks); otherwise the trades are
+    not limited. Ties are broken by column order (earlier columns first).
+
+    ---------------------------------------------------------------------------
+
+    带持有缓冲的排名区间选择，逐行传递持仓状态。
+
+    第一行选择排名在 `[left, right]` 内的标的。之后每一行，已持有的标的在排名位于
+    `[left - rng_left, right + rng_right]` 时继续持有；随后从 `left` 起以最优排名
+    补足，或保留最优排名以削减，使数量为 `right - left`（`pct` 时乘以有效数量）。
+    `limit` >= 0 时每行最多买入、最多卖出该数量的标的（先卖出超出区间的标的，排名
+    缺失的先于排名最差的）；否则不限制交易数量。并列按列顺序处理（靠前的列优先）。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    ranks : np.ndarray
+        Ranks, rows x columns (NaN for missing).
+    left : float
+        The left boundary of the selection.
+    right : float
+        The right boundary of the selection.
+    rng_left : float
+        The left hold buffer.
+    rng_right : float
+        The right hold buffer.
+    pct : bool
+        Whether the ranks and boundaries are percentages.
+    limit : float
+        The maximum number of names entering, and leaving, per row (a
+        fraction of the valid count if `pct`), negative for no limit.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    ranks : np.ndarray
+        排名，行 x 列（缺失为 NaN）。
+    left : float
+        选择的左边界。
+    right : float
+        选择的右边界。
+    rng_left : float
+        左侧持有缓冲。
+    rng_right : float
+        右侧持有缓冲。
+    pct : bool
+        排名与边界是否为百分比。
+    limit : float
+        每行最多买入、卖出的标的数量（`pct` 时为有效数量的比例），负数表示不限制。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The selection, rows x columns.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        选择结果，行 x 列。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = ranks.shape
+    hold = np.zeros((T, N), dtype=np.bool_)
+    if T == 0:
+        return hold
+    for n in range(N):
+        hold[0, n] = ranks[0, n] >= left and ranks[0, n] <= right
+    index = np.empty(N, dtype=np.int64)
+    keys = np.empty(N)
+    for t in range(1, T):
+        row = ranks[t]
+        count = 0
+        for n in range(N):
+            if not np.isnan(row[n]):
+                count += 1
+        lens = int((right - left) * count) if pct else int(right - left)
+        budget = N if limit < 0 else (int(limit * count) if pct else int(limit))
+
+        # held names out of the band leave, missing ranks first, then worst
+        m = 0
+        held = 0
+        for n in range(N):
+            if hold[t - 1, n]:
+                held += 1
+                if not (row[n] >= left - rng_left and row[n] <= right + rng_right):
+                    index[m] = n
+                    keys[m] = np.inf if np.isnan(row[n]) else row[n]
+                    m += 1
+        for n in range(N):
+            hold[t, n] = hold[t - 1, n]
+        exits = min(m, budget)
+        order = np.argsort(keys[:m], kind='mergesort')
+        for i in range(exits):
+            hold[t, index[order[m - 1 - i]]] = False
+        held -= exits
+
+        updates = lens - held
+        if updates > 0:
+            m = 0
+            for n in range(N):
+                if not hold[t, n] and row[n] >= left:
+                    index[m] = n
+                    keys[m] = row[n]
+                    m += 1
+            order = np.argsort(keys[:m], kind='mergesort')
+            for i in range(min(updates, m, budget)):
+                hold[t, index[order[i]]] = True
+        elif updates < 0:
+            m = 0
+            for n in range(N):
+                if hold[t, n]:
+                    index[m] = n
+                    keys[m] = np.inf if np.isnan(row[n]) else row[n]
+                    m += 1
+            order = np.argsort(keys[:m], kind='mergesort')
+            for i in range(min(-updates, budget - exits)):
+                hold[t, index[order[m - 1 - i]]] = False
+    return hold
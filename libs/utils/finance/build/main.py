@@ -4,6 +4,88 @@ import pandas as pd
 from typing import Optional, Dict, Any, List, Union
 
 from libs.utils.finance.tools.main import fillna as fillna_func
+from libs.utils.finance.stats.base import cross_section
+from libs.utils.finance.build.base import __bucket_returns__, __cut__
+
+
+def __bucket__(
+    values: np.ndarray,
+    bins: np.ndarray,
+    pct: bool = True,
+    labels: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Ranks each row (within `labels` if given) and returns the index of the
+    right-closed bin `(bins[j], bins[j + 1]]` of every rank, as `pd.cut`;
+    -1 for missing values or ranks outside the bins.
+
+    ---------------------------------------------------------------------------
+
+    对每行排名（给定 `labels` 时在分组内排名），返回每个排名所在右闭区间
+    `(bins[j], bins[j + 1]]` 的序号，与 `pd.cut` 一致；缺失值或超出区间的排名为 -1。
+
+    ---------------------------------------------------------------------------
+    """
+    ranks = cross_section(values, labels, rank=True, pct=pct)
+    codes = np.searchsorted(bins, ranks, side='left') - 1
+    codes[(codes >= len(bins) - 1) | np.isnan(ranks)] = -1
+    return codes.astype(np.int8 if len(bins) <= 128 else np.int16)
+
+
+def __categorical__(
+    codes: pd.DataFrame,
+    labels: List[str]
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Converts a panel of bucket codes (see `__bucket__`) to ordered
+    categorical columns, with -1 as missing.
+
+    ---------------------------------------------------------------------------
+
+    将分组编号面板（见 `__bucket__`）转换为有序的分类列，-1 表示缺失。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    codes : pd.DataFrame
+        The integer bucket codes.
+    labels : List[str]
+        The bucket labels, in order.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    codes : pd.DataFrame
+        整数分组编号。
+    labels : List[str]
+        按顺序排列的分组标签。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The ordered categorical panel, indexed like `codes`.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        有序分类面板，索引与 `codes` 相同。
+
+    ---------------------------------------------------------------------------
+    """
+    return pd.DataFrame(
+        {i: pd.Categorical.from_codes(codes.iloc[:, i], categories=labels, ordered=True) for i in range(codes.shape[1])},
+        index=codes.index
+    ).set_axis(codes.columns, axis=1)
 
 
 def group(
@@ -11,7 +93,8 @@ def group(
     rule: Union[Dict, List],
     pct: bool = True,
     order: bool = False,
-    nlevels: Optional[List[Union[int, str]]] = None
+    nlevels: Optional[List[Union[int, str]]] = None,
+    codes: bool = False
 ) -> pd.DataFrame:
     """
     ===========================================================================
@@ -19,13 +102,21 @@ def group(
     Groups and ranks a DataFrame based on specified rules.
 
     This function groups the DataFrame by its index and applies ranking and
-    binning rules to its columns.
+    binning rules to its columns. Bucket indices are computed directly on
+    the 2D panels (row ranks, within the buckets of the previous rule keys
+    if `order`, then a search in the bins); with `codes` they are returned
+    as int8 panels (-1 for missing), otherwise as categorical labels built
+    from them. Dict rules on columns with more than the (field, code)
+    levels fall back to the stacked groupby.
 
     ---------------------------------------------------------------------------
 
     根据指定规则对 DataFrame 进行分组和排名。
 
-    此函数按索引对 DataFrame 进行分组，并对其列应用排名和分箱规则。
+    此函数按索引对 DataFrame 进行分组，并对其列应用排名和分箱规则。分组序号直接在
+    二维面板上计算（逐行排名，`order` 时在之前规则键的分组内排名，再在分箱中查找）；
+    `codes` 时以 int8 面板返回（缺失为 -1），否则返回由其构建的分类标签。列层级多于
+    （字段，代码）的字典规则回退到堆叠后的 groupby。
 
     ---------------------------------------------------------------------------
 
@@ -41,6 +132,9 @@ def group(
         If True, grouping is applied sequentially, by default False.
     nlevels : Optional[List[Union[int, str]]], optional
         Column levels to exclude from stacking, by default None.
+    codes : bool, optional
+        If True, returns int8 bucket indices instead of labels, by default
+        False.
 
     ---------------------------------------------------------------------------
 
@@ -56,6 +150,8 @@ def group(
         如果为 True，则顺序应用分组，默认为 False。
     nlevels : Optional[List[Union[int, str]]], optional
         要从堆叠中排除的列级别，默认为 None。
+    codes : bool, optional
+        如果为 True，则返回 int8 分组序号而非标签，默认为 False。
 
     ---------------------------------------------------------------------------
 
@@ -74,6 +170,21 @@ def group(
     ---------------------------------------------------------------------------
     """
     if isinstance(rule, dict):
+        if df.columns.nlevels == 2 and (nlevels is None or list(nlevels) in ([0], [df.columns.names[0]])):
+            columns = df.columns.get_level_values(1).unique()
+            dic = {}
+            keys = None
+            for i, j in rule.items():
+                dic[i] = __bucket__(df[i].reindex(columns=columns).values, np.asarray(j, dtype=np.float64), pct, keys)
+                if order:
+                    keys = dic[i].astype(np.int64) if keys is None else np.where(dic[i] >= 0, keys * (len(j) - 1) + dic[i], -1)
+            dic = {
+                i: pd.DataFrame(j, index=df.index, columns=columns) if codes 
+                else __categorical__(pd.DataFrame(j, index=df.index, columns=columns), [str([rule[i][k], rule[i][k+1]]) for k in range(len(rule[i]) - 1)]) 
+                for i, j in dic.items()
+            }
+            df = pd.concat(dic, axis=1, names=[df.columns.names[0]])
+            return df
         df.index.names = [i if i is not None else 'level_i' + str(j) for j,i in enumerate(df.index.names)]
         df.columns.names = [i if i is not None else 'level_c' + str(j) for j,i in enumerate(df.columns.names)]
         ind_keys = list(df.index.names)
@@ -88,12 +199,10 @@ def group(
             if order:
                 used_keys.append(i)
         df = df.unstack(list(range(df.index.nlevels)[-1 * len(col_nlevels):]))
+        df = df.apply(lambda x: x.cat.codes.astype(np.int8)) if codes else df
     else:
-        df = df.rank(axis=1, pct=pct)
-        col_nlevels = df.columns.nlevels
-        df = df.stack(list(range(col_nlevels)))
-        df = pd.cut(df, rule, labels=[str([rule[i], rule[i+1]]) for i in range(len(rule) - 1)])
-        df = df.unstack(list(range(df.index.nlevels)[-1 * col_nlevels:]))
+        obj = pd.DataFrame(__bucket__(df.values, np.asarray(rule, dtype=np.float64), pct), index=df.index, columns=df.columns)
+        df = obj if codes else __categorical__(obj, [str([rule[i], rule[i+1]]) for i in range(len(rule) - 1)])
     return df
 
 
@@ -284,6 +393,117 @@ def portfolio(
     return obj
 
 
+def portfolios(
+    buckets: Union[pd.DataFrame, Dict[Any, pd.DataFrame]],
+    returns: pd.DataFrame,
+    weight: Optional[pd.DataFrame] = None,
+    shift: int = 1,
+    roll: int = 1,
+    fillna: bool = False
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Calculates the bucket returns of many factors in one call.
+
+    The forward returns (and weights) are prepared once as in `portfolio`,
+    then each factor's integer bucket panel (e.g. `group(..., codes=True)`)
+    is aggregated row by row by a compiled kernel into a dates x buckets
+    block, without stacking or grouping. Categorical bucket panels (the
+    labels of `group`) are read through their codes.
+
+    ---------------------------------------------------------------------------
+
+    一次调用计算多个因子的分组收益。
+
+    前瞻收益（与权重）按 `portfolio` 的方式只准备一次，然后每个因子的整数分组面板
+    （例如 `group(..., codes=True)`）由编译内核逐行汇总为日期 x 分组的数据块，无需
+    堆叠或分组。分类分组面板（`group` 的标签）通过其代码读取。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    buckets : Union[pd.DataFrame, Dict[Any, pd.DataFrame]]
+        Bucket panels by factor, or one panel ((factor, code) columns are
+        split into factors), with negative or missing values as no bucket.
+    returns : pd.DataFrame
+        Asset returns DataFrame.
+    weight : Optional[pd.DataFrame], optional
+        Asset weight DataFrame, by default None.
+    shift : int, optional
+        Number of periods to shift returns, by default 1.
+    roll : int, optional
+        Rolling window size for returns, by default 1.
+    fillna : bool, optional
+        Whether to forward-fill the bucket data, by default False.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    buckets : Union[pd.DataFrame, Dict[Any, pd.DataFrame]]
+        按因子的分组面板，或单个面板（(因子, 代码) 列会拆分为各因子），负值或缺失值
+        表示不属于任何分组。
+    returns : pd.DataFrame
+        资产回报 DataFrame。
+    weight : Optional[pd.DataFrame], optional
+        资产权重 DataFrame，默认为 None。
+    shift : int, optional
+        回报的移动期数，默认为 1。
+    roll : int, optional
+        回报的滚动窗口大小，默认为 1。
+    fillna : bool, optional
+        是否前向填充分组数据，默认为 False。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        Bucket returns, dates x (factor, bucket), or dates x buckets for a
+        single-level panel.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        分组收益，日期 x (因子, 分组)；单层面板时为日期 x 分组。
+
+    ---------------------------------------------------------------------------
+    """
+    single = isinstance(buckets, pd.DataFrame) and buckets.columns.nlevels == 1
+    if single:
+        buckets = {'__factor__': buckets}
+    elif isinstance(buckets, pd.DataFrame):
+        buckets = {i: buckets[i] for i in buckets.columns.get_level_values(0).unique()}
+
+    returns = returns.rolling(roll).mean().shift((roll - 1 + shift) * -1)
+    values = np.ascontiguousarray(returns.values, dtype=np.float64)
+    weighted = weight is not None
+    if weighted:
+        weight = (fillna_func(weight, returns.index) if fillna else weight).reindex_like(returns)
+        weight = np.ascontiguousarray(weight.values, dtype=np.float64)
+    else:
+        weight = np.empty((1, 1))
+
+    dic = {}
+    for i, j in buckets.items():
+        labels = None
+        if len(j.columns) and all(isinstance(k, pd.CategoricalDtype) for k in j.dtypes):
+            labels = list(j.dtypes.iloc[0].categories)
+            j = j.apply(lambda x: x.cat.codes)
+        j = fillna_func(j, returns.index) if fillna else j
+        j = j.reindex(index=returns.index, columns=returns.columns, fill_value=-1).values
+        j = np.where(np.isnan(j), -1, j).astype(np.int64) if j.dtype.kind == 'f' else j
+        size = len(labels) if labels is not None else int(j.max(initial=-1)) + 1
+        obj = __bucket_returns__(j, values, weight, weighted, size)
+        dic[i] = pd.DataFrame(obj, index=returns.index, columns=labels if labels is not None else range(size)).shift(shift)
+    df = dic['__factor__'] if single else pd.concat(dic, axis=1)
+    return df
+
+
 def cut(
     df_obj: pd.DataFrame,
     left: Union[int, float],
@@ -291,7 +511,8 @@ def cut(
     rng_left: Union[int, float],
     rng_right: Union[int, float],
     pct: bool = True,
-    ascending: bool = False
+    ascending: bool = False,
+    limit: Optional[Union[int, float]] = None
 ) -> pd.DataFrame:
     """
     ===========================================================================
@@ -299,13 +520,16 @@ def cut(
     Selects a slice of a DataFrame based on rank with hysteresis.
 
     This function selects columns that fall within a specific rank range
-    and uses a hysteresis mechanism to reduce turnover.
+    and uses a hysteresis mechanism to reduce turnover. The held set is
+    carried row to row by a compiled kernel (see `__cut__`), optionally
+    with a maximum number of names traded per date.
 
     ---------------------------------------------------------------------------
 
     基于带有迟滞效应的排名选择 DataFrame 的切片。
 
-    此函数选择排名在特定范围内的列，并使用迟滞机制来减少换手率。
+    此函数选择排名在特定范围内的列，并使用迟滞机制来减少换手率。持仓集合由编译
+    内核逐行传递（见 `__cut__`），可选择限制每个日期交易的最大数量。
 
     ---------------------------------------------------------------------------
 
@@ -325,6 +549,10 @@ def cut(
         Whether the ranks are percentage-based, by default True.
     ascending : bool, optional
         The sort order for ranking, by default False.
+    limit : Optional[Union[int, float]], optional
+        The maximum number of names entering, and of names leaving, the
+        selection per date (a fraction of the valid names if `pct`), by
+        default None (no limit).
 
     ---------------------------------------------------------------------------
 
@@ -344,6 +572,9 @@ def cut(
         排名是否基于百分比，默认为 True。
     ascending : bool, optional
         排名的排序顺序，默认为 False。
+    limit : Optional[Union[int, float]], optional
+        每个日期最多买入、最多卖出的标的数量（`pct` 时为有效标的数量的比例），
+        默认为 None（不限制）。
 
     ---------------------------------------------------------------------------
 
@@ -361,21 +592,10 @@ def cut(
 
     ---------------------------------------------------------------------------
     """
-    role = right - left
-    lst = []
-    rank = df_obj.rank(axis=1, pct=pct, ascending=ascending)
-    j = rank.iloc[0]
-    j = (j >= left) & (j <= right)
-    lst.append(j.values)
-    for i, j in rank.iloc[1:].iterrows():
-        hold = (j >= left - rng_left) & (j <= right + rng_right) & lst[-1]
-        lens = int(role * j.notnull().sum()) if pct else role
-        updates = lens - hold.sum()
-        if updates > 0:
-            j = j[(~hold) & (j >= left)].sort_values().head(updates)
-            hold[j.index] = True
-        elif updates < 0:
-            hold[~hold.index.isin(j[hold].sort_values().head(lens).index)] = False
-        lst.append(hold.values)
-    lst = pd.DataFrame(np.vstack(lst), index=df_obj.index, columns=df_obj.columns)
-    return lst 
\ No newline at end of file
+    rank = cross_section(df_obj.values, rank=True, pct=pct, ascending=ascending)
+    hold = __cut__(
+        rank, float(left), float(right), float(rng_left), float(rng_right), pct,
+        -1.0 if limit is None else float(limit)
+    )
+    hold = pd.DataFrame(hold, index=df_obj.index, columns=df_obj.columns)
+    return hold 
\ No newline at end of file
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 23:12:37 2026
+
+@author: Porco Rosso
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.utils.finance.build.main import cut, group, portfolio, portfolios
+
+
+def __group__(df: pd.DataFrame, rule, pct: bool = True, order: bool = False) -> pd.DataFrame:
+    # the stacked rank / pd.cut implementation the 2D buckets replaced, kept
+    # as the reference
+    labels = lambda x: [str([x[i], x[i + 1]]) for i in range(len(x) - 1)]
+    if isinstance(rule, dict):
+        df = df.stack(1, future_stack=True).loc[:, list(rule.keys())]
+        used_keys = []
+        for i in df.columns:
+            df[i] = df.groupby([df.index.names[0]] + used_keys, observed=True)[i].rank(pct=pct)
+            df[i] = pd.cut(df[i], rule[i], labels=labels(rule[i]))
+            if order:
+                used_keys.append(i)
+        return df.unstack(-1)
+    df = df.rank(axis=1, pct=pct).stack(future_stack=True)
+    return pd.cut(df, rule, labels=labels(rule)).unstack(-1)
+
+
+def __cut__(df_obj: pd.DataFrame, left, right, rng_left, rng_right, pct: bool = True, ascending: bool = False) -> pd.DataFrame:
+    # the row-by-row turnover buffer the compiled kernel replaced, kept as
+    # the reference
+    role = right - left
+    rank = df_obj.rank(axis=1, pct=pct, ascending=ascending)
+    lst = [((rank.iloc[0] >= left) & (rank.iloc[0] <= right)).values]
+    for i, j in rank.iloc[1:].iterrows():
+        hold = (j >= left - rng_left) & (j <= right + rng_right) & lst[-1]
+        lens = int(role * j.notnull().sum()) if pct else role
+        updates = lens - hold.sum()
+        if updates > 0:
+            j = j[(~hold) & (j >= left)].sort_values().head(updates)
+            hold[j.index] = True
+        elif updates < 0:
+            hold[~hold.index.isin(j[hold].sort_values().head(lens).index)] = False
+        lst.append(hold.values)
+    return pd.DataFrame(np.vstack(lst), index=df_obj.index, columns=df_obj.columns)
+
+
+def __panel__(seed: int = 0, T: int = 20, N: int = 40) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((T, N))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame(values, index=pd.date_range('2020-01-01', periods=T, name='TRADE_DT'), columns=pd.Index([f'{i:06d}.XSHE' for i in range(N)], name='S_INFO_WINDCODE'))
+
+
+@pytest.mark.parametrize('rule', [[0, 0.2, 0.5, 0.8, 1], [0.1, 0.3, 0.6], [0, 1]])
+def test_group_list_matches_previous(rule):
+    df = __panel__()
+    expected = __group__(df, rule)
+    pd.testing.assert_frame_equal(group(df, rule), expected)
+    pd.testing.assert_frame_equal(group(df, rule, codes=True), expected.apply(lambda x: x.cat.codes.astype(np.int8)))
+
+
+@pytest.mark.parametrize('order', [False, True])
+def test_group_dict_matches_previous(order):
+    df = pd.concat({'size': __panel__(), 'value': __panel__(1)}, axis=1, names=['VALUE'])
+    rule = {'size': [0, 0.5, 1], 'value': [0, 0.3, 0.7, 1]}
+    expected = __group__(df, rule, order=order).reindex(columns=df.columns)
+    pd.testing.assert_frame_equal(group(df, rule, order=order), expected)
+    pd.testing.assert_frame_equal(group(df, rule, order=order, codes=True), expected.apply(lambda x: x.cat.codes.astype(np.int8)))
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('roll, shift', [(1, 1), (3, 2)])
+@pytest.mark.parametrize('codes', [False, True])
+def test_portfolios_matches_portfolio(weighted, roll, shift, codes):
+    rng = np.random.default_rng(2)
+    returns = (__panel__(3) * 0.02).mask(rng.random((20, 40)) < 0.05)
+    weight = __panel__(4).abs() if weighted else None
+    buckets = group(__panel__(), [0, 0.2, 0.5, 0.8, 1])
+    expected = portfolio(buckets.copy(), returns, weight=weight, shift=shift, roll=roll)
+    buckets = buckets.apply(lambda x: x.cat.codes) if codes else buckets
+    expected = expected.set_axis(range(4) if codes else list(expected.columns), axis=1)
+    result = portfolios(buckets, returns, weight=weight, shift=shift, roll=roll)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-12, atol=1e-15, check_names=False, check_freq=False)
+
+
+def test_portfolios_per_field():
+    df = pd.concat({'size': __panel__(), 'value': __panel__(1)}, axis=1, names=['VALUE'])
+    buckets = group(df, {'size': [0, 0.5, 1], 'value': [0, 0.3, 0.7, 1]}, order=True)
+    returns = __panel__(3) * 0.02
+    result = portfolios(buckets, returns)
+    # one bucket panel per field, unlike portfolio which crosses them
+    for i in ['size', 'value']:
+        expected = portfolio(buckets[i].copy(), returns)
+        pd.testing.assert_frame_equal(result[i], expected.set_axis(list(expected.columns), axis=1), rtol=1e-12, atol=1e-15, check_names=False, check_freq=False)
+
+
+@pytest.mark.parametrize('left, right, rng_left, rng_right, pct', [
+    (0, 0.2, 0.05, 0.1, True),
+    (0, 0.3, 0, 0, True),
+    (0.1, 0.4, 0.05, 0.05, True),
+    (1, 10, 2, 5, False),
+    (1, 10, 0, 3, False),
+])
+@pytest.mark.parametrize('ascending', [False, True])
+def test_cut_matches_previous(left, right, rng_left, rng_right, pct, ascending):
+    df = __panel__(T=60, N=50)
+    expected = __cut__(df, left, right, rng_left, rng_right, pct, ascending)
+    pd.testing.assert_frame_equal(cut(df, left, right, rng_left, rng_right, pct, ascending), expected)
@@ -6,9 +6,14 @@ Created on Thu Jul 17 12:56:19 2025
 
 """
 
+from numba import njit, prange
 import numpy as np
 from typing import Optional, Callable, Any
 
+# Reductions of the rolling top-k values computed inside the kernel, in the
+# order (and with the masked semantics) of numpy.ma.
+_TOP_K_FUNCS = {np.nansum: 1, np.nanmean: 2, np.nanstd: 3}
+
 
 def ts_rank_unit(
     array_obj: np.ndarray,
@@ -236,4 +241,659 @@ def ts_argsort_unit(
     )
     x = x[:cut] if endwith else x[cut:]
     x = func(x, axis=0, **kwargs) if func is not None else x
-    return x
\ No newline at end of file
+    return x
+
+
+@njit(parallel=True, cache=True)
+def __top_k__(
+    values: np.ndarray,
+    window: int,
+    k: int,
+    largest: bool,
+    how: int,
+    min_periods: int
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Numba kernel of the rolling top-k values.
+
+    For each window, the rows are pushed through a branch-free insertion
+    network of k buffers (one min/max pair per buffer), so a step costs
+    O(window * k) vectorized over the columns, with no sort. NaN enters the
+    network as +inf (-inf for the largest) and is excluded by the count of
+    valid values. `how` selects the output: 0 returns the selection
+    (steps x k x N) laid out as `np.ma.sort` would (NaN for missing values:
+    at the end for the smallest, at the start for the largest); 1, 2 and 3
+    return the sum, mean and standard deviation (steps x 1 x N) accumulated
+    in ascending order, with the masked semantics of numpy.ma (NaN for
+    windows without values, non-finite means and deviations are NaN), and
+    NaN where the window has fewer than `min_periods` valid values.
+
+    ---------------------------------------------------------------------------
+
+    滚动 top-k 值的 Numba 内核。
+
+    每个窗口的各行依次通过由 k 个缓冲区构成的无分支插入网络（每个缓冲区一对
+    min/max），每步代价为 O(window * k) 且按列向量化，无需排序。NaN 以 +inf
+    （最大值时为 -inf）进入网络，并由有效值计数排除。`how` 选择输出：0 返回选取
+    结果（steps x k x N），布局与 `np.ma.sort` 一致（缺失值为 NaN：最小值时位于
+    末尾，最大值时位于开头）；1、2、3 返回按升序累加的和、均值与标准差
+    （steps x 1 x N），语义与 numpy.ma 一致（无值的窗口为 NaN，非有限的均值与
+    标准差为 NaN），窗口内有效值少于 `min_periods` 时为 NaN。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = values.shape
+    steps = max(T - window + 1, 0)
+    out = np.full((steps, k if how == 0 else 1, N), np.nan)
+    fill = -np.inf if largest else np.inf
+    for s in prange(steps):
+        buf = np.full((k, N), fill)
+        count = np.zeros(N, np.int64)
+        x = np.empty(N)
+        for i in range(s, s + window):
+            row = values[i]
+            for n in range(N):
+                v = row[n]
+                valid = not np.isnan(v)
+                count[n] += valid
+                x[n] = v if valid else fill
+            for j in range(k):
+                b = buf[j]
+                if largest:
+                    for n in range(N):
+                        hi = max(b[n], x[n])
+                        x[n] = min(b[n], x[n])
+                        b[n] = hi
+                else:
+                    for n in range(N):
+                        lo = min(b[n], x[n])
+                        x[n] = max(b[n], x[n])
+                        b[n] = lo
+        for n in range(N):
+            m = min(count[n], k)
+            if how == 0:
+                for j in range(m):
+                    if largest:
+                        out[s, k - 1 - j, n] = buf[j, n]
+                    else:
+                        out[s, j, n] = buf[j, n]
+            elif m > 0 and count[n] >= min_periods:
+                total = 0.0
+                for j in range(m):
+                    total += buf[m - 1 - j, n] if largest else buf[j, n]
+                if how == 1:
+                    out[s, 0, n] = total
+                    continue
+                mean = total / m
+                if how == 3:
+                    total = 0.0
+                    for j in range(m):
+                        d = (buf[m - 1 - j, n] if largest else buf[j, n]) - mean
+                        total += d * d
+                    mean = np.sqrt(total / m)
+                if np.isfinite(mean):
+                    out[s, 0, n] = mean
+    return out
+
+
+@njit(parallel=True, cache=True)
+def __ts_rank__(
+    values: np.ndarray,
+    window: int,
+    pct: bool,
+    min_periods: int
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Numba kernel of the rolling time-series rank of the last value: the
+    count of window values not greater than it (0 if it is NaN), divided by
+    the count of non-NaN values if `pct`. Windows without values, or with
+    fewer than `min_periods`, are NaN.
+
+    ---------------------------------------------------------------------------
+
+    最后一个值的滚动时间序列排名的 Numba 内核：窗口内不大于它的值的个数（其为 NaN
+    时为 0），`pct` 时除以非 NaN 值的个数。无值或有效值少于 `min_periods` 的窗口为 NaN。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = values.shape
+    steps = max(T - window + 1, 0)
+    out = np.full((steps, N), np.nan)
+    for s in prange(steps):
+        last = values[s + window - 1]
+        count = np.zeros(N, np.int64)
+        valid = np.zeros(N, np.int64)
+        for i in range(s, s + window):
+            row = values[i]
+            for n in range(N):
+                count[n] += row[n] <= last[n]
+                valid[n] += not np.isnan(row[n])
+        for n in range(N):
+            if valid[n] > 0 and valid[n] >= min_periods:
+                out[s, n] = count[n] / valid[n] if pct else count[n]
+    return out
+
+
+def ts_rank_roll(
+    array_obj: np.ndarray,
+    window: int,
+    cut: Any,
+    pct: bool,
+    func: Optional[Callable],
+    min_periods: int = 0,
+    **kwargs: Any
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Calculates the rolling time-series rank of each column in one pass.
+
+    Equivalent to `ts_rank_unit` applied to every window, without the
+    Python loop over windows.
+
+    ---------------------------------------------------------------------------
+
+    一次计算每列的滚动时间序列排名。
+
+    等价于对每个窗口调用 `ts_rank_unit`，但无需在 Python 中遍历窗口。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    array_obj : np.ndarray
+        The input time-series array (NaN for missing values).
+    window : int
+        The size of the rolling window.
+    cut : Any
+        Placeholder parameter (not used in current implementation).
+    pct : bool
+        If True, return rank as a percentage.
+    func : Optional[Callable]
+        Placeholder parameter (not used in current implementation).
+    min_periods : int, optional
+        Minimum number of valid values in a window. Defaults to 0.
+    **kwargs : Any
+        Additional keyword arguments (not used in current implementation).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    array_obj : np.ndarray
+        输入的时间序列数组（缺失值为 NaN）。
+    window : int
+        滚动窗口的大小。
+    cut : Any
+        占位符参数（当前实现中未使用）。
+    pct : bool
+        如果为 True，则以百分比形式返回排名。
+    func : Optional[Callable]
+        占位符参数（当前实现中未使用）。
+    min_periods : int, optional
+        窗口内有效值的最小个数。默认为 0。
+    **kwargs : Any
+        附加关键字参数（当前实现中未使用）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        An array of ranks, one row per window.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        排名数组，每个窗口一行。
+
+    ---------------------------------------------------------------------------
+    """
+    values = np.ascontiguousarray(np.ma.filled(np.ma.asarray(array_obj, dtype=np.float64), np.nan))
+    return __ts_rank__(values, window, bool(pct), min_periods)
+
+
+def ts_sort_roll(
+    array_obj: np.ndarray,
+    window: int,
+    cut: int,
+    pct: bool,
+    func: Optional[Callable],
+    min_periods: int = 0,
+    **kwargs: Any
+) -> np.ma.MaskedArray:
+    """
+    ===========================================================================
+
+    Calculates the rolling top or bottom 'cut' values of each column in one
+    pass, optionally applying a function.
+
+    Equivalent to `ts_sort_unit` applied to every window. The selection runs
+    in a numba kernel; `np.nansum`, `np.nanmean` and `np.nanstd` are reduced
+    inside the kernel, other functions are applied to each window's
+    selection.
+
+    ---------------------------------------------------------------------------
+
+    一次计算每列滚动窗口内顶部或底部的 'cut' 个值，可选择应用一个函数。
+
+    等价于对每个窗口调用 `ts_sort_unit`。选取在 Numba 内核中完成；`np.nansum`、
+    `np.nanmean` 与 `np.nanstd` 在内核中归约，其他函数应用于每个窗口的选取结果。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    array_obj : np.ndarray
+        The input time-series array (masked or NaN for missing values).
+    window : int
+        The size of the rolling window.
+    cut : int
+        The number of elements to return. Positive for bottom, negative for top.
+    pct : bool
+        Placeholder parameter (not used in current implementation).
+    func : Optional[Callable]
+        An optional function to apply to the selection of each window.
+    min_periods : int, optional
+        Minimum number of valid values in a window, applied to the reductions
+        computed inside the kernel. Defaults to 0.
+    **kwargs : Any
+        Additional keyword arguments for the applied function.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    array_obj : np.ndarray
+        输入的时间序列数组（缺失值被掩码或为 NaN）。
+    window : int
+        滚动窗口的大小。
+    cut : int
+        要返回的元素数量。正数表示底部，负数表示顶部。
+    pct : bool
+        占位符参数（当前实现中未使用）。
+    func : Optional[Callable]
+        应用于每个窗口选取结果的可选函数。
+    min_periods : int, optional
+        窗口内有效值的最小个数，作用于内核中计算的归约。默认为 0。
+    **kwargs : Any
+        应用于函数的附加关键字参数。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ma.MaskedArray
+        The selection (windows x k x N), or the applied function per window
+        (a plain array with NaN for the reductions computed in the kernel).
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ma.MaskedArray
+        选取结果（窗口 x k x N），或每个窗口应用函数后的结果（内核中计算的归约
+        返回以 NaN 表示缺失的普通数组）。
+
+    ---------------------------------------------------------------------------
+    """
+    values = np.ascontiguousarray(np.ma.filled(np.ma.asarray(array_obj, dtype=np.float64), np.nan))
+    k = min(abs(cut), window)
+    how = _TOP_K_FUNCS.get(func, 0) if not kwargs else 0
+    x = __top_k__(values, window, k, cut < 0, how, min_periods)
+    if how:
+        return x[:, 0]
+    x = np.ma.array(x, mask=np.isnan(x))
+    if func is not None:
+        x = np.ma.stack([func(x[i], axis=0, **kwargs) for i in range(x.shape[0])]) if x.shape[0] else x[:, :0]
+    return x
+
+
+@njit(cache=True)
+def __fenwick_add__(
+    tree: np.ndarray,
+    i: int,
+    value: int
+) -> None:
+    """
+    ===========================================================================
+
+    Adds `value` to the count at 1-based position `i` of a Fenwick tree.
+
+    ---------------------------------------------------------------------------
+
+    将 `value` 加到 Fenwick 树中从 1 开始的位置 `i` 的计数上。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    tree : np.ndarray
+        The Fenwick tree, position 0 unused.
+    i : int
+        The 1-based position.
+    value : int
+        The count to add (1 to insert, -1 to remove).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    tree : np.ndarray
+        Fenwick 树，位置 0 不使用。
+    i : int
+        从 1 开始的位置。
+    value : int
+        要加的计数（插入为 1，移除为 -1）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    None
+        `tree` is modified in place.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    None
+        `tree` 被原地修改。
+
+    ---------------------------------------------------------------------------
+    """
+    while i < len(tree):
+        tree[i] += value
+        i += i & (-i)
+
+
+@njit(cache=True)
+def __fenwick_sum__(
+    tree: np.ndarray,
+    i: int
+) -> int:
+    """
+    ===========================================================================
+
+    Returns the total count of 1-based positions 1 to `i` of a Fenwick tree.
+
+    ---------------------------------------------------------------------------
+
+    返回 Fenwick 树中从 1 开始的位置 1 到 `i` 的计数总和。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    tree : np.ndarray
+        The Fenwick tree, position 0 unused.
+    i : int
+        The last 1-based position (0 for an empty prefix).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    tree : np.ndarray
+        Fenwick 树，位置 0 不使用。
+    i : int
+        最后一个从 1 开始的位置（0 表示空前缀）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    int
+        The prefix count.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    int
+        前缀计数。
+
+    ---------------------------------------------------------------------------
+    """
+    total = 0
+    while i > 0:
+        total += tree[i]
+        i -= i & (-i)
+    return total
+
+
+@njit(cache=True)
+def __fenwick_kth__(
+    tree: np.ndarray,
+    k: int
+) -> int:
+    """
+    ===========================================================================
+
+    Returns the smallest 1-based position whose prefix count reaches `k`,
+    i.e. the position of the k-th smallest value held, by descending the
+    tree in powers of two.
+
+    ---------------------------------------------------------------------------
+
+    按二的幂次下降遍历树，返回前缀计数达到 `k` 的最小位置（从 1 开始），即所保存
+    的第 k 小数值的位置。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    tree : np.ndarray
+        The Fenwick tree, position 0 unused.
+    k : int
+        The 1-based order, at most the total count.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    tree : np.ndarray
+        Fenwick 树，位置 0 不使用。
+    k : int
+        从 1 开始的次序，不超过总计数。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    int
+        The 1-based position.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    int
+        从 1 开始的位置。
+
+    ---------------------------------------------------------------------------
+    """
+    i = 0
+    step = 1
+    while step * 2 < len(tree):
+        step *= 2
+    while step > 0:
+        if i + step < len(tree) and tree[i + step] < k:
+            i += step
+            k -= tree[i]
+        step //= 2
+    return i + 1
+
+
+@njit(parallel=True, cache=True)
+def __sorted_window__(
+    values: np.ndarray,
+    window: int,
+    min_periods: int,
+    pct: bool,
+    q: float
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Numba kernel of incremental rolling order statistics.
+
+    `values` is (codes x dates). Each column's values are ranked once
+    (equal values share a rank), and the window is a Fenwick tree of counts
+    over those ranks: a step adds the incoming value and removes the
+    outgoing one, the rank of the last value is a prefix sum and the k-th
+    smallest value a tree descent, all O(log n) instead of a pass over the
+    window. With `q` < 0 the output is the time-series rank of the last
+    value (as `__ts_rank__`), otherwise the `q` quantile with linear
+    interpolation. Windows with fewer than `min_periods` (or no) values are
+    NaN. The output is (windows x codes).
+
+    ---------------------------------------------------------------------------
+
+    增量滚动顺序统计量的 Numba 内核。
+
+    `values` 为（代码 x 日期）。每列的值先排序一次（相等的值共享排名），窗口为
+    以排名为下标的计数 Fenwick 树：每步加入移入的值并删除移出的值，最后一个值的
+    排名为前缀和，第 k 小的值由树下降得到，均为 O(log n)，无需遍历窗口。`q` < 0
+    时输出最后一个值的时间序列排名（同 `__ts_rank__`），否则输出线性插值的 `q`
+    分位数。有效值少于 `min_periods`（或无值）的窗口为 NaN。输出为（窗口 x 代码）。
+
+    ---------------------------------------------------------------------------
+    """
+    N, T = values.shape
+    steps = max(T - window + 1, 0)
+    out = np.full((N, steps), np.nan)
+    for n in prange(N):
+        column = values[n]
+        order = np.argsort(column)
+        ranks = np.zeros(T, np.int64)
+        uniques = np.empty(T)
+        u = 0
+        for t in range(T):
+            v = column[order[t]]
+            if np.isnan(v):
+                break
+            if u == 0 or v != uniques[u - 1]:
+                uniques[u] = v
+                u += 1
+            ranks[order[t]] = u
+        tree = np.zeros(u + 1, np.int64)
+        m = 0
+        for i in range(T):
+            if i >= window and ranks[i - window] > 0:
+                __fenwick_add__(tree, ranks[i - window], -1)
+                m -= 1
+            if ranks[i] > 0:
+                __fenwick_add__(tree, ranks[i], 1)
+                m += 1
+            s = i - window + 1
+            if s < 0 or m == 0 or m < min_periods:
+                continue
+            if q < 0:
+                count = __fenwick_sum__(tree, ranks[i]) if ranks[i] > 0 else 0
+                out[n, s] = count / m if pct else count
+            else:
+                pos = (m - 1) * q
+                lo = int(np.floor(pos))
+                hi = min(lo + 1, m - 1)
+                x = uniques[__fenwick_kth__(tree, lo + 1) - 1]
+                y = uniques[__fenwick_kth__(tree, hi + 1) - 1]
+                out[n, s] = x + (y - x) * (pos - lo)
+    return out
+
+
+def ts_order_roll(
+    array_obj: np.ndarray,
+    window: int,
+    cut: Any,
+    pct: bool,
+    func: Optional[Callable],
+    min_periods: int = 0,
+    q: Optional[float] = None,
+    **kwargs: Any
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Calculates rolling order statistics of each column incrementally.
+
+    The window of each column is kept as a Fenwick tree of counts over the
+    ranks of its values, so the cost per step grows with the log of the
+    number of dates rather than with the window. Suited to long windows
+    (from about 500 days, see `ts_rank`).
+
+    ---------------------------------------------------------------------------
+
+    增量计算每列的滚动顺序统计量。
+
+    每列的窗口以其值排名为下标的计数 Fenwick 树保存，每步代价随日期数的对数
+    增长，而非随窗口长度增长。适用于长窗口（约 500 天起，见 `ts_rank`）。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    array_obj : np.ndarray
+        The input time-series array (NaN for missing values).
+    window : int
+        The size of the rolling window.
+    cut : Any
+        Placeholder parameter (not used in current implementation).
+    pct : bool
+        If True, return the rank as a percentage.
+    func : Optional[Callable]
+        Placeholder parameter (not used in current implementation).
+    min_periods : int, optional
+        Minimum number of valid values in a window. Defaults to 0.
+    q : Optional[float], optional
+        The quantile to return (linear interpolation). Defaults to None (the
+        time-series rank of the last value).
+    **kwargs : Any
+        Additional keyword arguments (not used in current implementation).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    array_obj : np.ndarray
+        输入的时间序列数组（缺失值为 NaN）。
+    window : int
+        滚动窗口的大小。
+    cut : Any
+        占位符参数（当前实现中未使用）。
+    pct : bool
+        如果为 True，则以百分比形式返回排名。
+    func : Optional[Callable]
+        占位符参数（当前实现中未使用）。
+    min_periods : int, optional
+        窗口内有效值的最小个数。默认为 0。
+    q : Optional[float], optional
+        要返回的分位数（线性插值）。默认为 None（最后一个值的时间序列排名）。
+    **kwargs : Any
+        附加关键字参数（当前实现中未使用）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The ranks or quantiles, one row per window.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        排名或分位数，每个窗口一行。
+
+    ---------------------------------------------------------------------------
+    """
+    values = np.ascontiguousarray(np.ma.filled(np.ma.asarray(array_obj, dtype=np.float64), np.nan).T)
+    q = -1.0 if q is None else float(q)
+    return np.ascontiguousarray(__sorted_window__(values, window, min_periods, bool(pct), q).T)
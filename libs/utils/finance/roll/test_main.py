@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 22:46:05 2026
+
+@author: Porco Rosso
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.utils.finance.roll.base import ts_rank_unit, ts_sort_unit
+from libs.utils.finance.roll.main import _rolls
+
+
+def __panel__(seed: int = 0, T: int = 40, N: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.permutation(T * N).reshape(T, N) / (T * N) + rng.integers(-5, 5, (T, N))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:6, 0] = np.nan
+    return pd.DataFrame(values, index=pd.date_range('2020-01-01', periods=T, name='TRADE_DT'), columns=[f'{i:06d}.XSHE' for i in range(N)])
+
+
+def __rolling__(df: pd.DataFrame, window: int, min_periods: int, ts_func, cut, pct, func) -> pd.DataFrame:
+    # the per-window loop the numba kernels replaced, kept as the reference
+    values = df.values
+    values = np.ma.array(values, mask=np.isnan(values)) if func is not None else values
+    outer = [ts_func(values[i - window: i], cut=cut, pct=pct, func=func) for i in range(window, len(df) + 1)]
+    x = np.ma.filled(np.ma.array(np.ma.concatenate(outer).reshape(-1, df.shape[1]), dtype=np.float64), np.nan)
+    x = pd.DataFrame(x, index=df.index[window - 1:], columns=df.columns).reindex(df.index)
+    return x[df.notnull().rolling(window, min_periods=window).sum() >= min_periods]
+
+
+@pytest.mark.parametrize('window, min_periods', [(5, None), (10, 3), (10, 1)])
+@pytest.mark.parametrize('side', ['max', 'min'])
+@pytest.mark.parametrize('count', [1, 3, 12])
+@pytest.mark.parametrize('how', ['mean', 'std', 'sum'])
+def test_top_k_matches_previous(window, min_periods, side, count, how):
+    df = __panel__()
+    rolls = _rolls(df, window, min_periods)
+    cut = count * (-1 if side == 'max' else 1)
+    expected = __rolling__(df, window, rolls.min_periods, ts_sort_unit, cut, False, getattr(np, f'nan{how}'))
+    result = getattr(getattr(rolls, side)(count), how)()
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-12, atol=1e-12, check_names=False)
+
+
+@pytest.mark.parametrize('window, min_periods', [(5, None), (10, 3), (10, 1)])
+@pytest.mark.parametrize('pct', [True, False])
+@pytest.mark.parametrize('method', ['window', 'incremental'])
+def test_ts_rank_matches_previous(window, min_periods, pct, method):
+    df = __panel__()
+    rolls = _rolls(df, window, min_periods)
+    expected = __rolling__(df, window, rolls.min_periods, ts_rank_unit, None, pct, None)
+    result = rolls.ts_rank(pct, method)
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-12, atol=1e-12, check_names=False)
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:24:08 2026
+
+@author: Porco Rosso
+
+"""
+
+from numba import njit, prange
+import numpy as np
+from typing import Optional
+
+# Winsorization methods of the cross-sectional kernels.
+_WINSORIZE = {None: 0, 'mad': 1, 'quantile': 2}
+
+
+@njit(cache=True)
+def __quantile__(
+    sorted_values: np.ndarray,
+    q: float
+) -> float:
+    """
+    ===========================================================================
+
+    Returns the `q` quantile of sorted values, interpolated linearly (the
+    default method of numpy and pandas).
+
+    ---------------------------------------------------------------------------
+
+    返回已排序数值的 `q` 分位数，线性插值（numpy 与 pandas 的默认方法）。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    sorted_values : np.ndarray
+        Non-empty values in ascending order.
+    q : float
+        The quantile, between 0 and 1.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    sorted_values : np.ndarray
+        按升序排列的非空数值。
+    q : float
+        分位数，介于 0 和 1 之间。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    float
+        The quantile.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    float
+        分位数。
+
+    ---------------------------------------------------------------------------
+    """
+    pos = q * (len(sorted_values) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+@njit(cache=True)
+def __winsorize__(
+    values: np.ndarray,
+    method: int,
+    lower: float,
+    upper: float
+) -> None:
+    """
+    ===========================================================================
+
+    Clips sorted values in place, to `median + [lower, upper] * MAD`
+    (method 1) or to their `[lower, upper]` quantiles (method 2).
+
+    ---------------------------------------------------------------------------
+
+    原地截断已排序的数值：截断到 `中位数 + [lower, upper] * MAD`（方法 1）或其
+    `[lower, upper]` 分位数（方法 2）。
+
+    ---------------------------------------------------------------------------
+    """
+    if method == 0 or len(values) == 0:
+        return
+    if method == 1:
+        median = __quantile__(values, 0.5)
+        mad = __quantile__(np.sort(np.abs(values - median)), 0.5)
+        lo, hi = median + lower * mad, median + upper * mad
+    else:
+        lo, hi = __quantile__(values, lower), __quantile__(values, upper)
+    for i in range(len(values)):
+        values[i] = min(max(values[i], lo), hi)
+
+
+@njit(cache=True)
+def __zscore__(values: np.ndarray) -> None:
+    """
+    ===========================================================================
+
+    Standardizes values in place (mean 0, std 1 with ddof=1). Fewer than two
+    values, or values with zero variance, become NaN.
+
+    ---------------------------------------------------------------------------
+
+    原地标准化数值（均值 0，ddof=1 的标准差 1）。少于两个数值或方差为零时结果为
+    NaN。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values, without NaN.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    values : np.ndarray
+        不含 NaN 的数值。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    None
+        `values` is modified in place.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    None
+        `values` 被原地修改。
+
+    ---------------------------------------------------------------------------
+    """
+    n = len(values)
+    if n < 2:
+        values[:] = np.nan
+        return
+    mean = values.mean()
+    std = np.sqrt(((values - mean) ** 2).sum() / (n - 1))
+    if std == 0.0 or not np.isfinite(std):
+        values[:] = np.nan
+        return
+    for i in range(n):
+        values[i] = (values[i] - mean) / std
+
+
+@njit(cache=True)
+def __rank__(
+    values: np.ndarray,
+    pct: bool,
+    ascending: bool
+) -> None:
+    """
+    ===========================================================================
+
+    Replaces sorted values in place by their ranks, ties averaged (the
+    default method of pandas rank), divided by the count if `pct`.
+
+    ---------------------------------------------------------------------------
+
+    原地将已排序的数值替换为其排名，并列取平均（pandas rank 的默认方法），若
+    `pct` 则除以数量。
+
+    ---------------------------------------------------------------------------
+    """
+    n = len(values)
+    if n == 0 or np.isnan(values[0]):
+        return
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1] == values[i]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank = rank if ascending else n + 1 - rank
+        rank = rank / n if pct else rank
+        for m in range(i, j + 1):
+            values[m] = rank
+        i = j + 1
+
+
+@njit(parallel=True, cache=True)
+def __cross_section__(
+    values: np.ndarray,
+    order: np.ndarray,
+    labels: np.ndarray,
+    grouped: bool,
+    method: int,
+    lower: float,
+    upper: float,
+    zscore: bool,
+    rank: bool,
+    pct: bool,
+    ascending: bool
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Row-wise winsorize -> z-score -> rank pipeline, each step optional.
+
+    `order` sorts every row by value (by label, then value if `grouped`;
+    only z-scores need no sorting within the groups).
+    Each row, or each group of a row (label < 0 is missing), is gathered
+    in that order without its NaN into a buffer, so the buffer is sorted
+    and stays sorted through the monotone steps: quantiles and ranks are
+    read off it without sorting again. The result is scattered back;
+    missing entries stay NaN. Rows run in parallel.
+
+    ---------------------------------------------------------------------------
+
+    逐行的截断 -> 标准化 -> 排名流水线，每一步均可选。
+
+    `order` 将每行按数值排序（`grouped` 时先按标签再按数值；仅标准化时分组内无需
+    排序）。每一行或每行的每个
+    分组（标签 < 0 表示缺失）按此顺序去除 NaN 后收集到缓冲区，因此缓冲区有序，并在
+    单调的各步骤中保持有序：分位数与排名直接读取，无需再次排序。结果写回原位置；
+    缺失位置保持 NaN。各行并行执行。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Rows x columns.
+    order : np.ndarray
+        Per-row sort order of the columns, rows x columns.
+    labels : np.ndarray
+        Integer group labels of the same shape, used if `grouped`.
+    grouped : bool
+        Whether to process each group of a row separately.
+    method : int
+        Winsorization method (see `_WINSORIZE`).
+    lower : float
+        Lower winsorization limit.
+    upper : float
+        Upper winsorization limit.
+    zscore : bool
+        Whether to standardize (ddof=1).
+    rank : bool
+        Whether to rank.
+    pct : bool
+        Whether ranks are divided by the count.
+    ascending : bool
+        The rank order.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    values : np.ndarray
+        行 x 列。
+    order : np.ndarray
+        每行各列的排序顺序，行 x 列。
+    labels : np.ndarray
+        相同形状的整数分组标签，`grouped` 时使用。
+    grouped : bool
+        是否对每行的各分组分别处理。
+    method : int
+        截断方法（见 `_WINSORIZE`）。
+    lower : float
+        截断下限。
+    upper : float
+        截断上限。
+    zscore : bool
+        是否标准化（ddof=1）。
+    rank : bool
+        是否排名。
+    pct : bool
+        排名是否除以数量。
+    ascending : bool
+        排名顺序。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The processed values, rows x columns.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        处理后的数值，行 x 列。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = values.shape
+    out = np.full((T, N), np.nan)
+    for t in prange(T):
+        index = np.empty(N, dtype=np.int64)
+        count = 0
+        for n in order[t]:
+            if not np.isnan(values[t, n]) and (not grouped or labels[t, n] >= 0):
+                index[count] = n
+                count += 1
+        buffer = np.empty(count)
+        for m in range(count):
+            buffer[m] = values[t, index[m]]
+        i = 0
+        while i < count:
+            j = i + 1
+            if grouped:
+                while j < count and labels[t, index[j]] == labels[t, index[i]]:
+                    j += 1
+            else:
+                j = count
+            segment = buffer[i:j]
+            __winsorize__(segment, method, lower, upper)
+            if zscore:
+                __zscore__(segment)
+            if rank:
+                __rank__(segment, pct, ascending)
+            i = j
+        for m in range(count):
+            out[t, index[m]] = buffer[m]
+    return out
+
+
+def cross_section(
+    values: np.ndarray,
+    labels: Optional[np.ndarray] = None,
+    winsorize: Optional[str] = None,
+    limits: Optional[tuple] = None,
+    zscore: bool = False,
+    rank: bool = False,
+    pct: bool = True,
+    ascending: bool = True
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Runs the compiled row-wise pipeline of `__cross_section__`.
+
+    ---------------------------------------------------------------------------
+
+    执行 `__cross_section__` 编译的逐行流水线。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Rows x columns.
+    labels : Optional[np.ndarray], optional
+        Integer group labels (negative for missing), by default None.
+    winsorize : Optional[str], optional
+        'mad', 'quantile' or None, by default None.
+    limits : Optional[tuple], optional
+        Winsorization limits, MAD multiples around the median for 'mad'
+        (default (-5, 5)), quantiles for 'quantile' (default (0.01, 0.99)).
+    zscore : bool, optional
+        Whether to standardize, by default False.
+    rank : bool, optional
+        Whether to rank, by default False.
+    pct : bool, optional
+        Whether ranks are percentages, by default True.
+    ascending : bool, optional
+        The rank order, by default True.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    values : np.ndarray
+        行 x 列。
+    labels : Optional[np.ndarray], optional
+        整数分组标签（负数表示缺失），默认为 None。
+    winsorize : Optional[str], optional
+        'mad'、'quantile' 或 None，默认为 None。
+    limits : Optional[tuple], optional
+        截断界限，'mad' 为中位数两侧的 MAD 倍数（默认 (-5, 5)），'quantile' 为分位数
+        （默认 (0.01, 0.99)）。
+    zscore : bool, optional
+        是否标准化，默认为 False。
+    rank : bool, optional
+        是否排名，默认为 False。
+    pct : bool, optional
+        排名是否为百分比，默认为 True。
+    ascending : bool, optional
+        排名顺序，默认为 True。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The processed values, rows x columns.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        处理后的数值，行 x 列。
+
+    ---------------------------------------------------------------------------
+
+    Raises
+    ------
+    ValueError
+        If `winsorize` is not a valid method.
+
+    ---------------------------------------------------------------------------
+
+    引发
+    ------
+    ValueError
+        如果 `winsorize` 不是有效的方法。
+
+    ---------------------------------------------------------------------------
+    """
+    if winsorize not in _WINSORIZE:
+        raise ValueError(f"Invalid value '{winsorize}' for parameter 'winsorize'. Valid values are: {list(_WINSORIZE.keys())}")
+    if limits is None:
+        limits = (0.01, 0.99) if winsorize == 'quantile' else (-5, 5)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if rank or winsorize is not None:
+        order = np.argsort(values, axis=1)
+    else:
+        order = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    grouped = labels is not None
+    if grouped:
+        labels = np.ascontiguousarray(labels, dtype=np.int64)
+        order = np.take_along_axis(order, np.argsort(np.take_along_axis(labels, order, axis=1), axis=1, kind='stable'), axis=1)
+    else:
+        labels = np.zeros((1, 1), dtype=np.int64)
+    return __cross_section__(
+        values, order, labels, grouped, _WINSORIZE[winsorize], float(limits[0]), float(limits[1]),
+        zscore, rank, pct, ascending
+    )
@@ -1,13 +1,29 @@
 # -*- coding: utf-8 -*-
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
-from functools import partial
+from numba import njit, prange
 import scipy as sp
 import pandas as pd
 import statsmodels.api as sm
 from typing import Optional, Union, Tuple, List, Dict, Any, Callable
 
 from libs.utils.functions import flatten_list
+from libs.utils.finance.stats.base import cross_section
+
+# Batched least squares: element budget of the (slices x rows x columns)
+# temporaries per chunk, threads across chunks, and the 1-norm condition
+# number above which a slice is solved by pseudo-inverse (as `__lstsq`)
+# instead of `np.linalg.solve`; below it both agree to ~1e-10.
+_LSTSQ_ELEMENTS: int = 2 ** 22
+_LSTSQ_WORKERS: int = min(4, os.cpu_count() or 1)
+_LSTSQ_COND: float = 1e6
+
+# Rolling neutralization: element budget of the window tensor materialized
+# per chunk of window dates.
+_ROLL_ELEMENTS: int = 2 ** 24
 
 
 def standard(
@@ -74,10 +90,13 @@ def standard(
     """
     axis = 0 if axis is None else axis
     if method == 'gauss':
-        y = df_obj.sub(df_obj.mean(axis=axis), axis=0 if axis or isinstance(df_obj, pd.Series) else 1).div(df_obj.std(axis=axis), axis=0 if axis or isinstance(df_obj, pd.Series) else 1)
+        if isinstance(df_obj, pd.DataFrame):
+            y = __cross_frame__(df_obj, axis, zscore=True)
+        else:
+            y = df_obj.sub(df_obj.mean(axis=axis), axis=0 if axis or isinstance(df_obj, pd.Series) else 1).div(df_obj.std(axis=axis), axis=0 if axis or isinstance(df_obj, pd.Series) else 1)
         y = y.clip(*rank)
     elif method == 'uniform':
-        y = df_obj.rank(pct=True, axis=axis)
+        y = __cross_frame__(df_obj, axis, rank=True) if isinstance(df_obj, pd.DataFrame) else df_obj.rank(pct=True, axis=axis)
         rank = (0 if rank[0] is None else rank[0], 1 if rank[1] is None else rank[1])
         y = y * (rank[1] - rank[0]) + rank[0]
     else:
@@ -85,6 +104,442 @@ def standard(
     return y
 
 
+def __cross_frame__(
+    df_obj: pd.DataFrame,
+    axis: int = 1,
+    group: Optional[Union[pd.DataFrame, pd.Series]] = None,
+    **kwargs: Any
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Runs the compiled cross-sectional pipeline (see `cross_section`) on a
+    DataFrame, row by row if `axis` is 1 or column by column if 0, with the
+    labels of `group` factorized to integer codes.
+
+    ---------------------------------------------------------------------------
+
+    在 DataFrame 上执行编译的横截面流水线（见 `cross_section`）：`axis` 为 1 时
+    逐行，为 0 时逐列；`group` 的标签被编码为整数。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The values.
+    axis : int, optional
+        1 for rows, 0 for columns, by default 1.
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        Group labels, a DataFrame or a Series per date or per column (see
+        `__broadcast__`), by default None.
+    **kwargs : Any
+        Steps of the pipeline, passed to `cross_section`.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        数值。
+    axis : int, optional
+        1 表示逐行，0 表示逐列，默认为 1。
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        分组标签，DataFrame 或按日期、按列的 Series（见 `__broadcast__`），默认为
+        None。
+    **kwargs : Any
+        流水线的步骤，传递给 `cross_section`。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The processed values, shaped like `df_obj`.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        处理后的数值，形状与 `df_obj` 相同。
+
+    ---------------------------------------------------------------------------
+    """
+    values = df_obj.values if axis else df_obj.values.T
+    labels = None
+    if group is not None:
+        labels = pd.factorize(np.broadcast_to(__broadcast__(df_obj, 'group', group), df_obj.shape).ravel())[0].reshape(df_obj.shape)
+        labels = labels if axis else labels.T
+    values = cross_section(values, labels, **kwargs)
+    return pd.DataFrame(values if axis else values.T, index=df_obj.index, columns=df_obj.columns)
+
+
+def rank(
+    df_obj: pd.DataFrame,
+    pct: bool = True,
+    ascending: bool = True,
+    axis: int = 1,
+    group: Optional[Union[pd.DataFrame, pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Ranks a DataFrame along an axis with a compiled kernel, optionally
+    within groups.
+
+    Same results as `DataFrame.rank(axis=axis, pct=pct, ascending=ascending)`
+    (ties averaged, NaN kept), or as a `groupby([date, group]).rank(...)` of
+    the stacked frame if `group` is given; rows run in parallel.
+
+    ---------------------------------------------------------------------------
+
+    使用编译内核沿轴对 DataFrame 排名，可选择在分组内排名。
+
+    结果与 `DataFrame.rank(axis=axis, pct=pct, ascending=ascending)` 相同（并列取
+    平均，保留 NaN）；给定 `group` 时与堆叠后 `groupby([日期, 分组]).rank(...)`
+    相同；各行并行执行。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The input DataFrame.
+    pct : bool, optional
+        Whether to return percentage ranks, by default True.
+    ascending : bool, optional
+        The rank order, by default True.
+    axis : int, optional
+        Axis along which to rank, by default 1.
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        Group labels (e.g. industry codes) per element, or per column or
+        date as a Series, by default None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        输入 DataFrame。
+    pct : bool, optional
+        是否返回百分比排名，默认为 True。
+    ascending : bool, optional
+        排名顺序，默认为 True。
+    axis : int, optional
+        排名的轴，默认为 1。
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        每个元素的分组标签（例如行业代码），或按列、按日期的 Series，默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The ranks.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        排名。
+
+    ---------------------------------------------------------------------------
+    """
+    return __cross_frame__(df_obj, axis, group, rank=True, pct=pct, ascending=ascending)
+
+
+def zscore(
+    df_obj: pd.DataFrame,
+    axis: int = 1,
+    group: Optional[Union[pd.DataFrame, pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Standardizes a DataFrame along an axis (mean 0, std 1 with ddof=1) with
+    a compiled kernel, optionally within groups. A row or group with zero
+    variance is NaN.
+
+    ---------------------------------------------------------------------------
+
+    使用编译内核沿轴标准化 DataFrame（均值 0，ddof=1 的标准差 1），可选择在分组
+    内标准化。方差为零的行或分组为 NaN。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The input DataFrame.
+    axis : int, optional
+        Axis along which to standardize, by default 1.
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        Group labels per element, or per column or date as a Series, by
+        default None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        输入 DataFrame。
+    axis : int, optional
+        标准化的轴，默认为 1。
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        每个元素的分组标签，或按列、按日期的 Series，默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The z-scores.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        标准化分数。
+
+    ---------------------------------------------------------------------------
+    """
+    return __cross_frame__(df_obj, axis, group, zscore=True)
+
+
+def winsorize(
+    df_obj: pd.DataFrame,
+    method: str = 'mad',
+    limits: Optional[Tuple[float, float]] = None,
+    axis: int = 1,
+    group: Optional[Union[pd.DataFrame, pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Winsorizes a DataFrame along an axis with a compiled kernel, optionally
+    within groups.
+
+    'mad' clips to `median + limits * MAD` (raw median absolute deviation,
+    default limits (-5, 5)); 'quantile' clips to the `limits` quantiles
+    (linear interpolation as pandas, default (0.01, 0.99)).
+
+    ---------------------------------------------------------------------------
+
+    使用编译内核沿轴对 DataFrame 去极值，可选择在分组内处理。
+
+    'mad' 截断到 `中位数 + limits * MAD`（原始中位数绝对偏差，默认界限 (-5, 5)）；
+    'quantile' 截断到 `limits` 分位数（与 pandas 相同的线性插值，默认 (0.01, 0.99)）。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The input DataFrame.
+    method : str, optional
+        'mad' or 'quantile', by default 'mad'.
+    limits : Optional[Tuple[float, float]], optional
+        The lower and upper limits, by default None (see above).
+    axis : int, optional
+        Axis along which to winsorize, by default 1.
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        Group labels per element, or per column or date as a Series, by
+        default None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        输入 DataFrame。
+    method : str, optional
+        'mad' 或 'quantile'，默认为 'mad'。
+    limits : Optional[Tuple[float, float]], optional
+        下限与上限，默认为 None（见上文）。
+    axis : int, optional
+        去极值的轴，默认为 1。
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        每个元素的分组标签，或按列、按日期的 Series，默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The winsorized DataFrame.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        去极值后的 DataFrame。
+
+    ---------------------------------------------------------------------------
+
+    Raises
+    ------
+    ValueError
+        If `method` is not 'mad' or 'quantile'.
+
+    ---------------------------------------------------------------------------
+
+    引发
+    ------
+    ValueError
+        如果 `method` 不是 'mad' 或 'quantile'。
+
+    ---------------------------------------------------------------------------
+    """
+    if method not in ['mad', 'quantile']:
+        raise ValueError(f"Invalid value '{method}' for parameter 'method'. Valid values are: ['mad', 'quantile']")
+    return __cross_frame__(df_obj, axis, group, winsorize=method, limits=limits)
+
+
+def pipeline(
+    df_obj: pd.DataFrame,
+    method: Optional[str] = 'mad',
+    limits: Optional[Tuple[float, float]] = None,
+    rank: bool = True,
+    pct: bool = True,
+    ascending: bool = True,
+    axis: int = 1,
+    group: Optional[Union[pd.DataFrame, pd.Series]] = None
+) -> pd.DataFrame:
+    """
+    ===========================================================================
+
+    Winsorizes, standardizes and (optionally) ranks a DataFrame along an
+    axis in one compiled pass, without the intermediate frames.
+
+    Same as `winsorize` (skipped if `method` is None), then `zscore`, then
+    `rank` if `rank` is True.
+
+    ---------------------------------------------------------------------------
+
+    在一次编译执行中沿轴对 DataFrame 去极值、标准化并（可选）排名，不生成中间
+    DataFrame。
+
+    等同于依次执行 `winsorize`（`method` 为 None 时跳过）、`zscore`，以及 `rank`
+    为 True 时的 `rank`。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The input DataFrame.
+    method : Optional[str], optional
+        'mad', 'quantile' or None, by default 'mad'.
+    limits : Optional[Tuple[float, float]], optional
+        Winsorization limits, by default None (see `winsorize`).
+    rank : bool, optional
+        Whether to rank the z-scores, by default True.
+    pct : bool, optional
+        Whether to return percentage ranks, by default True.
+    ascending : bool, optional
+        The rank order, by default True.
+    axis : int, optional
+        Axis along which to operate, by default 1.
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        Group labels per element, or per column or date as a Series, by
+        default None.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        输入 DataFrame。
+    method : Optional[str], optional
+        'mad'、'quantile' 或 None，默认为 'mad'。
+    limits : Optional[Tuple[float, float]], optional
+        去极值界限，默认为 None（见 `winsorize`）。
+    rank : bool, optional
+        是否对标准化分数排名，默认为 True。
+    pct : bool, optional
+        是否返回百分比排名，默认为 True。
+    ascending : bool, optional
+        排名顺序，默认为 True。
+    axis : int, optional
+        操作的轴，默认为 1。
+    group : Optional[Union[pd.DataFrame, pd.Series]], optional
+        每个元素的分组标签，或按列、按日期的 Series，默认为 None。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    pd.DataFrame
+        The processed DataFrame.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    pd.DataFrame
+        处理后的 DataFrame。
+
+    ---------------------------------------------------------------------------
+    """
+    return __cross_frame__(df_obj, axis, group, winsorize=method, limits=limits, zscore=True, rank=rank, pct=pct, ascending=ascending)
+
+
+def __roll_sum__(
+    array: np.ndarray,
+    roll: int
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Returns the sums of every window of `roll` consecutive rows, from one
+    cumulative sum along the first axis.
+
+    ---------------------------------------------------------------------------
+
+    通过沿第一轴的一次累计求和，返回每个连续 `roll` 行窗口的和。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The values, rows first.
+    roll : int
+        The window length.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    array : np.ndarray
+        数值，第一轴为行。
+    roll : int
+        窗口长度。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The window sums, (rows - roll + 1) x the other axes of `array`.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        窗口和，形状为 (行数 - roll + 1) x `array` 的其余轴。
+
+    ---------------------------------------------------------------------------
+    """
+    cumsum = np.concatenate([np.zeros((1,) + array.shape[1:]), np.cumsum(array, axis=0)])
+    return cumsum[roll:] - cumsum[:-roll]
+
+
 def OLS(
     df_obj: pd.DataFrame,
     const: bool = True,
@@ -92,22 +547,29 @@ def OLS(
     min_periods: Optional[int] = None,
     dropna: bool = True,
     keys: Tuple[int, int] = (0, -1),
-    returns: type = dict,
+    returns: type = pd.DataFrame,
     weight: Optional[pd.DataFrame] = None
-) -> Union[Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]:
+) -> Union[Any, Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]:
     """
     ===========================================================================
 
     Performs Ordinary Least Squares (OLS) regression.
 
     This function fits an OLS model, optionally with a constant, rolling window,
-    and weights.
+    and weights. By default (`returns=pd.DataFrame`) all windows are solved
+    at once from cumulative sums of the weighted X'X, X'y and y'y, and the
+    results come back as aligned DataFrames per window; the statsmodels
+    result of one window is fitted only on request with `.fit(key)`.
+    `returns=dict` or `list` fits statsmodels WLS for every window.
 
     ---------------------------------------------------------------------------
 
     执行普通最小二乘 (OLS) 回归。
 
-    此函数拟合 OLS 模型，可选择包含常数项、滚动窗口和权重。
+    此函数拟合 OLS 模型，可选择包含常数项、滚动窗口和权重。默认情况下
+    （`returns=pd.DataFrame`）所有窗口通过加权 X'X、X'y 与 y'y 的累计和一次求解，
+    结果以按窗口对齐的 DataFrame 返回；某个窗口的 statsmodels 结果仅在通过
+    `.fit(key)` 请求时拟合。`returns=dict` 或 `list` 对每个窗口拟合 statsmodels WLS。
 
     ---------------------------------------------------------------------------
 
@@ -124,12 +586,14 @@ def OLS(
         Minimum number of observations in window required to have a value,
         by default None (0).
     dropna : bool, optional
-        If True, drops rows with NaN values before regression, by default True.
+        If True, drops windows with fewer than `min_periods` observations
+        from the results, by default True.
     keys : Tuple[int, int], optional
         Tuple indicating how to get the key for the results dictionary.
         (0 for index, 1 for columns), (index/column position), by default (0, -1).
     returns : type, optional
-        Type of return value (dict or list), by default dict.
+        Type of return value (pd.DataFrame, dict or list), by default
+        pd.DataFrame.
     weight : Optional[pd.DataFrame], optional
         Weights for Weighted Least Squares (WLS), by default None.
 
@@ -146,12 +610,12 @@ def OLS(
     min_periods : Optional[int], optional
         窗口中需要有值的最小观察数，默认为 None (0)。
     dropna : bool, optional
-        如果为 True，则在回归前删除包含 NaN 值的行，默认为 True。
+        如果为 True，则从结果中删除观察数少于 `min_periods` 的窗口，默认为 True。
     keys : Tuple[int, int], optional
         元组，指示如何获取结果字典的键。
         （0 表示索引，1 表示列），（索引/列位置），默认为 (0, -1)。
     returns : type, optional
-        返回值类型（dict 或 list），默认为 dict。
+        返回值类型（pd.DataFrame、dict 或 list），默认为 pd.DataFrame。
     weight : Optional[pd.DataFrame], optional
         加权最小二乘 (WLS) 的权重，默认为 None。
 
@@ -159,15 +623,20 @@ def OLS(
 
     Returns
     -------
-    Union[Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]
-        A dictionary or list of OLS regression results.
+    Union[Any, Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]
+        For pd.DataFrame, a custom object with `params`, `bse` and `tvalues`
+        (windows x regressors), `rsquared`, `resid_std` (square root of the
+        residual mean square) and `nobs` (per window) and `fit(key)`;
+        otherwise a dictionary or list of OLS regression results.
 
     ---------------------------------------------------------------------------
 
     返回
     -------
-    Union[Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]
-        OLS 回归结果的字典或列表。
+    Union[Any, Dict[Any, sm.regression.linear_model.RegressionResultsWrapper], List[sm.regression.linear_model.RegressionResultsWrapper]]
+        pd.DataFrame 时为包含 `params`、`bse` 与 `tvalues`（窗口 x 自变量）、
+        `rsquared`、`resid_std`（残差均方的平方根）与 `nobs`（每个窗口）以及
+        `fit(key)` 的自定义对象；否则为 OLS 回归结果的字典或列表。
 
     ---------------------------------------------------------------------------
     """
@@ -175,19 +644,75 @@ def OLS(
     roll = len(df) if roll is None or roll > len(df) else roll
     min_periods = 0 if min_periods is None else min_periods
     df.insert(1, 'const', 1) if const is True else None
-    dic = {}
+    starts = range(len(df) - roll + 1)
+    key = lambda i: df.index[i: i + roll][keys[1]] if keys[0] == 0 else df.columns[keys[1]]
+    fit = lambda i: sm.WLS(
+        df.iloc[i: i + roll, 0].astype(float), 
+        df.iloc[i: i + roll, 1:].astype(float), 
+        weights=weight.iloc[i: i + roll] if weight is not None else 1.0, 
+        missing='drop'
+    ).fit()
+
+    if returns is pd.DataFrame:
+        values = df.values.astype(np.float64)
+        w = np.ones(len(df)) if weight is None else np.asarray(weight, dtype=np.float64).reshape(len(df))
+        valid = np.isfinite(values).all(axis=1) & np.isfinite(w)
+        w = np.where(valid, w, 0.0)
+        y = np.where(valid, values[:, 0], 0.0)
+        x = np.where(valid[:, np.newaxis], values[:, 1:], 0.0)
+        xw = x * w[:, np.newaxis]
+
+        nobs = __roll_sum__(valid.astype(np.float64), roll)
+        xTx = __roll_sum__(xw[:, :, np.newaxis] * x[:, np.newaxis, :], roll)
+        xTy = __roll_sum__(xw * y[:, np.newaxis], roll)
+        yTy = __roll_sum__(w * y * y, roll)
+        sum_y = __roll_sum__(w * y, roll)
+        sum_w = __roll_sum__(w, roll)
+
+        k = x.shape[1]
+        inv = np.linalg.pinv(xTx, rcond=k * np.finfo(np.float64).eps, hermitian=True)
+        params = (inv @ xTy[..., np.newaxis])[..., 0]
+        ssr = np.maximum(yTy - 2 * np.sum(params * xTy, axis=-1) + np.einsum('ij,ijk,ik->i', params, xTx, params), 0.0)
+        tss = yTy - sum_y ** 2 / np.where(sum_w > 0, sum_w, np.nan) if const is True else yTy
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = np.where(nobs > k, ssr / (nobs - k), np.nan)
+            bse = np.sqrt(np.diagonal(inv, axis1=1, axis2=2) * scale[:, np.newaxis])
+            tvalues = params / bse
+            rsquared = 1 - ssr / tss
+
+        index = pd.Index([key(i) for i in starts], name=df.index.name if keys[0] == 0 else None)
+        empty = (nobs < max(min_periods, 1))
+        params[empty] = np.nan
+        frame = lambda i: pd.DataFrame(i, index=index, columns=df.columns[1:])
+        result = {
+            'params': frame(params), 
+            'bse': frame(np.where(empty[:, np.newaxis], np.nan, bse)), 
+            'tvalues': frame(np.where(empty[:, np.newaxis], np.nan, tvalues)), 
+            'rsquared': pd.Series(np.where(empty, np.nan, rsquared), index=index), 
+            'resid_std': pd.Series(np.where(empty, np.nan, np.sqrt(scale)), index=index), 
+            'nobs': pd.Series(nobs.round().astype(int), index=index)
+        }
+        if dropna:
+            result = {i: j[~empty] for i, j in result.items()}
+
+        class OLSObj:
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+            def fit(self, key):
+                if key not in index:
+                    raise ValueError(f"Invalid value '{key}' for parameter 'key'. Valid values are: window keys in params.index")
+                return fit(index.get_loc(key))
+
+        return OLSObj(**result)
 
-    for i in range(len(df) - roll + 1):
-        y = df.iloc[i: i + roll]
-        w = weight.iloc[i : i + roll] if weight is not None else 1.0
-        key = y.index[keys[1]] if keys[0] == 0 else y.columns[keys[1]]
-        if len(y.dropna()) >= min_periods:
-            dic[key] = sm.WLS(y.iloc[:, 0].astype(float), y.iloc[:,1:].astype(float), weights=w, missing='drop').fit()
+    dic = {}
+    for i in starts:
+        if len(df.iloc[i: i + roll].dropna()) >= min_periods:
+            dic[key(i)] = fit(i)
         elif dropna == False:
-            dic[key] = None
-        if returns is dict:
-            return dic
-    if isinstance(returns, dict):
+            dic[key(i)] = None
+    if returns is dict:
         return dic
     else:
         dic = list(dic.values())
@@ -262,21 +787,29 @@ def const(
 def _array_3D(
     target_df: pd.DataFrame,
     const: bool = True,
-    **kwargs: pd.DataFrame
+    **kwargs: Union[pd.DataFrame, pd.Series]
 ) -> Any:
     """
     ===========================================================================
 
-    Converts DataFrames into a 3D NumPy array for regression analysis.
+    Aligns DataFrames into the design arrays of a regression.
 
-    This function prepares data for multi-variate regression by stacking
-    dependent and independent variables into a 3D array.
+    This function prepares data for multi-variate regression by aligning
+    the dependent and independent variables into one 2D array each,
+    dependent variable first. A Series regressor indexed by dates (e.g. a
+    market return) is kept as a dates x 1 column, one indexed by columns (a
+    per-stock value) as a 1 x columns row and the constant as a 1 x 1
+    array; the solvers broadcast them when building the normal equations,
+    so they are never materialized as a full dates x columns slot.
 
     ---------------------------------------------------------------------------
 
-    将 DataFrame 转换为用于回归分析的 3D NumPy 数组。
+    将 DataFrame 对齐为回归的设计数组。
 
-    此函数通过将因变量和自变量堆叠到 3D 数组中来准备多元回归数据。
+    此函数将因变量和自变量各对齐为一个二维数组来准备多元回归数据，因变量在前。
+    以日期为索引（例如市场收益）的 Series 自变量保留为 日期 x 1 的列，以列为索引
+    （每只股票一个值）的保留为 1 x 列 的行，常数项为 1 x 1 数组；求解器在构建正规
+    方程时对其广播，因此不会生成完整的 日期 x 列 数组。
 
     ---------------------------------------------------------------------------
 
@@ -286,8 +819,8 @@ def _array_3D(
         The dependent variable DataFrame.
     const : bool, optional
         If True, adds a constant array, by default True.
-    **kwargs : pd.DataFrame
-        Independent variable DataFrames.
+    **kwargs : Union[pd.DataFrame, pd.Series]
+        Independent variable DataFrames, or Series per date or per column.
 
     ---------------------------------------------------------------------------
 
@@ -297,66 +830,167 @@ def _array_3D(
         因变量 DataFrame。
     const : bool, optional
         如果为 True，则添加一个常数数组，默认为 True。
-    **kwargs : pd.DataFrame
-        自变量 DataFrame。
+    **kwargs : Union[pd.DataFrame, pd.Series]
+        自变量 DataFrame，或按日期、按列的 Series。
 
     ---------------------------------------------------------------------------
 
     Returns
     -------
     Any
-        A custom object containing the 3D array and metadata.
+        A custom object with the design arrays (`arrays`, each broadcastable
+        to `shape`), their `labels` and the index and columns.
 
     ---------------------------------------------------------------------------
 
     返回
     -------
     Any
-        包含 3D 数组和元数据的自定义对象。
+        包含设计数组（`arrays`，均可广播到 `shape`）、其标签 `labels` 以及索引与
+        列的自定义对象。
+
+    ---------------------------------------------------------------------------
+
+    Raises
+    ------
+    ValueError
+        If a Series regressor is indexed by neither the dates nor the
+        columns of `target_df`.
+
+    ---------------------------------------------------------------------------
+
+    引发
+    ------
+    ValueError
+        如果 Series 自变量的索引既不是 `target_df` 的日期也不是其列。
 
     ---------------------------------------------------------------------------
     """
     target_df = target_df.sort_index(axis=1).sort_index()
     dic = (
         {'target':target_df.values} 
-        | ({'const': np.ones_like(target_df)} if const else {}) 
-        | {i:j.reindex_like(target_df).values for i,j in kwargs.items()}
+        | ({'const': np.ones((1, 1))} if const else {}) 
+        | {i:__broadcast__(target_df, i, j) for i,j in kwargs.items()}
     )
     x = type('array_3D', 
              (), 
              {'index': target_df.index, 
               'columns': target_df.columns, 
               'labels': list(dic.keys()), 
-              'values': np.array(list(dic.values())).transpose(1,2,0)
+              'arrays': list(dic.values()),
+              'shape': target_df.shape
               }
     )
     return x
 
 
-def _array_roll(
-    array_3D: np.ndarray,
-    periods: int,
-    flatten: bool = False
+def __broadcast__(
+    target_df: pd.DataFrame,
+    key: str,
+    obj: Union[pd.DataFrame, pd.Series]
 ) -> np.ndarray:
     """
     ===========================================================================
 
-    Creates a rolling window view of a 3D NumPy array.
+    Aligns a regressor to the dependent variable for `_array_3D`.
 
-    This function generates a view of the input 3D array, where each element
-    is a sub-array representing a rolling window.
+    A DataFrame is reindexed like `target_df`. A Series indexed by the dates
+    is returned as a column (dates x 1) and a Series indexed by the columns
+    as a row (1 x columns), both broadcast by the solvers.
 
     ---------------------------------------------------------------------------
 
-    创建 3D NumPy 数组的滚动窗口视图。
+    为 `_array_3D` 将自变量与因变量对齐。
 
-    此函数生成输入 3D 数组的视图，其中每个元素都是表示滚动窗口的子数组。
+    DataFrame 按 `target_df` 重新索引。以日期为索引的 Series 返回为列（日期 x 1），
+    以列为索引的 Series 返回为行（1 x 列），二者均由求解器广播。
 
     ---------------------------------------------------------------------------
 
     Parameters
     ----------
-    array_3D : np.ndarray
+    target_df : pd.DataFrame
+        The dependent variable DataFrame.
+    key : str
+        The name of the regressor, used in the error message.
+    obj : Union[pd.DataFrame, pd.Series]
+        The regressor.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    target_df : pd.DataFrame
+        因变量 DataFrame。
+    key : str
+        自变量名称，用于错误信息。
+    obj : Union[pd.DataFrame, pd.Series]
+        自变量。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        The aligned values, dates x columns, dates x 1 or 1 x columns.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        对齐后的数值，形状为 日期 x 列、日期 x 1 或 1 x 列。
+
+    ---------------------------------------------------------------------------
+
+    Raises
+    ------
+    ValueError
+        If a Series is indexed by neither the dates nor the columns of
+        `target_df`.
+
+    ---------------------------------------------------------------------------
+
+    引发
+    ------
+    ValueError
+        如果 Series 的索引既不是 `target_df` 的日期也不是其列。
+
+    ---------------------------------------------------------------------------
+    """
+    if isinstance(obj, pd.DataFrame):
+        return obj.reindex_like(target_df).values
+    if target_df.index.isin(obj.index).any():
+        return obj.reindex(target_df.index).values[:, np.newaxis]
+    if target_df.columns.isin(obj.index).any():
+        return obj.reindex(target_df.columns).values[np.newaxis, :]
+    raise ValueError(f"Invalid value for parameter '{key}'. Valid values are: DataFrame, Series indexed by dates or by columns")
+
+
+def _array_roll(
+    array_3D: np.ndarray,
+    periods: int,
+    flatten: bool = False
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Creates a rolling window view of a 3D NumPy array.
+
+    This function generates a view of the input 3D array, where each element
+    is a sub-array representing a rolling window.
+
+    ---------------------------------------------------------------------------
+
+    创建 3D NumPy 数组的滚动窗口视图。
+
+    此函数生成输入 3D 数组的视图，其中每个元素都是表示滚动窗口的子数组。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    array_3D : np.ndarray
         The input 3D NumPy array.
     periods : int
         The size of the rolling window.
@@ -477,46 +1111,179 @@ def __lstsq(
     return params
 
 
+def __lstsq_batch__(
+    arrays: List[np.ndarray],
+    w: Optional[np.ndarray] = None,
+    axes: int = 1
+) -> np.ndarray:
+    """
+    ===========================================================================
+
+    Solves the least squares regressions of a stack of slices at once.
+
+    The variables come as separate arrays broadcastable to one shape, whose
+    last `axes` axes are the observations of a slice. Rows with NaN are
+    zeroed (and weighted 0) instead of dropped, each array in its own shape.
+    The normal equations of the full-shape regressors are built with two
+    batched matrix products; the terms of a broadcast regressor (a date
+    column, a per-stock row, the constant) are summed by `np.einsum` over
+    stride-0 views, so it is never expanded to a full slot. All slices are
+    then solved with `np.linalg.solve`. Slices with too few rows
+    get NaN parameters, as in `__lstsq`; singular or ill-conditioned slices
+    (e.g. a constant with a full set of industry dummies) fall back to a
+    batched pseudo-inverse with the cutoff of `scipy.linalg.pinv`.
+
+    ---------------------------------------------------------------------------
+
+    一次求解一组切片的最小二乘回归。
+
+    各变量为可广播到同一形状的独立数组，最后 `axes` 个轴为切片内的观测。含 NaN
+    的行被置零（权重为 0）而非删除，每个数组按其自身形状处理。完整形状自变量的
+    正规方程通过两次批量矩阵乘积构建；广播自变量（日期列、每只股票的行、常数项）
+    的各项由 `np.einsum` 在步长为 0 的视图上求和，不会展开为完整数组。随后所有
+    切片用 `np.linalg.solve` 求解。行数不足的切片参数为 NaN，与 `__lstsq`
+    一致；奇异或病态的切片（例如常数项与完整的行业虚拟变量）回退到截断阈值与
+    `scipy.linalg.pinv` 相同的批量伪逆。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    arrays : List[np.ndarray]
+        The variables, dependent variable first, each broadcastable to
+        slices x observations.
+    w : Optional[np.ndarray], optional
+        Weights broadcastable to slices x observations, by default None.
+    axes : int, optional
+        The number of trailing observation axes, by default 1.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    arrays : List[np.ndarray]
+        各变量数组，因变量在首位，均可广播到 切片 x 观测。
+    w : Optional[np.ndarray], optional
+        可广播到 切片 x 观测 的权重，默认为 None。
+    axes : int, optional
+        末尾观测轴的数量，默认为 1。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    np.ndarray
+        Array of regression parameters for each slice (slices x regressors).
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    np.ndarray
+        每个切片的回归参数数组（切片 x 自变量）。
+
+    ---------------------------------------------------------------------------
+    """
+    shape = np.broadcast_shapes(*(i.shape for i in arrays))
+    batch = shape[:len(shape) - axes]
+    B, n, k = int(np.prod(batch)), int(np.prod(shape[len(batch):])), len(arrays)
+    valid = np.ones(shape, dtype=bool)
+    for i in arrays:
+        valid &= ~np.isnan(i)
+    rows = valid.reshape(B, n).sum(axis=1)
+    weights = valid.astype(np.float64) if w is None else np.where(valid, w, 0.0)
+    y, *x = [np.where(np.isnan(i), 0.0, i) for i in arrays]
+
+    xTx = np.empty((B, k - 1, k - 1))
+    xTy = np.empty((B, k - 1))
+    dense = [i for i in range(k - 1) if x[i].shape == shape]
+    if dense:
+        x_dense = np.stack([x[i] for i in dense], axis=-1).reshape(B, n, len(dense))
+        xTw = (x_dense * weights.reshape(B, n, 1)).transpose(0, 2, 1)
+        xTx[:, np.array(dense)[:, np.newaxis], dense] = xTw @ x_dense
+        xTy[:, dense] = (xTw @ np.broadcast_to(y, shape).reshape(B, n, 1))[..., 0]
+    subscripts = 'abcdefgh'[:len(shape)]
+    subscripts = f'{subscripts},{subscripts},{subscripts}->{subscripts[:len(batch)]}'
+    term = lambda a, b: np.einsum(subscripts, weights, np.broadcast_to(a, shape), np.broadcast_to(b, shape)).reshape(B)
+    for i in range(k - 1):
+        if i not in dense:
+            xTy[:, i] = term(x[i], y)
+        for j in range(i, k - 1):
+            if i not in dense or j not in dense:
+                xTx[:, i, j] = xTx[:, j, i] = term(x[i], x[j])
+
+    params = np.full((B, k - 1), np.nan)
+    solved = np.flatnonzero((rows > k * 2) & (rows > 2))
+    if not len(solved):
+        return params.reshape(batch + (k - 1,))
+    a = xTx[solved]
+    try:
+        inv = np.linalg.inv(a)
+        cond = np.abs(a).sum(axis=1).max(axis=-1) * np.abs(inv).sum(axis=1).max(axis=-1)
+        singular = ~np.isfinite(cond) | (cond > _LSTSQ_COND)
+    except np.linalg.LinAlgError:
+        singular = np.ones(len(solved), dtype=bool)
+    if (~singular).any():
+        params[solved[~singular]] = np.linalg.solve(a[~singular], xTy[solved[~singular]][..., np.newaxis])[..., 0]
+    singular = solved[singular]
+    finite = np.isfinite(xTx[singular]).all(axis=(1, 2))
+    singular = singular[finite]
+    if len(singular):
+        pinv = np.linalg.pinv(xTx[singular], rcond=(k - 1) * np.finfo(np.float64).eps)
+        params[singular] = (pinv @ xTy[singular][..., np.newaxis])[..., 0]
+    return params.reshape(batch + (k - 1,))
+
+
 def _lstsq(
-    array_3D: np.ndarray,
+    arrays: List[np.ndarray],
     neu_axis: int = 1,
-    w: Optional[np.ndarray] = None
+    w: Optional[np.ndarray] = None,
+    axes: int = 1
 ) -> np.ndarray:
     """
     ===========================================================================
 
-    Applies least squares regression across a 3D array.
+    Applies least squares regression across the design arrays.
 
-    This function iterates through slices of a 3D array and performs least
-    squares regression on each slice.
+    The slices are solved in batches (see `__lstsq_batch__`), in chunks of
+    the first axis sized to bound the temporaries and run in a thread pool
+    (numpy releases the GIL in the matrix products and solvers). An array
+    broadcast along the first axis is passed whole to every chunk.
 
     ---------------------------------------------------------------------------
 
-    对 3D 数组应用最小二乘回归。
+    对设计数组应用最小二乘回归。
 
-    此函数遍历 3D 数组的切片，并对每个切片执行最小二乘回归。
+    切片按批求解（见 `__lstsq_batch__`），沿第一个轴分块，块大小以限制临时数组
+    为准，并在线程池中执行（numpy 在矩阵乘积与求解中释放 GIL）。沿第一个轴广播
+    的数组整体传给每一块。
 
     ---------------------------------------------------------------------------
 
     Parameters
     ----------
-    array_3D : np.ndarray
-        The input 3D array.
+    arrays : List[np.ndarray]
+        The variables, dependent variable first, each broadcastable to
+        slices x observations.
     neu_axis : int, optional
         Axis along which to perform regression (0 or 1), by default 1.
     w : Optional[np.ndarray], optional
         Weights for weighted least squares, by default None.
+    axes : int, optional
+        The number of trailing observation axes, by default 1.
 
     ---------------------------------------------------------------------------
 
     参数
     ----------
-    array_3D : np.ndarray
-        输入的 3D 数组。
+    arrays : List[np.ndarray]
+        各变量数组，因变量在首位，均可广播到 切片 x 观测。
     neu_axis : int, optional
         执行回归的轴（0 或 1），默认为 1。
     w : Optional[np.ndarray], optional
         加权最小二乘的权重，默认为 None。
+    axes : int, optional
+        末尾观测轴的数量，默认为 1。
 
     ---------------------------------------------------------------------------
 
@@ -534,16 +1301,139 @@ def _lstsq(
 
     ---------------------------------------------------------------------------
     """
-    array_3D = array_3D.transpose(1, 0, 2) if neu_axis == 0 else array_3D
-    
-    if w is not None and array_3D.shape[:2] == w.shape:
-        params = np.array(list(map(__lstsq, array_3D, w)))
+    arrays = [i.T for i in arrays] if neu_axis == 0 else arrays
+    shape = np.broadcast_shapes(*(i.shape for i in arrays))
+    w = None if w is None else np.asarray(w, dtype=np.float64)
+    per_slice = w is not None and w.shape == shape
+
+    size = max(1, _LSTSQ_ELEMENTS // max(1, int(np.prod(shape[1:])) * len(arrays)))
+    chunks = [slice(i, i + size) for i in range(0, shape[0], size)]
+    take = lambda a, i: a if a.shape[0] == 1 else a[i]
+    task = lambda i: __lstsq_batch__([take(j, i) for j in arrays], w[i] if per_slice else w, axes)
+    if len(chunks) > 1 and _LSTSQ_WORKERS > 1:
+        with ThreadPoolExecutor(max_workers=_LSTSQ_WORKERS) as pool:
+            params = list(pool.map(task, chunks))
     else:
-        partial_func = partial(__lstsq, w=w)
-        params = np.array(list(map(partial_func, array_3D)))
+        params = [task(i) for i in chunks]
+    params = np.concatenate(params) if params else np.empty((0,) + shape[1:len(shape) - axes] + (len(arrays) - 1,))
     return params
 
 
+def _neutral_roll(
+    arrays: List[np.ndarray],
+    periods: int,
+    neu_axis: int = 1,
+    flatten: bool = False,
+    w: Optional[np.ndarray] = None,
+    resid: bool = True
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    ===========================================================================
+
+    Solves the rolling regressions of `neutral` in chunks of window dates.
+
+    The rolling window view of `_array_roll` is only materialized for a
+    chunk of window end dates at a time, sized by `_ROLL_ELEMENTS`, and the
+    parameters and residuals of each chunk are written into preallocated
+    outputs: float64 parameters and float32 residuals (the residuals hold
+    `periods` values per observation). A per-stock row or the constant is
+    not rolled but broadcast over the windows, and a date column rolls as a
+    column; `_lstsq` solves the windows without expanding either.
+
+    ---------------------------------------------------------------------------
+
+    按窗口日期分块求解 `neutral` 的滚动回归。
+
+    `_array_roll` 的滚动窗口视图每次只为一块窗口结束日期实际生成，块大小由
+    `_ROLL_ELEMENTS` 决定，每块的参数与残差写入预分配的输出：float64 的参数与
+    float32 的残差（残差对每个观测保存 `periods` 个值）。每只股票的行或常数项不
+    滚动而是在窗口上广播，日期列按列滚动；`_lstsq` 求解窗口时均不展开。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    arrays : List[np.ndarray]
+        The variables (see `_array_3D`), dependent variable first, each
+        broadcastable to dates x columns.
+    periods : int
+        The size of the rolling window.
+    neu_axis : int, optional
+        Axis along which to perform regression (0 or 1), by default 1.
+    flatten : bool, optional
+        If True, regresses each flattened window at once, by default False.
+    w : Optional[np.ndarray], optional
+        Weights for weighted least squares, by default None.
+    resid : bool, optional
+        If True, also computes the residuals, by default True.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    arrays : List[np.ndarray]
+        各变量数组（见 `_array_3D`），因变量在首位，均可广播到 日期 x 列。
+    periods : int
+        滚动窗口大小。
+    neu_axis : int, optional
+        执行回归的轴（0 或 1），默认为 1。
+    flatten : bool, optional
+        如果为 True，则对每个展平的窗口整体回归，默认为 False。
+    w : Optional[np.ndarray], optional
+        加权最小二乘的权重，默认为 None。
+    resid : bool, optional
+        如果为 True，则同时计算残差，默认为 True。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    Tuple[np.ndarray, Optional[np.ndarray]]
+        The parameters and the residuals (None if `resid` is False), one row
+        per regression in the order of `neutral`.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    Tuple[np.ndarray, Optional[np.ndarray]]
+        参数与残差（`resid` 为 False 时为 None），每次回归一行，顺序与 `neutral`
+        一致。
+
+    ---------------------------------------------------------------------------
+    """
+    T, N = np.broadcast_shapes(*(i.shape for i in arrays))
+    K = len(arrays)
+    steps = max(T - periods + 1, 0)
+    if flatten:
+        rows, obs, block = 1, periods * N, (periods, N)
+    elif neu_axis == 0:
+        rows, obs, block = N, periods, (N, periods)
+    else:
+        rows, obs, block = periods, N, (periods, N)
+    axes = 2 if flatten else 1
+    w = None if w is None else np.asarray(w, dtype=np.float64)
+    per_slice = w is not None and w.shape == (steps * rows, obs)
+    if w is not None and not per_slice:
+        w = np.broadcast_to(w, (rows, obs)).reshape((1,) + block)
+
+    params = np.empty((steps * rows, K - 1), dtype=np.float64)
+    resid_values = np.empty((steps * rows, obs), dtype=np.float32) if resid else None
+    size = max(1, _ROLL_ELEMENTS // max(1, periods * N * K))
+    for i in range(0, steps, size):
+        j = min(i + size, steps)
+        windows = [a[np.newaxis] if a.shape[0] == 1 else _array_roll(a[i:j + periods - 1, :, np.newaxis], periods)[..., 0] for a in arrays]
+        if neu_axis == 0 and not flatten:
+            windows = [a.transpose(0, 2, 1) for a in windows]
+        chunk = slice(i * rows, j * rows)
+        beta = _lstsq(windows, w=w[chunk].reshape((-1,) + block) if per_slice else w, axes=axes)
+        params[chunk] = beta.reshape(-1, K - 1)
+        if resid:
+            beta = beta.reshape(beta.shape[:-1] + (1,) * axes + (K - 1,))
+            resid_values[chunk] = (windows[0] - sum(windows[m] * beta[..., m - 1] for m in range(1, K))).reshape(-1, obs)
+    return params, resid_values
+
+
 def neutral(
     df_obj: pd.DataFrame,
     const: bool = True,
@@ -552,7 +1442,7 @@ def neutral(
     flatten: bool = False,
     w: Optional[np.ndarray] = None,
     resid: bool = True,
-    **key_dfs: pd.DataFrame
+    **key_dfs: Union[pd.DataFrame, pd.Series]
 ) -> Any:
     """
     ===========================================================================
@@ -587,8 +1477,9 @@ def neutral(
         Weights for weighted regression, by default None.
     resid : bool, optional
         If True, returns residuals; otherwise, returns parameters, by default True.
-    **key_dfs : pd.DataFrame
-        Factor DataFrames for neutralization.
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        Factor DataFrames for neutralization, or Series per date or per
+        column (broadcast, see `_array_3D`).
 
     ---------------------------------------------------------------------------
 
@@ -608,8 +1499,8 @@ def neutral(
         加权回归的权重，默认为 None。
     resid : bool, optional
         如果为 True，则返回残差；否则返回参数，默认为 True。
-    **key_dfs : pd.DataFrame
-        用于中性化的因子 DataFrame。
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        用于中性化的因子 DataFrame，或按日期、按列的 Series（广播，见 `_array_3D`）。
 
     ---------------------------------------------------------------------------
 
@@ -628,30 +1519,27 @@ def neutral(
     ---------------------------------------------------------------------------
     """
     data_obj = _array_3D(df_obj, const, **key_dfs)
-    values = data_obj.values
+    arrays = data_obj.arrays
 
     if periods is not None:
-        values = _array_roll(values, periods, flatten)
-        if len(values.shape) == 4:
-            if neu_axis == 0:
-                values = values.transpose(0, 2, 1, 3)
-                index = pd.MultiIndex.from_product([data_obj.index[periods - 1:], data_obj.columns], names=[df_obj.index.name, df_obj.columns.name])
-            else:
-                index = pd.MultiIndex.from_product([data_obj.index[periods - 1:], range(periods)], names=[df_obj.index.name, 'PERIOD'])
-            values = values.reshape(values.shape[0] * values.shape[1], values.shape[2], values.shape[3])
-        else:
+        if flatten:
             index = data_obj.index[periods - 1:]
+        elif neu_axis == 0:
+            index = pd.MultiIndex.from_product([data_obj.index[periods - 1:], data_obj.columns], names=[df_obj.index.name, df_obj.columns.name])
+        else:
+            index = pd.MultiIndex.from_product([data_obj.index[periods - 1:], range(periods)], names=[df_obj.index.name, 'PERIOD'])
+        parameters, resid_values = _neutral_roll(arrays, periods, neu_axis, flatten, w, resid)
+        parameters = pd.DataFrame(parameters, index=index, columns=data_obj.labels[1:])
     else:
         if neu_axis == 0:
             index = data_obj.columns
             columns = data_obj.index
-            values = values.transpose(1, 0, 2)
+            arrays = [i.T for i in arrays]
         else:
             index = data_obj.index
             columns = data_obj.columns
-
-    parameters = _lstsq(values, w=w)
-    parameters = pd.DataFrame(parameters, index=index, columns=data_obj.labels[1:])
+        parameters = _lstsq(arrays, w=w)
+        parameters = pd.DataFrame(parameters, index=index, columns=data_obj.labels[1:])
 
     class NeutralObj:
         def __init__(self, params, resid=None):
@@ -660,11 +1548,646 @@ def neutral(
 
     if resid:
         if periods is None:
-            resid_values = values[:, :, 0] - np.sum((values[:, :, 1:] * parameters.values[:, np.newaxis, :]), axis=-1)
+            resid_values = arrays[0] - sum(arrays[i] * parameters.values[:, i - 1, np.newaxis] for i in range(1, len(arrays)))
             resid_df = pd.DataFrame(resid_values, index=index, columns=columns)
         else:
-            resid_values = values[:, :, 0].astype(np.float16) - np.sum((values[:, :, 1:].astype(np.float16) * parameters.values[:, np.newaxis, :].astype(np.float16)), axis=-1)
             resid_df = pd.DataFrame(resid_values, index=index)
         return NeutralObj(params=parameters, resid=resid_df)
     else:
-        return NeutralObj(params=parameters)
\ No newline at end of file
+        return NeutralObj(params=parameters)
+
+
+def group_neutral(
+    df_obj: pd.DataFrame,
+    group: Union[pd.DataFrame, pd.Series],
+    w: Optional[Union[pd.DataFrame, pd.Series, np.ndarray]] = None,
+    resid: bool = True,
+    **key_dfs: Union[pd.DataFrame, pd.Series]
+) -> Any:
+    """
+    ===========================================================================
+
+    Performs cross-sectional neutralization against a categorical group
+    (e.g. an industry code panel such as S_SWL1_CODE) and factors.
+
+    Equivalent to `neutral` with one dummy per group in place of the
+    constant, but the dummies are never built: the target and factors are
+    demeaned within each (date, group) with the (weighted) group means
+    (Frisch-Waugh), and only the demeaned factors go through the batched
+    solver. The cost is linear in the number of groups instead of cubic.
+    Rows with a missing group, value or weight, or a non-positive weight,
+    are left out.
+
+    ---------------------------------------------------------------------------
+
+    对分类分组（例如 S_SWL1_CODE 等行业代码面板）与因子执行截面中性化。
+
+    等价于以每个分组一个虚拟变量代替常数项的 `neutral`，但不构建虚拟变量：目标与
+    因子在每个（日期，分组）内减去（加权）组均值（Frisch-Waugh），只有去均值后的
+    因子进入批量求解器。计算量随分组数线性增长，而非立方增长。分组、数值或权重缺失，
+    或权重非正的行不参与回归。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The target DataFrame to be neutralized.
+    group : Union[pd.DataFrame, pd.Series]
+        Group codes per date and column, or a Series of codes per column.
+    w : Optional[Union[pd.DataFrame, pd.Series, np.ndarray]], optional
+        Weights for weighted regression, by default None.
+    resid : bool, optional
+        If True, returns residuals; otherwise, returns parameters and group
+        effects only, by default True.
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        Continuous factor DataFrames, or Series per date or per column
+        (broadcast, see `_array_3D`).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        要中性化的目标 DataFrame。
+    group : Union[pd.DataFrame, pd.Series]
+        每个日期与列的分组代码，或每列一个代码的 Series。
+    w : Optional[Union[pd.DataFrame, pd.Series, np.ndarray]], optional
+        加权回归的权重，默认为 None。
+    resid : bool, optional
+        如果为 True，则返回残差；否则仅返回参数与分组效应，默认为 True。
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        连续因子 DataFrame，或按日期、按列的 Series（广播，见 `_array_3D`）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    Any
+        A custom object with `params` (factor loadings per date), `effects`
+        (the intercept of each group per date, dates x groups) and `resid`.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    Any
+        包含 `params`（每个日期的因子载荷）、`effects`（每个日期各分组的截距，
+        日期 x 分组）与 `resid` 的自定义对象。
+
+    ---------------------------------------------------------------------------
+    """
+    data_obj = _array_3D(df_obj, False, **key_dfs)
+    (T, N), K = data_obj.shape, len(data_obj.arrays)
+    frame = pd.DataFrame(index=data_obj.index, columns=data_obj.columns)
+
+    codes, groups = pd.factorize(np.broadcast_to(__broadcast__(frame, 'group', group), (T, N)).ravel(), sort=True)
+    if w is None:
+        weights = np.ones(T * N)
+    else:
+        weights = __broadcast__(frame, 'w', w) if isinstance(w, (pd.DataFrame, pd.Series)) else w
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), (T, N)).ravel()
+    flat = np.stack([np.broadcast_to(i, (T, N)) for i in data_obj.arrays], axis=-1).reshape(-1, K)
+    valid = (codes >= 0) & np.isfinite(flat).all(axis=-1) & np.isfinite(weights) & (weights > 0)
+
+    # weighted (date, group) means; invalid rows go to the extra last bucket
+    G = len(groups)
+    bucket = np.where(valid, np.repeat(np.arange(T), N) * G + codes, T * G)
+    weights = np.where(valid, weights, 0.0)
+    total = np.bincount(bucket, weights=weights, minlength=T * G + 1)
+    means = np.stack([np.bincount(bucket, weights=weights * np.where(valid, flat[:, i], 0.0), minlength=T * G + 1) for i in range(K)], axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = means / total[:, np.newaxis]
+    means[total == 0] = np.nan
+    demeaned = (flat - means[bucket]).reshape(T, N, K)
+
+    if K > 1:
+        parameters = _lstsq(list(demeaned.transpose(2, 0, 1)), w=weights.reshape(T, N))
+    else:
+        parameters = np.empty((T, 0))
+    means = means[:-1].reshape(T, G, K)
+    effects = means[..., 0] - np.einsum('tgk,tk->tg', means[..., 1:], parameters)
+
+    parameters = pd.DataFrame(parameters, index=data_obj.index, columns=data_obj.labels[1:])
+    effects = pd.DataFrame(effects, index=data_obj.index, columns=pd.Index(groups))
+
+    class NeutralObj:
+        def __init__(self, params, effects, resid=None):
+            self.params = params
+            self.effects = effects
+            self.resid = resid
+
+    if resid:
+        resid_values = demeaned[:, :, 0] - np.einsum('tnk,tk->tn', demeaned[:, :, 1:], parameters.values)
+        resid_df = pd.DataFrame(resid_values, index=data_obj.index, columns=data_obj.columns)
+        return NeutralObj(params=parameters, effects=effects, resid=resid_df)
+    else:
+        return NeutralObj(params=parameters, effects=effects)
+
+
+@njit(cache=True)
+def __finite__(row: np.ndarray) -> bool:
+    """
+    ===========================================================================
+
+    Checks whether every value of an observation row is finite, so the row
+    enters the running sums of `__rolling_ols__`.
+
+    ---------------------------------------------------------------------------
+
+    检查观测行的所有数值是否均为有限值，以决定该行是否计入 `__rolling_ols__` 的
+    滚动累计和。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    row : np.ndarray
+        The dependent variable followed by the regressors of one date.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    row : np.ndarray
+        某一日期的因变量及其后的自变量。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    bool
+        True if no value is NaN or infinite.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    bool
+        如果没有 NaN 或无穷值则为 True。
+
+    ---------------------------------------------------------------------------
+    """
+    for i in range(len(row)):
+        if not np.isfinite(row[i]):
+            return False
+    return True
+
+
+@njit(cache=True)
+def __gather__(
+    full: np.ndarray,
+    dated: np.ndarray,
+    static: np.ndarray,
+    source: np.ndarray,
+    n: int,
+    t: int,
+    row: np.ndarray
+) -> bool:
+    """
+    ===========================================================================
+
+    Gathers the observation of column `n` at date `t` into `row` for
+    `__rolling_ols__`, each variable read from its own array, and checks it
+    with `__finite__`.
+
+    ---------------------------------------------------------------------------
+
+    为 `__rolling_ols__` 将列 `n` 在日期 `t` 的观测收集到 `row` 中，每个变量从其
+    自身的数组读取，并以 `__finite__` 检查。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    full : np.ndarray
+        The full variables, variables x columns x dates.
+    dated : np.ndarray
+        The variables per date, variables x dates.
+    static : np.ndarray
+        The variables per column, variables x columns.
+    source : np.ndarray
+        Per variable, the array (0 full, 1 dated, 2 static) and its position
+        there.
+    n : int
+        The column.
+    t : int
+        The date.
+    row : np.ndarray
+        The output row, dependent variable first.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    full : np.ndarray
+        完整变量，变量 x 列 x 日期。
+    dated : np.ndarray
+        按日期的变量，变量 x 日期。
+    static : np.ndarray
+        按列的变量，变量 x 列。
+    source : np.ndarray
+        每个变量所在的数组（0 完整、1 按日期、2 按列）及其在其中的位置。
+    n : int
+        列。
+    t : int
+        日期。
+    row : np.ndarray
+        输出行，因变量在首位。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    bool
+        True if no value is NaN or infinite.
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    bool
+        如果没有 NaN 或无穷值则为 True。
+
+    ---------------------------------------------------------------------------
+    """
+    for i in range(len(row)):
+        if source[i, 0] == 0:
+            row[i] = full[source[i, 1], n, t]
+        elif source[i, 0] == 1:
+            row[i] = dated[source[i, 1], t]
+        else:
+            row[i] = static[source[i, 1], n]
+    return __finite__(row)
+
+
+@njit(cache=True)
+def __ols_update__(
+    row: np.ndarray,
+    weight: float,
+    xx: np.ndarray,
+    xy: np.ndarray,
+    sums: np.ndarray
+) -> None:
+    """
+    ===========================================================================
+
+    Adds one observation (dependent variable first) to the running sums.
+
+    The weighted X'X (top half of `xx`) and X'y take `weight`; the
+    unweighted X'X (bottom half of `xx`) and `sums` (count, sum of y, y²,
+    x and x*y) take its sign only, so a negative weight removes the
+    observation.
+
+    ---------------------------------------------------------------------------
+
+    将一个观测（因变量在首位）加入滚动累计和。
+
+    加权的 X'X（`xx` 上半部分）与 X'y 使用 `weight`；不加权的 X'X（`xx` 下半部分）
+    与 `sums`（计数、y、y²、x 与 x*y 的和）仅使用其符号，因此负权重即移除该观测。
+
+    ---------------------------------------------------------------------------
+    """
+    k = len(xy)
+    sign = 1.0 if weight > 0 else -1.0
+    y = row[0]
+    sums[0] += sign
+    sums[1] += sign * y
+    sums[2] += sign * y * y
+    for i in range(k):
+        xi = row[i + 1]
+        xy[i] += weight * xi * y
+        sums[3 + i] += sign * xi
+        sums[3 + k + i] += sign * xi * y
+        for j in range(k):
+            xx[i, j] += weight * xi * row[j + 1]
+            xx[k + i, j] += sign * xi * row[j + 1]
+
+
+@njit(parallel=True, cache=True)
+def __rolling_ols__(
+    full: np.ndarray,
+    dated: np.ndarray,
+    static: np.ndarray,
+    source: np.ndarray,
+    periods: int,
+    decay: float,
+    min_periods: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ===========================================================================
+
+    Rolling time-series regressions of every column from running sums.
+
+    For each column the weighted X'X and X'y of the window are updated in
+    O(k²) per date: scaled by `decay`, the new observation added with
+    weight `decay` and the one leaving the window subtracted with weight
+    `decay ** (periods + 1)` (`decay` = 1 for flat windows). The sums are
+    rebuilt from the window every `periods` dates to bound rounding drift.
+    Observations with a non-finite value are skipped and not counted. The
+    small systems are solved by Gaussian elimination; singular windows
+    give NaN. A regressor per date (e.g. a market return) or per column is
+    read from its own 1D row of `dated` or `static` (see `__gather__`)
+    rather than a full columns x dates slot.
+
+    ---------------------------------------------------------------------------
+
+    基于滚动累计和对每一列做时间序列回归。
+
+    每一列窗口的加权 X'X 与 X'y 每个日期以 O(k²) 更新：先乘以 `decay`，新观测以
+    权重 `decay` 加入，移出窗口的观测以权重 `decay ** (periods + 1)` 减去（等权窗口
+    `decay` = 1）。每 `periods` 个日期从窗口重新计算累计和，以限制舍入误差累积。
+    含非有限值的观测被跳过且不计数。小规模方程组以高斯消元求解；奇异窗口结果为 NaN。
+    按日期（例如市场收益）或按列的自变量从 `dated` 或 `static` 中自身的一维行读取
+    （见 `__gather__`），而不是完整的 列 x 日期 数组。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    full : np.ndarray
+        The full variables, variables x columns x dates.
+    dated : np.ndarray
+        The variables per date, variables x dates.
+    static : np.ndarray
+        The variables per column, variables x columns.
+    source : np.ndarray
+        Per variable, dependent variable first, the array (0 full, 1 dated,
+        2 static) and its position there.
+    periods : int
+        The window length.
+    decay : float
+        The per-date weight decay, 1 for equal weights.
+    min_periods : int
+        The minimum number of valid observations in a window.
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    full : np.ndarray
+        完整变量，变量 x 列 x 日期。
+    dated : np.ndarray
+        按日期的变量，变量 x 日期。
+    static : np.ndarray
+        按列的变量，变量 x 列。
+    source : np.ndarray
+        每个变量（因变量在首位）所在的数组（0 完整、1 按日期、2 按列）及其位置。
+    periods : int
+        窗口长度。
+    decay : float
+        每个日期的权重衰减，等权为 1。
+    min_periods : int
+        窗口内有效观测的最小数量。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        Parameters (columns x dates x regressors), the standard deviation of
+        the window residuals and the number of valid observations (columns x
+        dates).
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        参数（列 x 日期 x 自变量）、窗口残差的标准差以及有效观测数量（列 x 日期）。
+
+    ---------------------------------------------------------------------------
+    """
+    N, T = full.shape[1:]
+    K = len(source)
+    k = K - 1
+    params = np.full((N, T, k), np.nan)
+    vol = np.full((N, T), np.nan)
+    nobs = np.zeros((N, T), dtype=np.int64)
+    leave = decay ** (periods + 1)
+    for n in prange(N):
+        xx = np.zeros((2 * k, k))
+        xy = np.zeros(k)
+        sums = np.zeros(3 + 2 * k)
+        a = np.empty((k, k + 1))
+        beta = np.empty(k)
+        row = np.empty(K)
+        for t in range(T):
+            if t % periods == 0:
+                xx[:] = 0.0
+                xy[:] = 0.0
+                sums[:] = 0.0
+                weight = decay
+                for s in range(t, max(0, t - periods + 1) - 1, -1):
+                    if __gather__(full, dated, static, source, n, s, row):
+                        __ols_update__(row, weight, xx, xy, sums)
+                    weight *= decay
+            else:
+                if decay != 1.0:
+                    for i in range(k):
+                        xy[i] *= decay
+                        for j in range(k):
+                            xx[i, j] *= decay
+                if __gather__(full, dated, static, source, n, t, row):
+                    __ols_update__(row, decay, xx, xy, sums)
+                if t >= periods and __gather__(full, dated, static, source, n, t - periods, row):
+                    __ols_update__(row, -leave, xx, xy, sums)
+
+            count = int(round(sums[0]))
+            nobs[n, t] = count
+            if count < min_periods or count <= k:
+                continue
+
+            scale = 0.0
+            for i in range(k):
+                for j in range(k):
+                    a[i, j] = xx[i, j]
+                a[i, k] = xy[i]
+                scale = max(scale, abs(xx[i, i]))
+            singular = scale == 0.0
+            for i in range(k):
+                if singular:
+                    break
+                p = i
+                for j in range(i + 1, k):
+                    if abs(a[j, i]) > abs(a[p, i]):
+                        p = j
+                if abs(a[p, i]) <= scale * 1e-12:
+                    singular = True
+                    break
+                if p != i:
+                    for j in range(k + 1):
+                        a[i, j], a[p, j] = a[p, j], a[i, j]
+                for j in range(i + 1, k):
+                    f = a[j, i] / a[i, i]
+                    for m in range(i, k + 1):
+                        a[j, m] -= f * a[i, m]
+            if singular:
+                continue
+            for i in range(k - 1, -1, -1):
+                b = a[i, k]
+                for j in range(i + 1, k):
+                    b -= a[i, j] * beta[j]
+                beta[i] = b / a[i, i]
+            for i in range(k):
+                params[n, t, i] = beta[i]
+
+            # residuals r = y - x'b of the window: sum r and sum r² from the
+            # unweighted sums, then the sample standard deviation (ddof=1)
+            r1 = sums[1]
+            r2 = sums[2]
+            for i in range(k):
+                r1 -= beta[i] * sums[3 + i]
+                r2 -= 2.0 * beta[i] * sums[3 + k + i]
+                for j in range(k):
+                    r2 += beta[i] * beta[j] * xx[k + i, j]
+            vol[n, t] = np.sqrt(max(r2 - r1 * r1 / count, 0.0) / (count - 1))
+    return params, vol, nobs
+
+
+def rolling_ols(
+    df_obj: pd.DataFrame,
+    periods: int,
+    const: bool = True,
+    half_life: Optional[Union[int, float]] = None,
+    min_periods: Optional[int] = None,
+    **key_dfs: Union[pd.DataFrame, pd.Series]
+) -> Any:
+    """
+    ===========================================================================
+
+    Performs rolling time-series regressions of each column on the factors.
+
+    Equivalent to `neutral(..., neu_axis=0, periods=periods, w=weights)`
+    with flat or half-life weights (the newest date weighted
+    `0.5 ** (1 / half_life)`, each older date one more power), but
+    computed from running sums of X'X and X'y in O(dates x columns x k²)
+    instead of one regression per window. Windows are aligned to the end
+    date; dates before the first full window of `periods` dates, windows
+    with fewer than `min_periods` valid observations, or a singular X'X,
+    give NaN (as in `neutral`).
+
+    ---------------------------------------------------------------------------
+
+    对每一列关于因子做滚动时间序列回归。
+
+    等价于使用等权或半衰期权重（最新日期权重为 `0.5 ** (1 / half_life)`，每早一个
+    日期多一次幂）的 `neutral(..., neu_axis=0, periods=periods, w=weights)`，但通过
+    X'X 与 X'y 的滚动累计和计算，复杂度为 O(日期 x 列 x k²)，而非每个窗口一次回归。
+    窗口以结束日期对齐；第一个完整的 `periods` 日期窗口之前的日期、有效观测少于
+    `min_periods` 或 X'X 奇异的窗口结果为 NaN（与 `neutral` 一致）。
+
+    ---------------------------------------------------------------------------
+
+    Parameters
+    ----------
+    df_obj : pd.DataFrame
+        The dependent variable, dates x columns.
+    periods : int
+        Rolling window size.
+    const : bool, optional
+        If True, includes a constant term in the regression, by default True.
+    half_life : Optional[Union[int, float]], optional
+        Half-life of the exponential weights, by default None (equal weights).
+    min_periods : Optional[int], optional
+        Minimum number of valid observations in a window, by default None
+        (more than twice the number of variables, as in `neutral`).
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        Factor DataFrames (regressors), or Series per date or per column
+        (e.g. a market return, broadcast, see `_array_3D`).
+
+    ---------------------------------------------------------------------------
+
+    参数
+    ----------
+    df_obj : pd.DataFrame
+        因变量，日期 x 列。
+    periods : int
+        滚动窗口大小。
+    const : bool, optional
+        如果为 True，则在回归中包含常数项，默认为 True。
+    half_life : Optional[Union[int, float]], optional
+        指数权重的半衰期，默认为 None（等权）。
+    min_periods : Optional[int], optional
+        窗口内有效观测的最小数量，默认为 None（多于变量数量的两倍，与 `neutral`
+        一致）。
+    **key_dfs : Union[pd.DataFrame, pd.Series]
+        因子 DataFrame（自变量），或按日期、按列的 Series（例如市场收益，广播，见
+        `_array_3D`）。
+
+    ---------------------------------------------------------------------------
+
+    Returns
+    -------
+    Any
+        A custom object with `params` (DataFrame with (regressor, column)
+        columns, e.g. `params['const']`), `resid` (standard deviation of the
+        window residuals, ddof=1) and `nobs` (valid observations per window).
+
+    ---------------------------------------------------------------------------
+
+    返回
+    -------
+    Any
+        包含 `params`（列为 (自变量, 列) 的 DataFrame，例如 `params['const']`）、
+        `resid`（窗口残差的标准差，ddof=1）与 `nobs`（每个窗口的有效观测数）的
+        自定义对象。
+
+    ---------------------------------------------------------------------------
+
+    Raises
+    ------
+    ValueError
+        If `periods` or `half_life` is not positive.
+
+    ---------------------------------------------------------------------------
+
+    引发
+    ------
+    ValueError
+        如果 `periods` 或 `half_life` 不为正数。
+
+    ---------------------------------------------------------------------------
+    """
+    if periods is None or periods < 1:
+        raise ValueError(f"Invalid value '{periods}' for parameter 'periods'. Valid values are: positive integers")
+    if half_life is not None and half_life <= 0:
+        raise ValueError(f"Invalid value '{half_life}' for parameter 'half_life'. Valid values are: None, positive numbers")
+    data_obj = _array_3D(df_obj, const, **key_dfs)
+    labels = data_obj.labels[1:]
+    T, N = data_obj.shape
+    full, dated, static = [], [], []
+    source = np.empty((len(data_obj.arrays), 2), dtype=np.int64)
+    for i, j in enumerate(data_obj.arrays):
+        if j.shape == (T, N):
+            source[i] = 0, len(full)
+            full.append(j.T)
+        elif j.shape[1] == 1:
+            source[i] = 1, len(dated)
+            dated.append(np.broadcast_to(j[:, 0], (T,)))
+        else:
+            source[i] = 2, len(static)
+            static.append(j[0])
+    full = np.ascontiguousarray(np.stack(full), dtype=np.float64)
+    dated = np.array(dated, dtype=np.float64).reshape(-1, T)
+    static = np.array(static, dtype=np.float64).reshape(-1, N)
+    decay = 1.0 if half_life is None else 0.5 ** (1 / half_life)
+    min_periods = max(len(labels) * 2 + 3, 3) if min_periods is None else max(int(min_periods), 1)
+
+    params, vol, nobs = __rolling_ols__(full, dated, static, source, int(periods), decay, min_periods)
+    params[:, :periods - 1] = np.nan
+    vol[:, :periods - 1] = np.nan
+    columns = pd.MultiIndex.from_product([labels, data_obj.columns], names=[None, df_obj.columns.name])
+    params = pd.DataFrame(params.transpose(1, 2, 0).reshape(len(data_obj.index), -1), index=data_obj.index, columns=columns)
+
+    class RollingOLSObj:
+        def __init__(self, params, resid, nobs):
+            self.params = params
+            self.resid = resid
+            self.nobs = nobs
+
+    return RollingOLSObj(
+        params=params,
+        resid=pd.DataFrame(vol.T, index=data_obj.index, columns=data_obj.columns),
+        nobs=pd.DataFrame(nobs.T, index=data_obj.index, columns=data_obj.columns)
+    )
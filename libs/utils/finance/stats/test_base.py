@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 21:05:37 2026
+
+@author: Porco Rosso
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from libs.utils.finance.stats.base import cross_section
+
+
+def __panel__(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((6, 40))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return values
+
+
+def test_zscore_matches_pandas():
+    values = __panel__()
+    df = pd.DataFrame(values)
+    expected = df.sub(df.mean(axis=1), axis=0).div(df.std(axis=1), axis=0)
+    np.testing.assert_allclose(cross_section(values, zscore=True), expected.values, atol=1e-12)
+
+
+def test_zscore_constant_row_only_affects_itself():
+    values = __panel__()
+    expected = cross_section(values, zscore=True)
+    values[2] = 1.5
+    result = cross_section(values, zscore=True)
+    assert np.isnan(result[2]).all()
+    rows = [0, 1, 3, 4, 5]
+    np.testing.assert_array_equal(result[rows], expected[rows])
+
+
+def test_zscore_constant_group_only_affects_itself():
+    values = __panel__()
+    labels = np.tile(np.arange(40) % 4, (6, 1))
+    expected = cross_section(values, labels=labels, zscore=True)
+    values[0, labels[0] == 1] = 2.0
+    result = cross_section(values, labels=labels, zscore=True)
+    assert np.isnan(result[0, labels[0] == 1]).all()
+    mask = np.ones(values.shape, dtype=bool)
+    mask[0, labels[0] == 1] = False
+    np.testing.assert_array_equal(result[mask], expected[mask])
+    assert np.isfinite(result[1:]).sum() == np.isfinite(values[1:]).sum()
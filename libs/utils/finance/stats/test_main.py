@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 22:17:43 2026
+
+@author: Porco Rosso
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.utils.finance.stats import main as stats
+from libs.utils.finance.stats.main import OLS, __lstsq, group_neutral, neutral, rolling_ols
+
+
+def __panel__(seed: int = 0, T: int = 60, N: int = 30) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((T, N))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame(values, index=pd.date_range('2020-01-01', periods=T, name='TRADE_DT'), columns=[f'{i:06d}.XSHE' for i in range(N)])
+
+
+def __repeat__(series: pd.Series, like: pd.DataFrame) -> pd.DataFrame:
+    if series.index.equals(like.index):
+        return pd.DataFrame(np.repeat(series.values[:, np.newaxis], like.shape[1], axis=1), index=like.index, columns=like.columns)
+    return pd.DataFrame(np.repeat(series.values[np.newaxis, :], like.shape[0], axis=0), index=like.index, columns=like.columns)
+
+
+def __industry__(like: pd.DataFrame, groups: int = 4) -> dict:
+    labels = np.arange(like.shape[1]) % groups
+    return {f'ind_{i}': pd.DataFrame(np.tile((labels == i).astype(np.float64), (like.shape[0], 1)), index=like.index, columns=like.columns) for i in range(groups)}
+
+
+def __neutral__(y: pd.DataFrame, const: bool, neu_axis: int, w, **key_dfs) -> np.ndarray:
+    # one __lstsq (pinv of the normal equations) per slice, as neutral ran
+    # before the batched solver
+    arrays = [y.values] + ([np.ones(y.shape)] if const else []) + [i.values for i in key_dfs.values()]
+    arrays = [i.T for i in arrays] if neu_axis == 0 else arrays
+    w = None if w is None else np.broadcast_to(w, arrays[0].shape)
+    return np.array([__lstsq(np.stack([j[i] for j in arrays], axis=1), None if w is None else w[i]) for i in range(arrays[0].shape[0])])
+
+
+def __rolling__(y: pd.DataFrame, periods: int, half_life, min_periods: int, **key_dfs):
+    # a weighted lstsq per (date, column) window, weights halving every
+    # half_life dates back from the window end
+    arrays = np.stack([y.values, np.ones(y.shape)] + [i.values for i in key_dfs.values()], axis=-1)
+    k = arrays.shape[-1] - 1
+    decay = 1.0 if half_life is None else 0.5 ** (1 / half_life)
+    params = np.full(y.shape + (k,), np.nan)
+    vol, nobs = np.full(y.shape, np.nan), np.zeros(y.shape, dtype=np.int64)
+    for t in range(y.shape[0]):
+        window = arrays[max(0, t - periods + 1): t + 1]
+        weight = decay ** np.arange(len(window), 0, -1)
+        for n in range(y.shape[1]):
+            valid = np.isfinite(window[:, n]).all(axis=1)
+            nobs[t, n] = valid.sum()
+            if t < periods - 1 or nobs[t, n] < min_periods or nobs[t, n] <= k:
+                continue
+            yx, root = window[valid, n], np.sqrt(weight[valid])[:, np.newaxis]
+            params[t, n] = np.linalg.lstsq(yx[:, 1:] * root, yx[:, 0] * root[:, 0], rcond=None)[0]
+            vol[t, n] = np.std(yx[:, 0] - yx[:, 1:] @ params[t, n], ddof=1)
+    return params, vol, nobs
+
+
+def __regressors__(y: pd.DataFrame):
+    rng = np.random.default_rng(1)
+    market = pd.Series(rng.standard_normal(len(y.index)), index=y.index)
+    market.iloc[3] = np.nan
+    size = pd.Series(rng.standard_normal(len(y.columns)), index=y.columns)
+    size.iloc[2] = np.nan
+    return market, size
+
+
+@pytest.mark.parametrize('neu_axis, periods, flatten', [(1, None, False), (0, None, False), (0, 5, False), (1, 5, True)])
+def test_neutral_broadcast_matches_repeated(neu_axis, periods, flatten):
+    y, x = __panel__(), __panel__(2)
+    market, size = __regressors__(y)
+    # a date column is collinear with the constant in a cross-section, a
+    # per-stock row in a time series
+    series = {'size': size} if neu_axis == 1 else {'market': market}
+    expected = neutral(y, neu_axis=neu_axis, periods=periods, flatten=flatten, x=x, **{i: __repeat__(j, y) for i, j in series.items()})
+    result = neutral(y, neu_axis=neu_axis, periods=periods, flatten=flatten, x=x, **series)
+    pd.testing.assert_frame_equal(result.params, expected.params, rtol=1e-10, atol=1e-12)
+    pd.testing.assert_frame_equal(result.resid, expected.resid, rtol=1e-6, atol=1e-6)
+
+
+def test_rolling_ols_broadcast_matches_repeated():
+    y = __panel__()
+    market, size = __regressors__(y)
+    # without a constant, the per-stock row takes its place
+    expected = rolling_ols(y, periods=20, const=False, half_life=5, market=__repeat__(market, y), size=__repeat__(size, y))
+    result = rolling_ols(y, periods=20, const=False, half_life=5, market=market, size=size)
+    pd.testing.assert_frame_equal(result.params, expected.params, rtol=1e-10, atol=1e-12)
+    pd.testing.assert_frame_equal(result.resid, expected.resid, rtol=1e-10, atol=1e-12)
+    pd.testing.assert_frame_equal(result.nobs, expected.nobs)
+
+
+@pytest.mark.parametrize('neu_axis, weighted', [(1, None), (1, 'column'), (1, 'panel'), (0, None)])
+@pytest.mark.parametrize('industry', [False, True])
+@pytest.mark.parametrize('chunked', [False, True])
+def test_neutral_matches_per_slice(monkeypatch, neu_axis, weighted, industry, chunked):
+    if chunked:
+        monkeypatch.setattr(stats, '_LSTSQ_ELEMENTS', 500)
+        monkeypatch.setattr(stats, '_LSTSQ_WORKERS', 2)
+    y, x = __panel__(), __panel__(2)
+    rng = np.random.default_rng(3)
+    w = {None: None, 'column': rng.random(y.shape[1]) + 0.5, 'panel': rng.random(y.shape) + 0.5}[weighted]
+    # a constant with a full set of industry dummies is rank deficient
+    key_dfs = dict(x=x, **(__industry__(y) if industry else {}))
+    result = neutral(y, neu_axis=neu_axis, w=w, **key_dfs)
+    expected = __neutral__(y, True, neu_axis, w, **key_dfs)
+    np.testing.assert_allclose(result.params.values, expected, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize('periods, half_life, min_periods', [(20, None, None), (20, 5, None), (12, 3, 9), (7, 2, 4)])
+def test_rolling_ols_matches_per_window(periods, half_life, min_periods):
+    y, x = __panel__(), __panel__(2)
+    market, _ = __regressors__(y)
+    result = rolling_ols(y, periods=periods, half_life=half_life, min_periods=min_periods, market=market, x=x)
+    min_periods = 2 * 3 + 3 if min_periods is None else min_periods
+    params, vol, nobs = __rolling__(y, periods, half_life, min_periods, market=__repeat__(market, y), x=x)
+    for i, j in enumerate(['const', 'market', 'x']):
+        np.testing.assert_allclose(result.params[j].values, params[..., i], rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(result.resid.values, vol, rtol=1e-8, atol=1e-10)
+    np.testing.assert_array_equal(result.nobs.values, nobs)
+
+
+@pytest.mark.parametrize('neu_axis, flatten, weighted', [(1, False, False), (1, False, True), (0, False, False), (1, True, False)])
+@pytest.mark.parametrize('chunked', [False, True])
+def test_neutral_roll_matches_per_window(monkeypatch, neu_axis, flatten, weighted, chunked):
+    if chunked:
+        monkeypatch.setattr(stats, '_ROLL_ELEMENTS', 5000)
+    y, x = __panel__(T=30), __panel__(2, T=30)
+    market, size = __regressors__(y)
+    key_dfs = dict(x=x, **({'size': size} if neu_axis == 1 else {'market': market}))
+    w = np.random.default_rng(3).random(y.shape[1]) + 0.5 if weighted else None
+    periods = 6
+    result = neutral(y, neu_axis=neu_axis, periods=periods, flatten=flatten, w=w, **key_dfs)
+    params, resid = [], []
+    for t in range(periods, len(y) + 1):
+        window = y.iloc[t - periods:t]
+        factors = {i: j.iloc[t - periods:t] if isinstance(j, pd.DataFrame) or j.index.equals(y.index) else j for i, j in key_dfs.items()}
+        if flatten:
+            arrays = [window.values, np.ones(window.shape), factors['x'].values, __repeat__(factors['size'], window).values]
+            params.append(__lstsq(np.stack([i.ravel() for i in arrays], axis=1))[np.newaxis])
+            resid.append((arrays[0] - sum(arrays[i] * params[-1][0, i - 1] for i in range(1, 4))).reshape(1, -1))
+        else:
+            # one neutral per window, as the window loop ran before chunking
+            obj = neutral(window, neu_axis=neu_axis, w=w, **factors)
+            params.append(obj.params.values)
+            resid.append(obj.resid.values)
+    np.testing.assert_allclose(result.params.values, np.concatenate(params), rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(result.resid.values, np.concatenate(resid), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('static', [False, True])
+def test_group_neutral_matches_dummies(weighted, static):
+    y, x = __panel__(), __panel__(2)
+    rng = np.random.default_rng(4)
+    if static:
+        group = pd.Series(np.arange(y.shape[1]) % 4, index=y.columns).astype(float)
+        group.iloc[5] = np.nan
+        labels = __repeat__(group, y)
+    else:
+        group = labels = pd.DataFrame(rng.integers(0, 4, y.shape), index=y.index, columns=y.columns).astype(float).mask(rng.random(y.shape) < 0.05)
+    dummies = {f'ind_{i}': (labels == i).astype(float).mask(labels.isnull()) for i in range(4)}
+    w = pd.DataFrame(rng.random(y.shape) + 0.5, index=y.index, columns=y.columns) if weighted else None
+    result = group_neutral(y, group, w=w, x=x)
+    # a full set of dummies without a constant spans the same space
+    expected = neutral(y, const=False, w=None if w is None else w.values, x=x, **dummies)
+    pd.testing.assert_frame_equal(result.params, expected.params[['x']], rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(result.effects.values, expected.params[list(dummies)].values, rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(result.resid.values, expected.resid.values, rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize('roll, min_periods', [(None, None), (20, None), (20, 12)])
+@pytest.mark.parametrize('const', [True, False])
+@pytest.mark.parametrize('weighted', [False, True])
+def test_ols_matches_statsmodels(roll, min_periods, const, weighted):
+    df = __panel__(N=3, seed=5)
+    df.iloc[10:16, 0] = np.nan
+    weight = pd.Series(np.random.default_rng(6).random(len(df)) + 0.5, index=df.index) if weighted else None
+    result = OLS(df, const=const, roll=roll, min_periods=min_periods, weight=weight)
+    # the per-window statsmodels fits of returns=dict
+    fits = OLS(df, const=const, roll=roll, min_periods=min_periods, weight=weight, returns=dict)
+    assert list(result.params.index) == list(fits)
+    for i in ['params', 'bse', 'tvalues']:
+        expected = pd.DataFrame([getattr(j, i) for j in fits.values()], index=result.params.index)
+        pd.testing.assert_frame_equal(getattr(result, i), expected, rtol=1e-8, atol=1e-10, check_names=False)
+    for i, j in {'rsquared': 'rsquared', 'resid_std': 'scale', 'nobs': 'nobs'}.items():
+        expected = pd.Series([getattr(k, j) for k in fits.values()], index=result.params.index)
+        expected = np.sqrt(expected) if i == 'resid_std' else expected
+        np.testing.assert_allclose(getattr(result, i).values, expected.values, rtol=1e-8, atol=1e-10)
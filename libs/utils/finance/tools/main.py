@@ -7,23 +7,35 @@ Created on Thu Jul 17 11:48:32 2025
 """
 import numpy as np
 import pandas as pd
-from typing import Union, List, Any
+from typing import Union, List, Any, Optional
 
 
-def fillna(df_obj: pd.DataFrame, fill_list: List[Any]) -> pd.DataFrame:
+def fillna(
+    df_obj: pd.DataFrame, 
+    fill_list: List[Any], 
+    limit: Optional[Any] = None
+) -> pd.DataFrame:
     """
     ===========================================================================
 
     Forward fills a DataFrame based on a new index.
 
-    This function extends a DataFrame to a new index, forward-filling existing
-    values to the new index points.
+    Each label of the new index takes the last row of the DataFrame at or
+    before it (an as-of reindex): the positions are found with one
+    `searchsorted` over the sorted index, and the rows are gathered with one
+    `take`. Unsorted inputs and multi-level columns are supported; for
+    duplicated labels the last row is used. Labels before the first row are
+    NaN, promoting integer frames to float; if no label has a row, the
+    result is float64.
 
     ---------------------------------------------------------------------------
 
     根据新索引前向填充 DataFrame。
 
-    此函数将 DataFrame 扩展到新索引，并将现有值前向填充到新索引点。
+    新索引的每个标签取 DataFrame 中不晚于它的最后一行（as-of 重索引）：在排序后的
+    索引上通过一次 `searchsorted` 定位，并通过一次 `take` 取出各行。支持未排序的
+    输入与多层列；重复标签取最后一行。早于第一行的标签为 NaN，整数类型提升为浮点；
+    若所有标签均无对应行，结果为 float64。
 
     ---------------------------------------------------------------------------
 
@@ -33,6 +45,10 @@ def fillna(df_obj: pd.DataFrame, fill_list: List[Any]) -> pd.DataFrame:
         The source DataFrame to be filled.
     fill_list : List[Any]
         A list of new index labels to be included.
+    limit : Optional[Any], optional
+        The maximum staleness, e.g. pd.Timedelta(31, 'D'): labels further than
+        `limit` from the row they would take are NaN. Defaults to None
+        (unlimited).
 
     ---------------------------------------------------------------------------
 
@@ -42,42 +58,43 @@ def fillna(df_obj: pd.DataFrame, fill_list: List[Any]) -> pd.DataFrame:
         需要填充的源 DataFrame。
     fill_list : List[Any]
         需要包含的新索引标签列表。
+    limit : Optional[Any], optional
+        最大陈旧度，例如 pd.Timedelta(31, 'D')：与所取行的距离超过 `limit` 的
+        标签为 NaN。默认为 None（不限）。
 
     ---------------------------------------------------------------------------
 
     Returns
     -------
     pd.DataFrame
-        A new DataFrame with the combined and forward-filled index.
+        A new DataFrame indexed by the sorted new labels, forward-filled.
 
     ---------------------------------------------------------------------------
 
     返回
     -------
     pd.DataFrame
-        一个包含合并和前向填充索引的新 DataFrame。
+        以排序后的新标签为索引、前向填充后的新 DataFrame。
 
     ---------------------------------------------------------------------------
     """
-    df_obj = df_obj.sort_index()
-    old_idx = df_obj.index.to_list()
-    index = sorted(fill_list)
-    if index[-1] >= old_idx[0]:
-        values = df_obj.values
-        lst = []
-        new_idx = sorted(set(df_obj.index) | set(index))
-        position = [new_idx.index(i) for i in old_idx]
-        position.append(len(new_idx))
-        for i, j in enumerate(position[:-1]):
-            repeat = position[i+1] - j
-            array = values[i]
-            array = array.repeat(repeat)
-            lst.append(array.reshape(df_obj.shape[1], -1).T if repeat != 1 else array.reshape(1, -1))
-        lst = np.concatenate(lst)
-        lst = pd.DataFrame(lst, columns=df_obj.columns, index=new_idx[position[0]:]).reindex(index)
+    df_obj = df_obj.sort_index(kind='mergesort')
+    index = pd.Index(fill_list).sort_values()
+    position = df_obj.index.searchsorted(index, side='right') - 1
+    if limit is not None:
+        stale = position >= 0
+        stale[stale] = (index[stale] - df_obj.index[position[stale]]) > limit
+        position[stale] = -1
+    missing = position < 0
+    values = df_obj.values
+    if missing.all():
+        values = np.full((len(index), df_obj.shape[1]), np.nan)
     else:
-        lst = pd.DataFrame(np.nan, index=index, columns=df_obj.columns)
-        
+        values = values.take(np.where(missing, 0, position), axis=0)
+        if missing.any():
+            values = values if values.dtype.kind in 'fc' else values.astype(np.float64 if values.dtype.kind in 'iu' else object)
+            values[missing] = np.nan
+    lst = pd.DataFrame(values, index=index, columns=df_obj.columns)
     lst.index.name = getattr(fill_list, 'name', df_obj.index.name)
     return lst
 
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 21:48:12 2026
+
+@author: Porco Rosso
+
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.utils.finance.tools.main import fillna
+
+
+def __fillna__(df_obj: pd.DataFrame, fill_list: list) -> pd.DataFrame:
+    # the list-based implementation fillna replaced, kept as the reference
+    df_obj = df_obj.sort_index()
+    old_idx = df_obj.index.to_list()
+    index = sorted(fill_list)
+    if index[-1] >= old_idx[0]:
+        values = df_obj.values
+        lst = []
+        new_idx = sorted(set(df_obj.index) | set(index))
+        position = [new_idx.index(i) for i in old_idx]
+        position.append(len(new_idx))
+        for i, j in enumerate(position[:-1]):
+            repeat = position[i+1] - j
+            array = values[i]
+            array = array.repeat(repeat)
+            lst.append(array.reshape(df_obj.shape[1], -1).T if repeat != 1 else array.reshape(1, -1))
+        lst = np.concatenate(lst)
+        lst = pd.DataFrame(lst, columns=df_obj.columns, index=new_idx[position[0]:]).reindex(index)
+    else:
+        lst = pd.DataFrame(np.nan, index=index, columns=df_obj.columns)
+    lst.index.name = getattr(fill_list, 'name', df_obj.index.name)
+    return lst
+
+
+def __source__(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-01', periods=120, freq='7D', name='REPORT_PERIOD')
+    values = rng.standard_normal((len(dates), 6))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return pd.DataFrame(values, index=dates, columns=[f'{i:06d}.XSHE' for i in range(6)])
+
+
+TARGETS = {
+    'daily': pd.date_range('2019-12-01', '2022-06-30', name='TRADE_DT'),
+    'short': pd.date_range('2020-03-01', periods=10, name='TRADE_DT'),
+    'before': pd.date_range('2019-01-01', periods=10, name='TRADE_DT'),
+    'list': list(pd.to_datetime(['2021-05-07', '2020-02-03', '2020-01-01', '2022-01-04'])),
+}
+
+
+@pytest.mark.parametrize('target', TARGETS.keys())
+def test_fillna_matches_previous(target):
+    df = __source__()
+    pd.testing.assert_frame_equal(fillna(df, TARGETS[target]), __fillna__(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('target', TARGETS.keys())
+def test_fillna_unsorted_input(target):
+    df = __source__()
+    shuffled = df.sample(frac=1, random_state=1)
+    pd.testing.assert_frame_equal(fillna(shuffled, TARGETS[target]), __fillna__(shuffled, TARGETS[target]), check_freq=False)
+    pd.testing.assert_frame_equal(fillna(shuffled, TARGETS[target][::-1]), fillna(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('target', TARGETS.keys())
+def test_fillna_duplicate_dates(target):
+    df = __source__()
+    df = pd.concat([df, df.iloc[::10] + 100]).sort_index(kind='mergesort')
+    pd.testing.assert_frame_equal(fillna(df, TARGETS[target]), __fillna__(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('target', TARGETS.keys())
+def test_fillna_multiindex_columns(target):
+    df = __source__()
+    df = pd.concat({'open': df, 'close': df * 2}, axis=1)
+    pd.testing.assert_frame_equal(fillna(df, TARGETS[target]), __fillna__(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('target', TARGETS.keys())
+def test_fillna_int_promotion(target):
+    df = (__source__().fillna(0) * 100).astype('int64')
+    pd.testing.assert_frame_equal(fillna(df, TARGETS[target]), __fillna__(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('target', ['before', 'short'])
+def test_fillna_bool_dtype(target):
+    df = __source__() > 0
+    pd.testing.assert_frame_equal(fillna(df, TARGETS[target]), __fillna__(df, TARGETS[target]), check_freq=False)
+
+
+@pytest.mark.parametrize('limit', [pd.Timedelta(3, 'D'), pd.Timedelta(31, 'D')])
+def test_fillna_limit(limit):
+    df = __source__().drop(pd.date_range('2020-06-03', periods=10, freq='7D'))
+    target = TARGETS['daily']
+    expected = df.reindex(target, method='ffill', tolerance=limit)
+    pd.testing.assert_frame_equal(fillna(df, target, limit=limit), expected, check_freq=False)
+    unlimited = fillna(df, target)
+    kept = fillna(df, target, limit=limit).notnull()
+    pd.testing.assert_frame_equal(unlimited[kept], fillna(df, target, limit=limit), check_freq=False)
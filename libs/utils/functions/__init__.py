@@ -8,5 +8,6 @@ from libs.utils.functions.__base_utils__ import (
 
 from libs.utils.functions.main import (
     
-    timing_decorator
+    timing_decorator, 
+    dtype_decorator
 )
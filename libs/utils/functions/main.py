@@ -9,6 +9,9 @@ from typing import Optional, Dict, Any, List, Tuple
 from functools import wraps
 import time
 
+import numpy as np
+import pandas as pd
+
 
 def timing_decorator(
     schema: Optional[str] = None, 
@@ -72,3 +75,176 @@ def timing_decorator(
                 return func(*args, **kwargs)
         return wrapper
     return decorator
+
+
+def __narrow__(obj: Any) -> Optional[np.dtype]:
+    """
+    ===========================================================================
+
+    Returns the narrowest float dtype of a pandas object or array if it is
+    narrower than float64, None otherwise.
+
+    ---------------------------------------------------------------------------
+
+    若 pandas 对象或数组中最窄的浮点类型窄于 float64，则返回该类型，否则返回 None。
+
+    ---------------------------------------------------------------------------
+    """
+    if isinstance(obj, pd.DataFrame):
+        dtypes = set(obj.dtypes.values)
+    elif isinstance(obj, (pd.Series, np.ndarray)):
+        dtypes = {obj.dtype}
+    else:
+        return None
+    dtypes = [np.dtype(i) for i in dtypes if isinstance(i, np.dtype) and np.issubdtype(i, np.floating)]
+    dtypes = [i for i in dtypes if i.itemsize < 8]
+    return min(dtypes, key=lambda i: i.itemsize) if len(dtypes) else None
+
+
+def __astype__(obj: Any, dtype: Any) -> Any:
+    """
+    ===========================================================================
+
+    Casts the float parts of pandas objects and arrays, also inside dicts,
+    lists and tuples, to the given dtype. Other dtypes are left unchanged.
+
+    ---------------------------------------------------------------------------
+
+    将 pandas 对象与数组（包括字典、列表和元组中的对象）的浮点部分转换为指定类型，
+    其他类型保持不变。
+
+    ---------------------------------------------------------------------------
+    """
+    dtype = np.dtype(dtype)
+    if isinstance(obj, pd.DataFrame):
+        floats = [np.issubdtype(i, np.floating) if isinstance(i, np.dtype) else False for i in obj.dtypes.values]
+        if all(floats):
+            return obj if (obj.dtypes == dtype).all() else obj.astype(dtype)
+        if not any(floats):
+            return obj
+        return obj.astype({i: dtype for i, j in zip(obj.columns, floats) if j})
+    if isinstance(obj, (pd.Series, np.ndarray)):
+        if isinstance(obj.dtype, np.dtype) and np.issubdtype(obj.dtype, np.floating) and obj.dtype != dtype:
+            return obj.astype(dtype)
+        return obj
+    if isinstance(obj, dict):
+        return {i: __astype__(j, dtype) for i, j in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)([__astype__(i, dtype) for i in obj])
+    return obj
+
+
+class __dtype_proxy__():
+    """
+    ===========================================================================
+
+    Wraps a lazy result object (e.g. a rolling object) so that the pandas
+    results of its methods are cast back to the dtype of the input.
+
+    ---------------------------------------------------------------------------
+
+    包装惰性结果对象（例如滚动对象），使其方法返回的 pandas 结果转换回输入的类型。
+
+    ---------------------------------------------------------------------------
+    """
+    def __init__(self, obj: Any, dtype: np.dtype):
+        self._obj = obj
+        self._dtype = dtype
+
+    def __restore__(self, result: Any) -> Any:
+        if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray, dict, list, tuple)):
+            return __astype__(result, self._dtype)
+        if result is None or isinstance(result, (int, float, str, bool, np.generic)):
+            return result
+        return __dtype_proxy__(result, self._dtype)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._obj, name)
+        if not callable(attr):
+            return self.__restore__(attr)
+
+        @wraps(attr)
+        def wrapper(*args: Any, **kwargs: Any):
+            return self.__restore__(attr(*args, **kwargs))
+        return wrapper
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.__restore__(self._obj(*args, **kwargs))
+
+
+def dtype_decorator(policy: Any):
+    """
+    ===========================================================================
+
+    A decorator for accessor methods that controls compact float dtypes.
+
+    When the accessor object or any pandas argument holds floats narrower
+    than float64 (e.g. float32 panels), the inputs are upcast to
+    ``policy.compute`` for the computation, and the results are cast back to
+    the narrow dtype if ``policy.preserve`` is True. Lazy results (e.g.
+    rolling objects) are wrapped, so that their results are cast back as
+    well. If ``policy.check`` is True, the returned result is compared
+    against the result computed from float64 inputs, and a warning is
+    printed when the largest relative difference exceeds
+    ``policy.tolerance``.
+
+    Parameters
+    ----------
+    policy : Any
+        A configuration class with the attributes compute, preserve, check
+        and tolerance.
+
+    ---------------------------------------------------------------------------
+
+    控制紧凑浮点类型的访问器方法装饰器。
+
+    当访问器对象或任一 pandas 参数包含窄于 float64 的浮点数（例如 float32 面板）时，
+    输入先提升为 ``policy.compute`` 进行计算，若 ``policy.preserve`` 为 True，结果再
+    转换回该窄类型。惰性结果（例如滚动对象）会被包装，其结果同样转换回窄类型。
+    若 ``policy.check`` 为 True，返回结果会与以 float64 输入计算的结果比较，
+    当最大相对差异超过 ``policy.tolerance`` 时打印警告。
+
+    参数
+    ----------
+    policy : Any
+        包含 compute、preserve、check 和 tolerance 属性的配置类。
+
+    ---------------------------------------------------------------------------
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(
+            self: Any, 
+            *args: Any, 
+            **kwargs: Any
+        ):
+            narrow = [__narrow__(i) for i in (self._obj, *args, *kwargs.values())]
+            narrow = [i for i in narrow if i is not None]
+            if not len(narrow):
+                return func(self, *args, **kwargs)
+            narrow = min(narrow, key=lambda i: i.itemsize)
+            
+            def run(dtype):
+                obj = self._obj
+                self._obj = __astype__(obj, dtype)
+                try:
+                    return func(self, *__astype__(list(args), dtype), **__astype__(kwargs, dtype))
+                finally:
+                    self._obj = obj
+            
+            result = run(policy.compute)
+            if policy.preserve and not isinstance(result, (pd.DataFrame, pd.Series, np.ndarray, dict, list, tuple)):
+                if result is None or isinstance(result, (int, float, str, bool, np.generic)):
+                    return result
+                return __dtype_proxy__(result, narrow)
+            output = __astype__(result, narrow) if policy.preserve else result
+            if policy.check and isinstance(output, (pd.DataFrame, pd.Series)):
+                reference = result if np.dtype(policy.compute) == np.float64 else run(np.float64)
+                diff = (output.astype(np.float64) - reference).abs() / reference.abs().clip(lower=np.finfo(np.float64).tiny)
+                diff = np.asarray(diff, dtype=np.float64)
+                diff = np.nanmax(diff) if diff.size and not np.isnan(diff).all() else 0.0
+                if diff > policy.tolerance:
+                    print(f"WARNING: RELATIVE ERROR {diff:.3e} AGAINST FLOAT64 ON <{func.__qualname__}>")
+            return output
+        return wrapper
+    return decorator
@@ -0,0 +1,709 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:02:41 2026
+
+@author: Porco Rosso
+"""
+
+import operator
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from libs.__pandas__.config import ANALYSIS, BUILD, ROLLS, STATS
+
+
+_AXES: 'OrderedDict[Tuple, pd.Index]' = OrderedDict()
+_AXES_SIZE: int = 256
+
+
+def __intern__(
+    index: Any
+) -> pd.Index:
+    """
+    ===========================================================================
+
+    Returns the shared instance of an axis.
+
+    Equal axes are interned to one `pd.Index` object, so panels built from
+    the same dates or codes can be aligned with an identity check.
+
+    Parameters
+    ----------
+    index : Any
+        The axis values.
+
+    Returns
+    -------
+    pd.Index
+        The shared axis.
+
+    ---------------------------------------------------------------------------
+
+    返回轴的共享实例。
+
+    相等的轴被驻留为同一个 `pd.Index` 对象，由相同日期或代码构建的面板
+    只需身份比较即可对齐。
+
+    参数
+    ----------
+    index : Any
+        轴的取值。
+
+    返回
+    -------
+    pd.Index
+        共享的轴。
+
+    ---------------------------------------------------------------------------
+    """
+    index = index if isinstance(index, pd.Index) else pd.Index(index)
+    if isinstance(index, pd.MultiIndex):
+        return index
+    values = index.values
+    digest = hash(values.tobytes()) if values.dtype.kind in 'biufmM' else hash(tuple(values))
+    key = (index.name, str(index.dtype), len(index), digest)
+    shared = _AXES.get(key)
+    if shared is not None and shared.equals(index):
+        _AXES.move_to_end(key)
+        return shared
+    _AXES[key] = index
+    while len(_AXES) > _AXES_SIZE:
+        _AXES.popitem(last=False)
+    return index
+
+
+class _accessor():
+    """
+    ===========================================================================
+
+    Runs a pandas accessor of a panel on a zero-copy frame view.
+
+    Panel arguments are converted to frames, and frame results with the
+    panel's axes come back as panels sharing those axes. Intermediate
+    objects (e.g. a rolling window) are wrapped again, so chained calls
+    such as `panel.rollings(10).min(2).mean()` return panels.
+
+    This is a convenience wrapper, not a separate fast path: the work is
+    done by the same code as for a DataFrame (e.g. the compiled kernels
+    behind `stats.zscore` or `rollings(...).ts_rank`), and the panel only adds
+    the frame view and the re-wrapping of the result.
+
+    ---------------------------------------------------------------------------
+
+    在零拷贝的 DataFrame 视图上运行面板的 pandas 访问器。
+
+    面板参数被转换为 DataFrame，轴与面板一致的结果以共享轴的面板返回。中间对象
+    （例如滚动窗口）会被再次包装，因此 `panel.rollings(10).min(2).mean()` 之类的
+    链式调用返回面板。
+
+    这是便捷包装而非独立的快速路径：计算由与 DataFrame 相同的代码完成（例如
+    `stats.zscore` 或 `rollings(...).ts_rank` 背后的编译内核），面板仅增加 DataFrame
+    视图与结果的重新包装。
+
+    ---------------------------------------------------------------------------
+    """
+    def __init__(
+        self,
+        panel: 'main',
+        obj: Any
+    ):
+        self._panel = panel
+        self._obj = obj
+
+    def __wrap__(
+        self,
+        obj: Any
+    ) -> Any:
+        if isinstance(obj, pd.DataFrame):
+            return self._panel.__like__(obj)
+        if isinstance(obj, (pd.Series, pd.Index, np.ndarray, dict, list, tuple, str, bytes, int, float, bool, type(None))):
+            return obj
+        if callable(obj) or hasattr(obj, '__dict__'):
+            return _accessor(self._panel, obj)
+        return obj
+
+    def __call__(
+        self,
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        args = [i.to_frame() if isinstance(i, main) else i for i in args]
+        kwargs = {i: (j.to_frame() if isinstance(j, main) else j) for i,j in kwargs.items()}
+        return self.__wrap__(self._obj(*args, **kwargs))
+
+    def __getattr__(
+        self,
+        name: str
+    ) -> Any:
+        return self.__wrap__(getattr(self._obj, name))
+
+
+class main():
+    """
+    ===========================================================================
+
+    Dense panel of (TRADE_DT x S_INFO_WINDCODE) data.
+
+    The data is one contiguous ndarray: 2D (dates x codes) or 3D
+    (fields x dates x codes), with shared interned date and code axes and an
+    optional validity mask. Panels with identical axes align at no cost;
+    others are aligned once with `get_indexer` and `take`. `to_frame`
+    returns a zero-copy DataFrame view of a 2D panel, and the 'rollings',
+    'stats', 'build' and 'analysis' accessors run on that view and return
+    panels (convenience wrappers, see `_accessor`).
+
+    ---------------------------------------------------------------------------
+
+    (TRADE_DT x S_INFO_WINDCODE) 数据的稠密面板。
+
+    数据为一个连续的 ndarray：二维（日期 x 代码）或三维（字段 x 日期 x 代码），
+    附带共享驻留的日期轴与代码轴以及可选的有效性掩码。轴相同的面板无需代价即可
+    对齐，其余面板通过一次 `get_indexer` 与 `take` 对齐。`to_frame` 返回二维面板的
+    零拷贝 DataFrame 视图，'rollings'、'stats'、'build' 与 'analysis' 访问器在该
+    视图上运行并返回面板（便捷包装，见 `_accessor`）。
+
+    ---------------------------------------------------------------------------
+    """
+    def __init__(
+        self,
+        values: np.ndarray,
+        dates: Any,
+        codes: Any,
+        fields: Optional[Any] = None,
+        mask: Optional[np.ndarray] = None
+    ):
+        """
+        ===========================================================================
+
+        Initializes the panel.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            2D (dates x codes) or 3D (fields x dates x codes) data.
+        dates : Any
+            The date axis.
+        codes : Any
+            The code axis.
+        fields : Optional[Any], optional
+            The field axis of 3D data. Defaults to None.
+        mask : Optional[np.ndarray], optional
+            Boolean (dates x codes) validity mask. Defaults to None (all valid).
+
+        Raises
+        -------
+        ValueError
+            If the shapes of the data, the axes or the mask do not match.
+
+        ---------------------------------------------------------------------------
+
+        初始化面板。
+
+        参数
+        ----------
+        values : np.ndarray
+            二维（日期 x 代码）或三维（字段 x 日期 x 代码）数据。
+        dates : Any
+            日期轴。
+        codes : Any
+            代码轴。
+        fields : Optional[Any], optional
+            三维数据的字段轴。默认为 None。
+        mask : Optional[np.ndarray], optional
+            布尔型（日期 x 代码）有效性掩码。默认为 None（全部有效）。
+
+        引发
+        -------
+        ValueError
+            如果数据、轴或掩码的形状不匹配。
+
+        ---------------------------------------------------------------------------
+        """
+        values = np.ascontiguousarray(values)
+        self.dates = __intern__(dates)
+        self.codes = __intern__(codes)
+        self.fields = None if fields is None else __intern__(fields)
+        shape = (len(self.dates), len(self.codes))
+        if self.fields is not None:
+            shape = (len(self.fields),) + shape
+        if values.shape != shape:
+            raise ValueError(f"Invalid shape '{values.shape}' for parameter 'values'. Valid shape is: {shape}")
+        if mask is not None:
+            mask = np.ascontiguousarray(mask, dtype=bool)
+            if mask.shape != shape[-2:]:
+                raise ValueError(f"Invalid shape '{mask.shape}' for parameter 'mask'. Valid shape is: {shape[-2:]}")
+        self.values = values
+        self.mask = mask
+
+    @classmethod
+    def from_frame(
+        cls,
+        obj: Union[pd.DataFrame, pd.Series, Dict[Any, Any]],
+        mask: Optional[np.ndarray] = None
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Builds a panel from a wide DataFrame, a (date, code) Series, a frame
+        with (field, code) columns, or a dict of frames keyed by field.
+
+        Parameters
+        ----------
+        obj : Union[pd.DataFrame, pd.Series, Dict[Any, Any]]
+            The data to convert. Nested dicts and frames with (field, code)
+            columns are flattened into fields.
+        mask : Optional[np.ndarray], optional
+            Boolean validity mask. Defaults to None.
+
+        Returns
+        -------
+        main
+            The panel. A plain wide frame is not copied.
+
+        ---------------------------------------------------------------------------
+
+        由宽表 DataFrame、(日期, 代码) Series、(字段, 代码) 列的 DataFrame 或以字段
+        为键的 DataFrame 字典构建面板。
+
+        参数
+        ----------
+        obj : Union[pd.DataFrame, pd.Series, Dict[Any, Any]]
+            待转换数据。嵌套字典与 (字段, 代码) 列的 DataFrame 被展开为字段。
+        mask : Optional[np.ndarray], optional
+            布尔型有效性掩码。默认为 None。
+
+        返回
+        -------
+        main
+            面板。普通宽表不会被复制。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(obj, main):
+            return obj
+        if isinstance(obj, pd.Series):
+            obj = obj.unstack() if isinstance(obj.index, pd.MultiIndex) else obj.to_frame()
+        if isinstance(obj, pd.DataFrame) and obj.columns.nlevels == 1:
+            return cls(obj.to_numpy(), obj.index, obj.columns, mask=mask)
+        frames = cls.__fields__(obj)
+        dates = frames[0][1].index
+        codes = frames[0][1].columns
+        for i,j in frames[1:]:
+            dates = dates if dates.equals(j.index) else dates.union(j.index)
+            codes = codes if codes.equals(j.columns) else codes.union(j.columns)
+        dates, codes = __intern__(dates), __intern__(codes)
+        values = np.stack([cls(j.to_numpy(), j.index, j.columns).reindex(dates, codes).values for i,j in frames])
+        return cls(values, dates, codes, [i for i,j in frames], mask)
+
+    @staticmethod
+    def __fields__(
+        obj: Union[pd.DataFrame, Dict[Any, Any]]
+    ) -> List[Tuple[Any, pd.DataFrame]]:
+        """
+        ===========================================================================
+
+        Flattens a frame with (field, code) columns or a dict of frames into
+        (field, wide frame) pairs.
+
+        ---------------------------------------------------------------------------
+
+        将 (字段, 代码) 列的 DataFrame 或 DataFrame 字典展开为 (字段, 宽表) 对。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(obj, dict):
+            x = []
+            for i,j in obj.items():
+                if isinstance(j, pd.Series):
+                    j = j.unstack() if isinstance(j.index, pd.MultiIndex) else j.to_frame()
+                x += [(i, j)] if not isinstance(j, dict) and j.columns.nlevels == 1 else main.__fields__(j)
+            return x
+        if obj.columns.nlevels != 2:
+            raise ValueError(f"Invalid value '{obj.columns.nlevels}' for parameter 'columns.nlevels'. Valid values are: 1, 2")
+        return [(i, obj[i]) for i in obj.columns.get_level_values(0).unique()]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        ===========================================================================
+
+        Returns the panel as a wide DataFrame (a frame with (field, code)
+        columns for 3D panels). Masked cells are NaN. Without a mask, a 2D
+        panel is returned as a zero-copy view.
+
+        ---------------------------------------------------------------------------
+
+        以宽表 DataFrame 返回面板（三维面板返回 (字段, 代码) 列的 DataFrame）。
+        被掩码的单元为 NaN。无掩码时二维面板以零拷贝视图返回。
+
+        ---------------------------------------------------------------------------
+        """
+        values = self.masked
+        if self.fields is None:
+            return pd.DataFrame(values, index=self.dates, columns=self.codes, copy=False)
+        columns = pd.MultiIndex.from_product([self.fields, self.codes], names=['VALUE', self.codes.name])
+        values = values.transpose(1, 0, 2).reshape(len(self.dates), -1)
+        return pd.DataFrame(values, index=self.dates, columns=columns, copy=False)
+
+    def to_frames(self) -> Dict[Any, pd.DataFrame]:
+        """
+        ===========================================================================
+
+        Returns the fields of a panel as a dict of zero-copy wide DataFrames.
+
+        ---------------------------------------------------------------------------
+
+        以零拷贝宽表 DataFrame 字典返回面板的各字段。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.fields is None:
+            return {None: self.to_frame()}
+        return {i: self[i].to_frame() for i in self.fields}
+
+    @property
+    def masked(self) -> np.ndarray:
+        """
+        ===========================================================================
+
+        Returns the data with masked cells set to NaN (the data itself if
+        there is no mask).
+
+        ---------------------------------------------------------------------------
+
+        返回被掩码单元置为 NaN 的数据（无掩码时返回数据本身）。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.mask is None:
+            return self.values
+        values = self.values if self.values.dtype.kind in 'fc' else self.values.astype(np.float64)
+        return np.where(self.mask, values, np.nan)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.values.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.values.ndim
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (0 if self.mask is None else self.mask.nbytes)
+
+    def __repr__(self) -> str:
+        fields = '' if self.fields is None else f"{len(self.fields)} fields x "
+        return f"<Panel {fields}{len(self.dates)} dates x {len(self.codes)} codes, {self.dtype}>"
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(
+        self,
+        key: Any
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Returns one field (2D panel) or a list of fields (3D panel) of a 3D
+        panel, or a subset of codes of a 2D panel. The axes are shared.
+
+        ---------------------------------------------------------------------------
+
+        返回三维面板的单个字段（二维面板）或字段列表（三维面板），或二维面板的部分
+        代码。轴为共享对象。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.fields is not None:
+            if isinstance(key, list):
+                loc = self.fields.get_indexer(key)
+                if (loc < 0).any():
+                    raise KeyError(key)
+                return main(self.values[loc], self.dates, self.codes, key, self.mask)
+            return main(self.values[self.fields.get_loc(key)], self.dates, self.codes, mask=self.mask)
+        key = [key] if not isinstance(key, (list, pd.Index, np.ndarray)) else key
+        return self.reindex(codes=key)
+
+    def copy(self) -> 'main':
+        return main(self.values.copy(), self.dates, self.codes, self.fields, None if self.mask is None else self.mask.copy())
+
+    def astype(
+        self,
+        dtype: Any
+    ) -> 'main':
+        return main(self.values.astype(dtype), self.dates, self.codes, self.fields, self.mask)
+
+    def __like__(
+        self,
+        obj: Union[pd.DataFrame, np.ndarray]
+    ) -> Union['main', pd.DataFrame]:
+        """
+        ===========================================================================
+
+        Wraps a result computed on this panel. Arrays of the panel's shape and
+        frames with its axes become panels sharing the axes; other frames
+        (e.g. with a different index) are returned as they are.
+
+        ---------------------------------------------------------------------------
+
+        包装基于本面板计算的结果。与面板形状一致的数组以及轴一致的 DataFrame
+        转换为共享轴的面板；其他 DataFrame（例如索引不同）原样返回。
+
+        ---------------------------------------------------------------------------
+        """
+        if isinstance(obj, np.ndarray):
+            return main(obj, self.dates, self.codes, self.fields if obj.ndim == 3 else None, self.mask)
+        if obj.columns.nlevels == 1 and self.__same__(obj.index, self.dates) and self.__same__(obj.columns, self.codes):
+            return main(obj.to_numpy(), self.dates, self.codes)
+        if obj.columns.nlevels == 2 and self.fields is not None and self.__same__(obj.index, self.dates):
+            x = main.from_frame(obj)
+            if x.codes is self.codes:
+                return x
+        return obj
+
+    @staticmethod
+    def __same__(
+        x: pd.Index,
+        y: pd.Index
+    ) -> bool:
+        return x is y or (len(x) == len(y) and x.equals(y))
+
+    def reindex(
+        self,
+        dates: Optional[Any] = None,
+        codes: Optional[Any] = None,
+        fill_value: Any = np.nan
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Conforms the panel to new date and/or code axes.
+
+        Parameters
+        ----------
+        dates : Optional[Any], optional
+            The new date axis. Defaults to None (unchanged).
+        codes : Optional[Any], optional
+            The new code axis. Defaults to None (unchanged).
+        fill_value : Any, optional
+            Value of new cells. Defaults to np.nan.
+
+        Returns
+        -------
+        main
+            The conformed panel. Identical axes are not copied.
+
+        ---------------------------------------------------------------------------
+
+        将面板调整至新的日期轴和/或代码轴。
+
+        参数
+        ----------
+        dates : Optional[Any], optional
+            新的日期轴。默认为 None（不变）。
+        codes : Optional[Any], optional
+            新的代码轴。默认为 None（不变）。
+        fill_value : Any, optional
+            新单元的取值。默认为 np.nan。
+
+        返回
+        -------
+        main
+            调整后的面板。相同的轴不会被复制。
+
+        ---------------------------------------------------------------------------
+        """
+        dates = self.dates if dates is None else __intern__(dates)
+        codes = self.codes if codes is None else __intern__(codes)
+        values, mask = self.values, self.mask
+        for axis, old, new in [(-2, self.dates, dates), (-1, self.codes, codes)]:
+            if old is new:
+                continue
+            loc = old.get_indexer(new)
+            missing = loc < 0
+            if missing.any():
+                if values.dtype.kind in 'biu' and not (isinstance(fill_value, (int, np.integer)) and np.can_cast(np.min_scalar_type(fill_value), values.dtype)):
+                    values = values.astype(np.float64)
+                values = np.take(values, np.where(missing, 0, loc), axis=axis)
+                index = [slice(None)] * values.ndim
+                index[axis] = missing
+                values[tuple(index)] = fill_value
+                if mask is not None:
+                    mask = np.take(mask, np.where(missing, 0, loc), axis=axis)
+                    index = [slice(None)] * 2
+                    index[axis] = missing
+                    mask[tuple(index)] = False
+            else:
+                values = np.take(values, loc, axis=axis)
+                mask = None if mask is None else np.take(mask, loc, axis=axis)
+        return main(values, dates, codes, self.fields, mask)
+
+    def align(
+        self,
+        other: 'main',
+        join: str = 'outer'
+    ) -> Tuple['main', 'main']:
+        """
+        ===========================================================================
+
+        Aligns two panels on their date and code axes.
+
+        Parameters
+        ----------
+        other : main
+            The other panel.
+        join : str, optional
+            'outer', 'inner', 'left' or 'right'. Defaults to 'outer'.
+
+        Returns
+        -------
+        Tuple[main, main]
+            The aligned panels. Panels with identical axes are returned
+            unchanged.
+
+        ---------------------------------------------------------------------------
+
+        按日期轴与代码轴对齐两个面板。
+
+        参数
+        ----------
+        other : main
+            另一个面板。
+        join : str, optional
+            'outer'、'inner'、'left' 或 'right'。默认为 'outer'。
+
+        返回
+        -------
+        Tuple[main, main]
+            对齐后的面板。轴相同的面板原样返回。
+
+        ---------------------------------------------------------------------------
+        """
+        if self.dates is other.dates and self.codes is other.codes:
+            return self, other
+        joins = ['outer', 'inner', 'left', 'right']
+        if join not in joins:
+            raise ValueError(f"Invalid value '{join}' for parameter 'join'. Valid values are: {', '.join(joins)}")
+        axes = []
+        for x, y in [(self.dates, other.dates), (self.codes, other.codes)]:
+            if self.__same__(x, y):
+                axes.append(x)
+            elif join == 'left':
+                axes.append(x)
+            elif join == 'right':
+                axes.append(y)
+            else:
+                axes.append(x.union(y) if join == 'outer' else x.intersection(y))
+        return self.reindex(*axes), other.reindex(*axes)
+
+    def where(
+        self,
+        cond: Union['main', np.ndarray, pd.DataFrame],
+        other: Any = np.nan
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Keeps the data where `cond` is True and replaces it with `other`
+        elsewhere. A panel condition is aligned to this panel (missing cells
+        are False).
+
+        ---------------------------------------------------------------------------
+
+        保留 `cond` 为 True 处的数据，其余位置替换为 `other`。面板条件按本面板对齐
+        （缺失单元为 False）。
+
+        ---------------------------------------------------------------------------
+        """
+        cond = main.from_frame(cond) if isinstance(cond, pd.DataFrame) else cond
+        if isinstance(cond, main):
+            cond = cond.reindex(self.dates, self.codes, False).values
+        cond = np.asarray(cond, dtype=bool)
+        values = self.values if self.values.dtype.kind in 'fc' or not isinstance(other, float) else self.values.astype(np.float64)
+        return main(np.where(cond, values, other), self.dates, self.codes, self.fields, self.mask)
+
+    def isnull(self) -> 'main':
+        x = np.isnan(self.masked) if self.masked.dtype.kind in 'fc' else np.zeros(self.shape, dtype=bool)
+        return main(x, self.dates, self.codes, self.fields)
+
+    def notnull(self) -> 'main':
+        return main(~self.isnull().values, self.dates, self.codes, self.fields)
+
+    def __binary__(
+        self,
+        other: Any,
+        func: Callable[[Any, Any], Any],
+        reflected: bool = False
+    ) -> 'main':
+        """
+        ===========================================================================
+
+        Applies a binary operator. Panels and frames are outer-aligned first
+        (free when the axes are identical); masks are combined.
+
+        ---------------------------------------------------------------------------
+
+        执行二元运算。面板与 DataFrame 先按并集对齐（轴相同时无代价），掩码取交集。
+
+        ---------------------------------------------------------------------------
+        """
+        x = self
+        if isinstance(other, pd.DataFrame):
+            other = main.from_frame(other)
+        if isinstance(other, main):
+            x, other = x.align(other)
+            mask = x.mask if other.mask is None else (other.mask if x.mask is None else x.mask & other.mask)
+            values = func(other.values, x.values) if reflected else func(x.values, other.values)
+            fields = x.fields if x.fields is not None else other.fields
+            return main(values, x.dates, x.codes, fields if values.ndim == 3 else None, mask)
+        values = func(other, x.values) if reflected else func(x.values, other)
+        return main(values, x.dates, x.codes, x.fields, x.mask)
+
+    def __add__(self, other): return self.__binary__(other, operator.add)
+    def __radd__(self, other): return self.__binary__(other, operator.add, True)
+    def __sub__(self, other): return self.__binary__(other, operator.sub)
+    def __rsub__(self, other): return self.__binary__(other, operator.sub, True)
+    def __mul__(self, other): return self.__binary__(other, operator.mul)
+    def __rmul__(self, other): return self.__binary__(other, operator.mul, True)
+    def __truediv__(self, other): return self.__binary__(other, operator.truediv)
+    def __rtruediv__(self, other): return self.__binary__(other, operator.truediv, True)
+    def __pow__(self, other): return self.__binary__(other, operator.pow)
+    def __lt__(self, other): return self.__binary__(other, operator.lt)
+    def __le__(self, other): return self.__binary__(other, operator.le)
+    def __gt__(self, other): return self.__binary__(other, operator.gt)
+    def __ge__(self, other): return self.__binary__(other, operator.ge)
+    def __and__(self, other): return self.__binary__(other, operator.and_)
+    def __or__(self, other): return self.__binary__(other, operator.or_)
+    def __neg__(self): return main(-self.values, self.dates, self.codes, self.fields, self.mask)
+    def __abs__(self): return main(np.abs(self.values), self.dates, self.codes, self.fields, self.mask)
+    def __invert__(self): return main(~self.values, self.dates, self.codes, self.fields, self.mask)
+
+    def __accessor__(
+        self,
+        name: str
+    ) -> _accessor:
+        return _accessor(self, getattr(self.to_frame(), name))
+
+    @property
+    def rollings(self) -> _accessor:
+        return self.__accessor__(ROLLS.CLASS_NAME)
+
+    @property
+    def stats(self) -> _accessor:
+        return self.__accessor__(STATS.CLASS_NAME)
+
+    @property
+    def build(self) -> _accessor:
+        return self.__accessor__(BUILD.CLASS_NAME)
+
+    @property
+    def analysis(self) -> _accessor:
+        return self.__accessor__(ANALYSIS.CLASS_NAME)
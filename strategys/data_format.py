@@ -4,7 +4,6 @@ Created on Mon May 12 14:48:58 2025
 
 @author: admin
 """
-import re
 import pandas as pd
 import data_source
 import flow
@@ -64,23 +63,8 @@ class meta:
 
         ---------------------------------------------------------------------------
         """
-        if isinstance(obj, (pd.DataFrame, pd.Series)):
-            if flow.COLUMNS_INFO.code == obj.index.name:
-                x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj.index]
-                if how =='jq':
-                    x = data_source.joinquant.normalize_code(x)
-                obj.index = pd.Index(x, name=obj.index.name)
-            elif flow.COLUMNS_INFO.code == obj.columns.name:
-                x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj.columns]
-                if how =='jq':
-                    x = data_source.joinquant.normalize_code(x)
-                obj.columns = pd.Index(x, name=obj.columns.name)
-            return obj
-        else:
-            x = [''.join(re.findall(r'\d+', str(i))).zfill(6) for i in obj]
-            if how =='jq':
-                x = data_source.joinquant.normalize_code(x)
-            return x
+        x = flow.code_standard(obj, how)
+        return x
         
     @classmethod
     def test_save(
@@ -259,7 +243,7 @@ class tonghua(meta):
         ---------------------------------------------------------------------------
         """
         all_file_name = str(path / file_name)
-        date = pd.to_datetime(pd.to_datetime(file_name.split('.')[0]).date()) + pd.Timedelta(15, 'h')
+        date = pd.to_datetime(pd.to_datetime(file_name.split('.')[0]).date()) + flow.COLUMNS_INFO.time_bias
         try:
             df = (pd.read_csv(all_file_name, encoding='gbk', sep='\t')
                   .reindex(cls.settle_columns, axis=1).rename(cls.settle_rename, axis=1).dropna(how='all', axis=1)